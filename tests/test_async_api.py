@@ -0,0 +1,122 @@
+"""
+Unit tests for the asyncio API and its bounded executor.
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tts.async_executor import AsyncInferenceExecutor, QueueFullError
+from tts.core import TextToSpeech
+from tts.voice_cloning import VoiceCloning
+
+# A sentence long enough that chunk_text gives it a segment of its own
+SEGMENT = "Segment" + " more" * 45 + "."
+
+
+class TestAsyncInferenceExecutor(unittest.IsolatedAsyncioTestCase):
+    """Test cases for concurrency limits, fail-fast queueing and timeouts."""
+
+    async def test_queue_full_fails_fast(self):
+        """Requests beyond concurrency + queue depth are rejected immediately."""
+        executor = AsyncInferenceExecutor(max_concurrency=1, max_queue=1)
+        release = threading.Event()
+        tasks = [asyncio.create_task(executor.run(lambda cancel: release.wait(5))) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with self.assertRaises(QueueFullError):
+            await executor.run(lambda cancel: True)
+        release.set()
+        self.assertEqual(await asyncio.gather(*tasks), [True, True])
+        self.assertEqual(executor.outstanding, 0)
+        executor.shutdown()
+
+    async def test_timeout_signals_cancellation(self):
+        """A timed-out job sees its cancel event set and frees its slot when it stops."""
+        executor = AsyncInferenceExecutor(max_concurrency=1, max_queue=0)
+        observed = threading.Event()
+
+        def job(cancel):
+            if cancel.wait(5):
+                observed.set()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await executor.run(job, timeout=0.05)
+        self.assertTrue(await asyncio.to_thread(observed.wait, 5))
+        executor.shutdown()
+        self.assertEqual(executor.outstanding, 0)
+
+
+class TestAsyncTextToSpeech(unittest.IsolatedAsyncioTestCase):
+    """Test cases for agenerate_audio, aclone_voice and avalidate_voice_sample."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        with wave.open(self.ref_path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b'\x00\x10' * 16000 * 4)
+        self.output_path = os.path.join(self.tmp_dir.name, 'out.wav')
+
+        self.tts_patcher = patch('tts.core.TTS')
+        mock_tts_class = self.tts_patcher.start()
+        mock_model = MagicMock()
+        mock_tts_class.return_value = mock_model
+        mock_model.to.return_value = mock_model
+        mock_model.synthesizer.output_sample_rate = 24000
+        self.xtts = mock_model.synthesizer.tts_model
+        self.xtts.get_conditioning_latents.return_value = ('gpt', 'spk')
+        self.xtts.inference.return_value = {'wav': np.zeros(2400, dtype=np.float32)}
+
+    def tearDown(self):
+        self.tts_patcher.stop()
+        self.tmp_dir.cleanup()
+
+    async def test_agenerate_audio(self):
+        """agenerate_audio writes the file off the event loop."""
+        tts = TextToSpeech()
+        tts.initialize_model()
+        self.assertTrue(await tts.agenerate_audio("Hello.", self.ref_path, "en", self.output_path))
+        self.assertTrue(os.path.exists(self.output_path))
+
+    async def test_cancelled_generation_removes_partial_file(self):
+        """Cancellation stops at a segment boundary and cleans up the output."""
+        tts = TextToSpeech()
+        tts.initialize_model()
+        first_segment_done = threading.Event()
+
+        def slow_inference(**kwargs):
+            if first_segment_done.is_set():
+                threading.Event().wait(0.2)
+            first_segment_done.set()
+            return {'wav': np.zeros(240, dtype=np.float32)}
+
+        self.xtts.inference.side_effect = slow_inference
+        task = asyncio.create_task(
+            tts.agenerate_audio(" ".join([SEGMENT] * 3), self.ref_path, "en", self.output_path)
+        )
+        await asyncio.to_thread(first_segment_done.wait, 5)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        tts.async_executor.shutdown()
+        self.assertLess(self.xtts.inference.call_count, 3)
+        self.assertFalse(os.path.exists(self.output_path))
+
+    async def test_aclone_voice_and_validation(self):
+        """aclone_voice validates, initializes and generates in one job."""
+        vc = VoiceCloning()
+        self.assertTrue(await vc.avalidate_voice_sample(self.ref_path))
+        self.assertTrue(await vc.aclone_voice("Hello.", self.ref_path, "en", self.output_path))
+        self.assertTrue(os.path.exists(self.output_path))
+        self.assertFalse(await vc.aclone_voice("Hello.", "/missing.wav", "en", self.output_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests for manifest-driven batch synthesis and its job store.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from tts.__main__ import main as tts_main
+from tts.batch import BatchRunner, JobStore, read_manifest
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.stub import StubModelFactory
+
+
+class TestBatchSynthesis(unittest.TestCase):
+    """Test cases for read_manifest, JobStore and BatchRunner."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = self.tmp_dir.name
+        write_reference_wav(os.path.join(self.dir, 'host.wav'))
+        self.manifest = os.path.join(self.dir, 'manifest.jsonl')
+        self.rows = [{'id': f"seg{i}", 'text': f"Segment number {i}.", 'voice': 'host.wav',
+                      'output': f"out/seg{i}.wav"} for i in range(4)]
+        self.write_manifest(self.rows)
+        self.tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0))
+        self.renders = 0
+        original = self.tts.text_to_speech
+
+        def counting_text_to_speech(*args):
+            self.renders += 1
+            return original(*args)
+
+        self.tts.text_to_speech = counting_text_to_speech
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_manifest(self, rows):
+        with open(self.manifest, 'w') as f:
+            f.write('# nightly render\n')
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+
+    def run_batch(self, workers=2):
+        store = JobStore(os.path.join(self.dir, 'jobs.sqlite'))
+        try:
+            return BatchRunner(self.tts, store, workers=workers).run(read_manifest(self.manifest))
+        finally:
+            store.close()
+
+    def test_read_manifest_resolves_paths_and_defaults(self):
+        """Relative paths resolve against the manifest; language and id have defaults."""
+        self.write_manifest([{'text': "Hi.", 'voice': 'host.wav', 'output': 'a.wav'},
+                             {'text': "Hi.", 'voice': 'narrator', 'output': 'b.wav', 'language': 'de'}])
+        first, second = read_manifest(self.manifest)
+        self.assertEqual(first.voice, os.path.join(self.dir, 'host.wav'))
+        self.assertEqual(first.output, os.path.join(self.dir, 'a.wav'))
+        self.assertEqual((first.item_id, first.language), ('a.wav', 'en'))
+        self.assertEqual((second.voice, second.language), ('narrator', 'de'))
+
+    def test_read_manifest_rejects_bad_rows(self):
+        """Missing fields and duplicate IDs are reported with their line number."""
+        self.write_manifest([{'text': "Hi.", 'output': 'a.wav'}])
+        with self.assertRaisesRegex(ValueError, r":2: 'voice'"):
+            read_manifest(self.manifest)
+        self.write_manifest([self.rows[0], self.rows[0]])
+        with self.assertRaisesRegex(ValueError, "duplicate id 'seg0'"):
+            read_manifest(self.manifest)
+
+    def test_renders_all_items(self):
+        """Every item is rendered and summarized."""
+        summary = self.run_batch()
+        self.assertEqual((summary.total, summary.succeeded, summary.failed, summary.skipped), (4, 4, 0, 0))
+        self.assertGreater(summary.audio_seconds, 0)
+        self.assertGreater(summary.items_per_minute, 0)
+        for row in self.rows:
+            self.assertTrue(os.path.exists(os.path.join(self.dir, row['output'])))
+
+    def test_resume_skips_completed_items(self):
+        """A rerun renders only items that are unfinished, edited or missing their output."""
+        self.run_batch()
+        # Simulate a run killed mid-item, an edited row and a deleted output
+        conn = sqlite3.connect(os.path.join(self.dir, 'jobs.sqlite'))
+        with conn:
+            conn.execute("UPDATE items SET status = 'running' WHERE item_id = 'seg0'")
+        conn.close()
+        self.rows[1]['text'] = "Segment number one, rewritten."
+        self.write_manifest(self.rows)
+        os.remove(os.path.join(self.dir, 'out', 'seg2.wav'))
+        self.renders = 0
+
+        summary = self.run_batch()
+        self.assertEqual((summary.succeeded, summary.skipped), (3, 1))
+        self.assertEqual(self.renders, 3)
+
+        self.renders = 0
+        self.assertEqual(self.run_batch().skipped, 4)
+        self.assertEqual(self.renders, 0)
+
+    def test_rerecorded_reference_or_new_profile_rerenders(self):
+        """Items are re-rendered when the reference audio or the inference profile changes."""
+        self.run_batch()
+        write_reference_wav(os.path.join(self.dir, 'host.wav'), seconds=7.0)
+        self.renders = 0
+        self.assertEqual(self.run_batch().skipped, 0)
+        self.assertEqual(self.renders, 4)
+
+        self.tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                                profile='cpu_int8')
+        self.assertEqual(self.run_batch().skipped, 0)
+        self.assertEqual(self.run_batch().skipped, 4)
+
+    def test_failures_are_recorded_and_retried(self):
+        """A failed item is summarized, stored as failed and retried by the next run."""
+        self.rows[3]['voice'] = 'missing.wav'
+        self.write_manifest(self.rows)
+        summary = self.run_batch(workers=1)
+        self.assertEqual((summary.succeeded, summary.failed), (3, 1))
+        self.assertEqual(summary.failures[0][0], 'seg3')
+
+        store = JobStore(os.path.join(self.dir, 'jobs.sqlite'))
+        self.assertEqual(store.counts(), {'done': 3, 'failed': 1})
+        store.close()
+        self.renders = 0
+        self.assertEqual(self.run_batch().failed, 1)
+        self.assertEqual(self.renders, 1)
+
+    def test_cli(self):
+        """python -m tts batch renders a manifest and writes a JSON summary."""
+        summary_path = os.path.join(self.dir, 'summary.json')
+        args = ['batch', self.manifest, '--backend', 'stub', '--stub-rtf', '0', '--workers', '2',
+                '--no-progress', '--summary-json', summary_path]
+        self.assertEqual(tts_main(args), 0)
+        with open(summary_path) as f:
+            self.assertEqual(json.load(f)['succeeded'], 4)
+        self.assertTrue(os.path.exists(f"{self.manifest}.jobs.sqlite"))
+        self.assertEqual(tts_main(args), 0)
+        with open(summary_path) as f:
+            self.assertEqual(json.load(f)['skipped'], 4)
+        self.assertEqual(tts_main(['nonsense']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Unit tests for the stub backend and the benchmark suite.
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from tts.benchmark import BenchmarkConfig, main, run_benchmarks, write_reference_wav
+from tts.core import TextToSpeech
+from tts.stub import StubModelFactory, StubTTS
+
+
+class TestStubBackend(unittest.TestCase):
+    """Test cases for the deterministic stub model."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_output_is_deterministic(self):
+        """The same text and voice always produce identical samples."""
+        tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0))
+        self.assertTrue(tts.initialize_model('stub'))
+        first = tts.synthesize("Hello there. General Kenobi.", self.ref_path, 'en')
+        second = tts.synthesize("Hello there. General Kenobi.", self.ref_path, 'en')
+        np.testing.assert_array_equal(first.samples, second.samples)
+        self.assertEqual(first.sample_rate, 24000)
+        self.assertEqual(tts.model.synthesizer.tts_model.calls['conditioning'], 1)
+
+    def test_streams_in_token_sized_chunks(self):
+        """Streaming yields several chunks for a long sentence."""
+        tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0))
+        tts.initialize_model('stub')
+        chunks = list(tts.stream_audio("A fairly long sentence to stream in pieces.", self.ref_path, 'en'))
+        self.assertGreater(len(chunks), 1)
+
+    def test_stub_mimics_tts_api(self):
+        """StubTTS supports .to() and the high-level tts() call."""
+        model = StubTTS(real_time_factor=0, conditioning_time=0).to('cpu')
+        self.assertGreater(len(model.tts("Hi.", speaker_wav=self.ref_path, language='en')), 0)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test cases for benchmark results and the CLI."""
+
+    def fast_config(self, **overrides):
+        config = BenchmarkConfig(stub_real_time_factor=0.001, stub_conditioning_time=0.0,
+                                 iterations=1, concurrency_levels=[1, 2], requests_per_level=2,
+                                 validation_files=2, profiles=['default', 'cpu'])
+        for key, value in overrides.items():
+            setattr(config, key, value)
+        return config
+
+    def test_run_reports_every_benchmark(self):
+        """All benchmarks report results and peak RSS is recorded."""
+        report = run_benchmarks(self.fast_config())
+        results = report['results']
+        for name in ('init', 'time_to_first_audio', 'rtf', 'concurrency', 'validation', 'profiles'):
+            self.assertIn(name, results)
+            self.assertNotIn('error', results[name])
+        self.assertTrue(results['init']['success'])
+        self.assertEqual(set(results['concurrency']['levels']), {'1', '2'})
+        self.assertEqual(results['validation']['valid'], 2)
+        self.assertGreater(results['peak_rss_mb'], 0)
+
+    def test_unknown_benchmark_rejected(self):
+        """Selecting an unknown benchmark is an error."""
+        with self.assertRaises(ValueError):
+            run_benchmarks(self.fast_config(only=['nope']))
+
+    def test_cli_writes_json(self):
+        """The CLI writes a JSON report for the selected benchmarks."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, 'bench.json')
+            code = main(['--only', 'init,rtf', '--stub-rtf', '0.001', '--iterations', '1',
+                         '--output', out_path])
+            self.assertEqual(code, 0)
+            with open(out_path) as f:
+                report = json.load(f)
+        self.assertEqual(sorted(report['results']), ['init', 'peak_rss_mb', 'rtf'])
+
+    def test_cli_refuses_uncached_real_model(self):
+        """The xtts backend never downloads a model."""
+        with patch('tts.benchmark.model_is_cached', return_value=False):
+            self.assertEqual(main(['--backend', 'xtts']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Unit tests for the long-form episode pipeline.
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import soundfile as sf
+
+from tts.audio import SynthesisResult
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.episode import EpisodePipeline, split_script
+from tts.stub import StubModelFactory
+from tts.text import char_limit, chunk_text
+
+SAMPLE_RATE = 1000
+
+
+def fake_synthesize(text, speaker_wav, language):
+    """Return audio whose constant value encodes the text length."""
+    # Later segments finish first, so stitching must restore script order
+    time.sleep(0.01 * (3 - min(len(text) // 10, 3)))
+    if 'FAIL' in text:
+        raise RuntimeError("synthesis error")
+    return SynthesisResult(samples=np.full(100, len(text) / 100.0, dtype=np.float32),
+                           sample_rate=SAMPLE_RATE)
+
+
+class TestSplitScript(unittest.TestCase):
+    """Test cases for script segmentation."""
+
+    def test_packs_sentences_within_paragraphs(self):
+        """Short sentences are packed; paragraphs always end a segment."""
+        script = "One. Two. Three.\n\nFour is longer."
+        segments = split_script(script, max_chars=10)
+        self.assertEqual([s.text for s in segments], ["One. Two.", "Three.", "Four is", "longer."])
+        self.assertEqual([s.ends_paragraph for s in segments], [False, True, False, True])
+        self.assertEqual([s.index for s in segments], [0, 1, 2, 3])
+
+    def test_segments_match_text_to_speech_chunking(self):
+        """Segments follow chunk_text and the language's character budget."""
+        script = "第一句话很长" * 30 + "。第二句。\n\n" + "The meeting is at 10 a.m. on Main St. " * 10
+        segments = split_script(script, 'zh-cn')
+        self.assertTrue(all(len(s.text) <= char_limit('zh-cn') for s in segments))
+        paragraphs = script.split('\n\n')
+        self.assertEqual([s.text for s in segments],
+                         chunk_text(paragraphs[0], 'zh-cn') + chunk_text(paragraphs[1], 'zh-cn'))
+
+    def test_blank_script(self):
+        """Whitespace-only scripts produce no segments."""
+        self.assertEqual(split_script("  \n\n  "), [])
+
+
+class TestEpisodePipeline(unittest.TestCase):
+    """Test cases for parallel synthesis and ordered stitching."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.tmp_dir.name, 'episode.wav')
+        self.tts = MagicMock()
+        self.tts.synthesize.side_effect = fake_synthesize
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_render_stitches_in_order_with_silence(self):
+        """Segments are written in script order separated by configured silence."""
+        pipeline = EpisodePipeline(self.tts, workers=3, segment_silence=0.1,
+                                   paragraph_silence=0.2, max_segment_chars=5)
+        script = "A. Bb.\n\nCcc."
+        report = pipeline.render(script, 'ref.wav', 'en', self.output_path)
+
+        self.assertTrue(report.success)
+        audio, rate = sf.read(self.output_path, dtype='float32')
+        self.assertEqual(rate, SAMPLE_RATE)
+        # 3 x 100 samples of speech, 0.1s after "A.", 0.2s after paragraph "Bb."
+        self.assertEqual(len(audio), 300 + 100 + 200)
+        np.testing.assert_allclose(audio[0], 0.02, atol=1e-4)
+        np.testing.assert_allclose(audio[200], 0.03, atol=1e-4)
+        np.testing.assert_allclose(audio[500], 0.04, atol=1e-4)
+        self.assertEqual([r.index for r in report.segments], [0, 1, 2])
+        self.assertAlmostEqual(report.audio_seconds, 0.6)
+        self.assertIsNotNone(report.real_time_factor)
+
+    def test_failed_segment_leaves_no_output(self):
+        """A failing segment fails the render without writing a partial episode."""
+        pipeline = EpisodePipeline(self.tts, workers=1)
+        report = pipeline.render("Fine.\n\nFAIL here.", 'ref.wav', 'en', self.output_path)
+
+        self.assertFalse(report.success)
+        self.assertFalse(os.path.exists(self.output_path))
+        self.assertFalse(os.path.exists(self.output_path + '.partial'))
+        self.assertTrue(any(r.error for r in report.segments))
+
+
+class TestIncrementalRender(unittest.TestCase):
+    """Test cases for re-rendering only the changed segments of an episode."""
+
+    SCRIPT = "First paragraph here.\n\nSecond paragraph here.\n\nThird paragraph here."
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.tmp_dir.name, 'episode.wav')
+        self.tts = MagicMock()
+        self.tts.synthesize.side_effect = fake_synthesize
+        self.tts.model_name = 'fake'
+        self.tts._params_key.return_value = '{}'
+        self.pipeline = EpisodePipeline(self.tts, workers=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def synthesized_texts(self):
+        texts = [c.args[0] for c in self.tts.synthesize.call_args_list]
+        self.tts.synthesize.reset_mock()
+        return texts
+
+    def test_only_changed_segments_are_synthesized(self):
+        """An edit re-synthesizes only its segment, and the result matches a full render."""
+        self.assertTrue(self.pipeline.render(self.SCRIPT, 'ref.wav', 'en', self.output_path,
+                                             incremental=True).success)
+        self.assertEqual(len(self.synthesized_texts()), 3)
+
+        revised = self.SCRIPT.replace("Second paragraph here.", "Second paragraph, now much longer.")
+        report = self.pipeline.render(revised, 'ref.wav', 'en', self.output_path, incremental=True)
+        self.assertTrue(report.success)
+        self.assertEqual(self.synthesized_texts(), ["Second paragraph, now much longer."])
+        self.assertEqual([r.reused for r in report.segments], [True, False, True])
+
+        full_path = os.path.join(self.tmp_dir.name, 'full.wav')
+        self.pipeline.render(revised, 'ref.wav', 'en', full_path)
+        np.testing.assert_array_equal(sf.read(self.output_path)[0], sf.read(full_path)[0])
+        # The replaced segment's audio is dropped from the store
+        self.assertEqual(len([n for n in os.listdir(self.output_path + '.segments') if n.endswith('.wav')]), 3)
+
+    def test_unchanged_script_needs_no_model(self):
+        """Re-rendering an unchanged script synthesizes nothing and skips model loading."""
+        self.pipeline.render(self.SCRIPT, 'ref.wav', 'en', self.output_path, incremental=True)
+        self.synthesized_texts()
+        self.tts.model = None
+        self.assertTrue(self.pipeline.render(self.SCRIPT, 'ref.wav', 'en', self.output_path,
+                                             incremental=True).success)
+        self.assertEqual(self.synthesized_texts(), [])
+        self.tts.initialize_model.assert_not_called()
+
+    def test_failed_render_keeps_finished_segments(self):
+        """After a failure, the retry synthesizes only the segments that failed."""
+        script = self.SCRIPT.replace("Third", "FAIL")
+        pipeline = EpisodePipeline(self.tts, workers=1)
+        self.assertFalse(pipeline.render(script, 'ref.wav', 'en', self.output_path, incremental=True).success)
+        self.synthesized_texts()
+        self.assertTrue(pipeline.render(self.SCRIPT, 'ref.wav', 'en', self.output_path,
+                                        incremental=True).success)
+        self.assertEqual(self.synthesized_texts(), ["Third paragraph here."])
+
+    def test_new_profile_rerenders_segments(self):
+        """Segments rendered under another inference profile are not reused."""
+        ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(ref_path)
+
+        def render(profile):
+            engine = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                                  profile=profile)
+            report = EpisodePipeline(engine).render(self.SCRIPT, ref_path, 'en', self.output_path,
+                                                    incremental=True)
+            self.assertTrue(report.success)
+            return [r.reused for r in report.segments]
+
+        self.assertEqual(render(None), [False] * 3)
+        self.assertEqual(render(None), [True] * 3)
+        self.assertEqual(render('cpu_int8'), [False] * 3)
+        self.assertEqual(render('cpu_int8'), [True] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
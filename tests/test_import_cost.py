@@ -0,0 +1,73 @@
+"""
+Tests that importing the tts package stays cheap.
+
+Each check runs in a fresh interpreter so modules imported by other tests
+do not hide regressions.
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous bounds: numpy and soundfile alone cost ~0.1s and ~250 modules,
+# while pulling in torch and Coqui TTS costs several seconds and thousands.
+MAX_IMPORT_SECONDS = 2.0
+MAX_NEW_MODULES = 500
+HEAVY_MODULES = ('torch', 'TTS', 'librosa', 'scipy', 'transformers')
+
+
+def run_python(code):
+    """Run code in a fresh interpreter from the repo root and return its stdout."""
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=REPO_ROOT,
+        capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stdout
+
+
+class TestImportCost(unittest.TestCase):
+    """Test cases bounding the cost of `import tts`."""
+
+    def test_import_is_fast_and_light(self):
+        """import tts stays within time and module-count bounds without heavy deps."""
+        output = run_python(
+            "import json, sys, time\n"
+            "before = len(sys.modules)\n"
+            "start = time.perf_counter()\n"
+            "import tts\n"
+            "elapsed = time.perf_counter() - start\n"
+            f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "print(json.dumps({'seconds': elapsed, 'modules': len(sys.modules) - before, 'heavy': heavy}))\n"
+        )
+        stats = json.loads(output)
+        self.assertEqual(stats['heavy'], [])
+        self.assertLess(stats['seconds'], MAX_IMPORT_SECONDS)
+        self.assertLess(stats['modules'], MAX_NEW_MODULES)
+
+    def test_validation_works_without_torch(self):
+        """Validation paths import and run when torch is unavailable."""
+        output = run_python(
+            "import os, sys, tempfile, wave\n"
+            "sys.modules['torch'] = None  # any import of torch now fails\n"
+            "sys.modules['TTS'] = None\n"
+            "from tts.core import validate_voice_sample\n"
+            "from tts.voice_cloning import VoiceCloning\n"
+            "fd, path = tempfile.mkstemp(suffix='.wav')\n"
+            "os.close(fd)\n"
+            "with wave.open(path, 'wb') as wf:\n"
+            "    wf.setnchannels(1); wf.setsampwidth(2); wf.setframerate(16000)\n"
+            "    wf.writeframes(b'\\x00\\x10' * 16000 * 4)\n"
+            "validate_voice_sample(path)\n"
+            "print(VoiceCloning().validate_voice_sample(path))\n"
+            "os.remove(path)\n"
+        )
+        self.assertEqual(output.strip(), 'True')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for the speaker conditioning latent cache.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tts import hashing
+from tts.core import TextToSpeech
+from tts.latent_cache import VoiceLatentCache
+
+
+def write_wav(path, seconds=1, value=b'\0'):
+    """Write a small 16 kHz mono WAV file."""
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(value * 2 * 16000 * seconds)
+
+
+class TestVoiceLatentCache(unittest.TestCase):
+    """Test cases for VoiceLatentCache tiers and counters."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.wav_a = os.path.join(self.tmp_dir, 'a.wav')
+        self.wav_b = os.path.join(self.tmp_dir, 'b.wav')
+        write_wav(self.wav_a, value=b'\x01')
+        write_wav(self.wav_b, value=b'\x02')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_key_depends_on_content_and_model(self):
+        """Identical content shares a key; different content or model does not."""
+        copy = os.path.join(self.tmp_dir, 'copy.wav')
+        shutil.copy(self.wav_a, copy)
+        key = VoiceLatentCache.make_key(self.wav_a, 'xtts')
+        self.assertEqual(key, VoiceLatentCache.make_key(copy, 'xtts'))
+        self.assertNotEqual(key, VoiceLatentCache.make_key(self.wav_b, 'xtts'))
+        self.assertNotEqual(key, VoiceLatentCache.make_key(self.wav_a, 'other'))
+
+    def test_hit_and_miss_counters(self):
+        """Compute runs once per key and counters track lookups."""
+        cache = VoiceLatentCache()
+        compute = MagicMock(return_value=('gpt', 'spk'))
+        key = cache.make_key(self.wav_a, 'xtts')
+        self.assertEqual(cache.get_or_compute(key, compute), ('gpt', 'spk'))
+        self.assertEqual(cache.get_or_compute(key, compute), ('gpt', 'spk'))
+        compute.assert_called_once()
+        self.assertEqual(cache.stats(), {'hits': 1, 'disk_hits': 0, 'misses': 1, 'entries': 1})
+
+    def test_lru_eviction(self):
+        """The least recently used voice is evicted at capacity."""
+        cache = VoiceLatentCache(max_entries=2)
+        cache.put('a', (1, 1))
+        cache.put('b', (2, 2))
+        cache.get('a')
+        cache.put('c', (3, 3))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+    def test_disk_tier_survives_new_instance(self):
+        """Latents persisted to disk are served to a fresh cache instance."""
+        cache_dir = os.path.join(self.tmp_dir, 'latents')
+        latents = (np.ones((1, 32, 8), dtype=np.float32), np.zeros((1, 16, 1), dtype=np.float32))
+        VoiceLatentCache(cache_dir=cache_dir).put('voice', latents)
+
+        fresh = VoiceLatentCache(cache_dir=cache_dir)
+        restored = fresh.get('voice', restore=lambda a: a * 2)
+        np.testing.assert_array_equal(restored[0], latents[0] * 2)
+        self.assertEqual(fresh.stats()['disk_hits'], 1)
+        # Promoted into memory, so the next lookup is a memory hit
+        fresh.get('voice')
+        self.assertEqual(fresh.stats()['hits'], 1)
+
+
+class TestFileDigest(unittest.TestCase):
+    """Test cases for the memoized reference file digest."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_rewritten_file_replaces_its_entry(self):
+        """Re-recording a file updates its digest without growing the memo."""
+        path = os.path.join(self.tmp_dir, 'ref.wav')
+        write_wav(path)
+        first = hashing.file_digest(path)
+        size = len(hashing._digest_memo)
+        write_wav(path, seconds=2)
+        self.assertNotEqual(hashing.file_digest(path), first)
+        self.assertEqual(len(hashing._digest_memo), size)
+
+    def test_memo_is_bounded(self):
+        """Only the most recently used paths are memoized."""
+        paths = [os.path.join(self.tmp_dir, f"ref{i}.wav") for i in range(3)]
+        for path in paths:
+            write_wav(path)
+        with patch.object(hashing, '_MAX_MEMO_ENTRIES', 2), \
+                patch.object(hashing, '_digest_memo', OrderedDict()):
+            for path in paths:
+                hashing.file_digest(path)
+            self.assertEqual(list(hashing._digest_memo), [os.path.abspath(p) for p in paths[1:]])
+
+
+class TestLatentCacheIntegration(unittest.TestCase):
+    """Test that TextToSpeech reuses cached latents across calls."""
+
+    @patch('tts.core.TTS')
+    def test_conditioning_runs_once_per_voice(self, mock_tts_class):
+        """Repeated generate_audio calls compute the latents only once."""
+        mock_model = MagicMock()
+        mock_tts_class.return_value = mock_model
+        mock_model.to.return_value = mock_model
+        mock_model.synthesizer.output_sample_rate = 24000
+        xtts = mock_model.synthesizer.tts_model
+        xtts.get_conditioning_latents.return_value = ('gpt', 'spk')
+        xtts.inference.return_value = {'wav': np.zeros(2400, dtype=np.float32)}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ref_path = os.path.join(tmp_dir, 'ref.wav')
+            write_wav(ref_path, seconds=3)
+            tts = TextToSpeech()
+            self.assertTrue(tts.initialize_model())
+            for i in range(3):
+                out_path = os.path.join(tmp_dir, f'out{i}.wav')
+                self.assertTrue(tts.generate_audio("Hello.", ref_path, "en", out_path))
+                self.assertTrue(os.path.exists(out_path))
+
+        xtts.get_conditioning_latents.assert_called_once_with(audio_path=[ref_path])
+        self.assertEqual(xtts.inference.call_count, 3)
+        _, kwargs = xtts.inference.call_args
+        self.assertEqual(kwargs['gpt_cond_latent'], 'gpt')
+        self.assertEqual(tts.latent_cache.stats()['hits'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
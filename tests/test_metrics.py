@@ -0,0 +1,105 @@
+"""
+Unit tests for pipeline instrumentation.
+"""
+import os
+import tempfile
+import unittest
+
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.metrics import NULL_METRICS, Metrics, MetricsRegistry
+from tts.stub import StubModelFactory
+from tts.voice_cloning import VoiceCloning
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for the in-process registry and Prometheus exporter."""
+
+    def test_prometheus_text_format(self):
+        """Counters, gauges and cumulative histogram buckets are exported."""
+        registry = MetricsRegistry(buckets=[0.1, 1.0])
+        registry.inc('tts_requests_total', labels={'status': 'success'})
+        registry.add('tts_inflight_requests', 2)
+        registry.observe('tts_stage_duration_seconds', 0.5, {'stage': 'inference'})
+        registry.observe('tts_stage_duration_seconds', 0.05, {'stage': 'inference'})
+
+        text = registry.to_prometheus()
+        self.assertIn('# TYPE tts_requests_total counter', text)
+        self.assertIn('tts_requests_total{status="success"} 1', text)
+        self.assertIn('tts_inflight_requests 2', text)
+        self.assertIn('tts_stage_duration_seconds_bucket{stage="inference",le="0.1"} 1', text)
+        self.assertIn('tts_stage_duration_seconds_bucket{stage="inference",le="1"} 2', text)
+        self.assertIn('tts_stage_duration_seconds_bucket{stage="inference",le="+Inf"} 2', text)
+        self.assertIn('tts_stage_duration_seconds_count{stage="inference"} 2', text)
+        self.assertTrue(text.endswith('\n'))
+
+    def test_empty_registry_exports_nothing(self):
+        """A registry with no series renders as an empty string."""
+        self.assertEqual(MetricsRegistry().to_prometheus(), '')
+
+
+class TestPipelineInstrumentation(unittest.TestCase):
+    """Test cases for the stages reported by TextToSpeech and VoiceCloning."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+        self.out_path = os.path.join(self.tmp_dir.name, 'out.wav')
+        self.factory = StubModelFactory(real_time_factor=0, conditioning_time=0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_every_stage_is_recorded(self):
+        """Validation, init, conditioning, inference and file write are timed."""
+        metrics = Metrics()
+        events = []
+        metrics.add_hook(events.append)
+        vc = VoiceCloning(model_factory=self.factory, metrics=metrics)
+        self.assertTrue(vc.clone_voice("Hello there. Bye.", self.ref_path, 'en', self.out_path))
+
+        stages = [e.stage for e in events]
+        self.assertEqual(stages, ['validation', 'model_init', 'conditioning', 'inference', 'file_write'])
+        self.assertTrue(all(e.success and e.duration >= 0 for e in events))
+        self.assertEqual(events[3].labels, {'language': 'en'})
+
+        registry = metrics.registry
+        self.assertEqual(registry.value('tts_requests_total', {'status': 'success'}), 1)
+        self.assertEqual(registry.value('tts_inflight_requests'), 0)
+        self.assertGreater(registry.value('tts_audio_seconds_total'), 0)
+
+    def test_failed_inference_is_counted(self):
+        """A stage that raises is recorded as a failure."""
+        metrics = Metrics()
+        tts = TextToSpeech(model_factory=self.factory, metrics=metrics)
+        tts.initialize_model('stub')
+        tts.model.synthesizer.tts_model.inference = None  # not callable
+        self.assertFalse(tts.generate_audio("Hi.", self.ref_path, 'en', self.out_path))
+
+        registry = metrics.registry
+        self.assertEqual(registry.value('tts_stage_failures_total', {'stage': 'inference', 'language': 'en'}), 1)
+        self.assertEqual(registry.value('tts_requests_total', {'status': 'failure'}), 1)
+        self.assertEqual(registry.value('tts_inflight_requests'), 0)
+
+    def test_failing_hook_does_not_break_synthesis(self):
+        """Exceptions raised by hooks are logged and ignored."""
+        def bad_hook(event):
+            raise ValueError("boom")
+        tts = TextToSpeech(model_factory=self.factory, metrics=Metrics(hooks=[bad_hook]))
+        tts.initialize_model('stub')
+        self.assertEqual(tts.synthesize("Hi.", self.ref_path, 'en').sample_rate, 24000)
+
+    def test_disabled_by_default(self):
+        """Without a Metrics instance nothing is recorded and hooks are refused."""
+        tts = TextToSpeech(model_factory=self.factory)
+        self.assertIs(tts.metrics, NULL_METRICS)
+        self.assertFalse(tts.metrics.enabled)
+        tts.initialize_model('stub')
+        tts.synthesize("Hi.", self.ref_path, 'en')
+        with self.assertRaises(RuntimeError):
+            tts.metrics.add_hook(print)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the synthesized-audio output cache.
+"""
+import os
+import tempfile
+import unittest
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.output_cache import AudioOutputCache, normalize_text
+from tts.reference import PreprocessSettings, ReferencePreprocessor
+from tts.stub import StubModelFactory
+
+
+class TestAudioOutputCache(unittest.TestCase):
+    """Test cases for keys, hits and size-bounded eviction."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        self.ref_path = self.write_file('ref.wav', b'voice')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_file(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_key_normalizes_text_and_covers_parameters(self):
+        """Whitespace differences share a key; language and params do not."""
+        key = AudioOutputCache.make_key("Hello  world\n", self.ref_path, 'en', 'xtts')
+        self.assertEqual(key, AudioOutputCache.make_key(" Hello world", self.ref_path, 'en', 'xtts'))
+        self.assertNotEqual(key, AudioOutputCache.make_key("Hello world", self.ref_path, 'de', 'xtts'))
+        self.assertNotEqual(key, AudioOutputCache.make_key("Hello world", self.ref_path, 'en', 'xtts',
+                                                           {'speed': 1.2}))
+        self.assertEqual(normalize_text(" a\tb "), "a b")
+
+    def test_store_and_fetch(self):
+        """A stored render is copied to the requested output path."""
+        cache = AudioOutputCache(self.cache_dir)
+        rendered = self.write_file('render.wav', b'x' * 10)
+        cache.store('k', rendered)
+        out_path = os.path.join(self.tmp_dir.name, 'out.wav')
+        self.assertTrue(cache.fetch('k', out_path))
+        self.assertFalse(cache.fetch('missing', out_path))
+        with open(out_path, 'rb') as f:
+            self.assertEqual(f.read(), b'x' * 10)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_hardlink_mode(self):
+        """With hardlink=True hits share the cached file's inode."""
+        cache = AudioOutputCache(self.cache_dir, hardlink=True)
+        cache.store('k', self.write_file('render.wav', b'abc'))
+        out_path = self.write_file('out.wav', b'old')
+        self.assertTrue(cache.fetch('k', out_path))
+        self.assertEqual(os.stat(out_path).st_nlink, 2)
+
+    def test_lru_eviction_by_bytes(self):
+        """Least recently used entries are evicted to stay within the byte budget."""
+        cache = AudioOutputCache(self.cache_dir, max_bytes=25)
+        for key in ('a', 'b'):
+            cache.store(key, self.write_file(f'{key}.wav', b'x' * 10))
+        cache.fetch('a', os.path.join(self.tmp_dir.name, 'out.wav'))
+        cache.store('c', self.write_file('c.wav', b'x' * 10))
+
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['bytes'], 20)
+        self.assertFalse(cache.fetch('b', os.path.join(self.tmp_dir.name, 'out.wav')))
+        # The index is rebuilt from disk by a new instance
+        self.assertEqual(AudioOutputCache(self.cache_dir, max_bytes=25).stats()['entries'], 2)
+
+
+class TestOutputCacheIntegration(unittest.TestCase):
+    """Test that text_to_speech serves repeats from the cache."""
+
+    @patch('tts.core.TTS')
+    def test_repeat_request_skips_model(self, mock_tts_class):
+        """The second identical request neither loads the model nor runs inference."""
+        mock_model = MagicMock()
+        mock_tts_class.return_value = mock_model
+        mock_model.to.return_value = mock_model
+        mock_model.synthesizer.output_sample_rate = 24000
+        xtts = mock_model.synthesizer.tts_model
+        xtts.get_conditioning_latents.return_value = ('gpt', 'spk')
+        xtts.inference.return_value = {'wav': np.zeros(2400, dtype=np.float32)}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ref_path = os.path.join(tmp_dir, 'ref.wav')
+            with wave.open(ref_path, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(16000)
+                wf.writeframes(b'\0' * 32000)
+            cache = AudioOutputCache(os.path.join(tmp_dir, 'cache'))
+
+            first = TextToSpeech(output_cache=cache)
+            self.assertTrue(first.text_to_speech("Sponsor read.", ref_path, "en",
+                                                 os.path.join(tmp_dir, 'a.wav')))
+            second = TextToSpeech(output_cache=cache)
+            out_path = os.path.join(tmp_dir, 'b.wav')
+            self.assertTrue(second.text_to_speech("Sponsor read.", ref_path, "en", out_path))
+
+            self.assertTrue(os.path.exists(out_path))
+            self.assertIsNone(second.model)
+            self.assertEqual(xtts.inference.call_count, 1)
+            self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_profile_and_preprocessing_change_the_key(self):
+        """Renders with another inference profile or reference preprocessing are not served from cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ref_path = os.path.join(tmp_dir, 'ref.wav')
+            write_reference_wav(ref_path)
+            cache = AudioOutputCache(os.path.join(tmp_dir, 'cache'))
+            engines = [
+                dict(),
+                dict(profile='cpu_int8'),
+                dict(reference_preprocessor=ReferencePreprocessor(os.path.join(tmp_dir, 'refs'))),
+                dict(reference_preprocessor=ReferencePreprocessor(
+                    os.path.join(tmp_dir, 'refs'), PreprocessSettings(target_dbfs=-16.0))),
+            ]
+            for i, options in enumerate(engines):
+                tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                                   output_cache=cache, **options)
+                self.assertTrue(tts.text_to_speech("Sponsor read.", ref_path, "en",
+                                                   os.path.join(tmp_dir, f'out_{i}.wav')))
+            self.assertEqual(cache.stats()['hits'], 0)
+            self.assertEqual(cache.stats()['entries'], len(engines))
+
+
+if __name__ == '__main__':
+    unittest.main()
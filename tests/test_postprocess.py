@@ -0,0 +1,157 @@
+"""
+Unit tests for block-wise audio post-processing.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from tts.audio import AudioChunk
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.postprocess import (LoudnessMeter, PostProcessSettings, PostProcessor, crossfade,
+                             normalize_loudness, resample_stream, trim_edges)
+from tts.stub import StubModelFactory
+
+
+def sine(seconds, rate, amplitude=1.0, freq=997.0):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def lufs(samples, rate):
+    meter = LoudnessMeter(rate)
+    meter.feed(samples)
+    return meter.integrated_lufs()
+
+
+class TestLoudness(unittest.TestCase):
+    """Test cases for loudness measurement and normalization."""
+
+    def test_full_scale_sine_reference(self):
+        """A full-scale 997 Hz sine measures -3.01 LUFS (BS.1770 reference)."""
+        for rate in (24000, 48000):
+            self.assertAlmostEqual(lufs(sine(5.0, rate), rate), -3.01, delta=0.1)
+
+    def test_blockwise_matches_whole(self):
+        """Feeding audio in odd-sized blocks gives the same result."""
+        audio = sine(3.0, 24000, 0.2) * np.linspace(0.2, 1.0, 72000, dtype=np.float32)
+        meter = LoudnessMeter(24000)
+        for start in range(0, len(audio), 7777):
+            meter.feed(audio[start:start + 7777])
+        self.assertAlmostEqual(meter.integrated_lufs(), lufs(audio, 24000), places=6)
+
+    def test_normalize_respects_peak_ceiling(self):
+        """Normalization reaches the target unless the peak ceiling limits it."""
+        quiet = normalize_loudness(sine(3.0, 24000, 0.01), 24000, target_lufs=-20.0)
+        self.assertAlmostEqual(lufs(quiet, 24000), -20.0, delta=0.1)
+        loud = normalize_loudness(sine(3.0, 24000, 0.01), 24000, target_lufs=0.0, peak_dbfs=-6.0)
+        self.assertAlmostEqual(np.max(np.abs(loud)), 10 ** (-6 / 20), places=3)
+
+
+class TestStreamingStages(unittest.TestCase):
+    """Test cases for crossfade, trimming and resampling."""
+
+    def test_equal_power_crossfade(self):
+        """Segments overlap by the fade length with cos/sin gains."""
+        blocks = [np.ones(100, dtype=np.float32), np.ones(100, dtype=np.float32) * 2]
+        out = np.concatenate(list(crossfade(blocks, 20)))
+        self.assertEqual(len(out), 180)
+        np.testing.assert_allclose(out[:80], 1.0)
+        np.testing.assert_allclose(out[80], 1.0, atol=1e-6)  # cos(0) * 1 + sin(0) * 2
+        np.testing.assert_allclose(out[99], 2.0, atol=1e-6)
+        np.testing.assert_allclose(out[100:], 2.0)
+
+    def test_crossfade_short_segments(self):
+        """Fades shrink to fit segments shorter than the fade."""
+        blocks = [np.ones(5, dtype=np.float32)] * 3
+        out = np.concatenate(list(crossfade(blocks, 20)))
+        # The first two overlap completely, leaving no tail to fade into the third
+        self.assertEqual(len(out), 10)
+
+    def test_trim_edges(self):
+        """Leading and trailing silence is removed; interior silence is kept."""
+        silence = np.zeros(50, dtype=np.float32)
+        tone = np.ones(10, dtype=np.float32)
+        blocks = [silence, np.concatenate([silence, tone]), silence, tone, silence, silence]
+        out = np.concatenate(list(trim_edges(blocks, 0.5, max_trailing_samples=1000)))
+        self.assertEqual(len(out), 10 + 50 + 10)
+
+    def test_trailing_buffer_is_bounded(self):
+        """Quiet audio beyond max_trailing_samples is emitted, not held."""
+        def blocks():
+            yield np.ones(10, dtype=np.float32)
+            for _ in range(1000):
+                yield np.zeros(100, dtype=np.float32)
+        emitted = 0
+        for block in trim_edges(blocks(), 0.5, max_trailing_samples=300):
+            emitted += len(block)
+        self.assertGreaterEqual(emitted, 10 + 1000 * 100 - 400)
+
+    def test_resample_stream_length(self):
+        """Streaming resampling preserves duration across block boundaries."""
+        blocks = [sine(0.25, 24000, 0.5, 440.0)] * 8
+        out = np.concatenate(list(resample_stream(blocks, 24000, 16000)))
+        self.assertAlmostEqual(len(out), 32000, delta=2)
+
+
+class TestGenerateAudioPostProcess(unittest.TestCase):
+    """Test cases for post-processing on the generate_audio file path."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+        self.out_path = os.path.join(self.tmp_dir.name, 'out.wav')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_file_is_processed(self):
+        """The written file is resampled and normalized to the target loudness."""
+        settings = PostProcessSettings(crossfade_seconds=0.05, target_lufs=-18.0, sample_rate=16000)
+        tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                           postprocess=settings)
+        tts.initialize_model('stub')
+        self.assertTrue(tts.generate_audio("First sentence here. And a second one.", self.ref_path,
+                                           'en', self.out_path))
+        audio, rate = sf.read(self.out_path, dtype='float32')
+        self.assertEqual(rate, 16000)
+        self.assertAlmostEqual(lufs(audio, rate), -18.0, delta=0.5)
+
+    def test_lossy_output_is_encoded_once(self):
+        """Normalized Ogg output is encoded once, from a float intermediate."""
+        tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                           postprocess=PostProcessSettings(target_lufs=-18.0))
+        tts.initialize_model('stub')
+        out_path = os.path.join(self.tmp_dir.name, 'out.ogg')
+        read_subtypes = []
+        blocks = sf.blocks
+
+        def recording_blocks(path, *args, **kwargs):
+            read_subtypes.append(sf.info(path).subtype)
+            return blocks(path, *args, **kwargs)
+
+        with patch('soundfile.blocks', side_effect=recording_blocks):
+            self.assertTrue(tts.generate_audio("First sentence here. And a second one.", self.ref_path,
+                                               'en', out_path))
+        self.assertEqual(read_subtypes, ['FLOAT'])
+        self.assertEqual(sf.info(out_path).subtype, 'VORBIS')
+        audio, rate = sf.read(out_path, dtype='float32')
+        self.assertAlmostEqual(lufs(audio, rate), -18.0, delta=0.5)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['out.ogg', 'ref.wav'])
+
+    def test_processor_without_normalization(self):
+        """finalize_file is a no-op when normalization is disabled."""
+        processor = PostProcessor(PostProcessSettings(target_lufs=None, trim_dbfs=None))
+        chunks = [AudioChunk(samples=sine(1.0, 8000, 0.1), sample_rate=8000, index=0)]
+        out = list(processor.process(chunks))
+        sf.write(self.out_path, out[0].samples, 8000)
+        self.assertEqual(processor.finalize_file(self.out_path), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for CPU inference profiles.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import torch
+from transformers.pytorch_utils import Conv1D
+
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.profile import InferenceProfile, apply_profile, get_profile, inference_context
+from tts.stub import StubModelFactory
+
+
+class TinyGpt(torch.nn.Module):
+    """GPT-2 style block mixing Conv1D and Linear projections."""
+
+    def __init__(self):
+        super().__init__()
+        self.c_attn = Conv1D(24, 8)
+        self.head = torch.nn.Linear(24, 4)
+
+    def forward(self, x):
+        return self.head(self.c_attn(x))
+
+
+class TestApplyProfile(unittest.TestCase):
+    """Test cases for applying profiles to a torch model."""
+
+    def setUp(self):
+        # Keep the process thread settings unchanged
+        self.profile = dict(num_threads=torch.get_num_threads(), num_interop_threads=None)
+
+    def test_int8_quantizes_conv1d_and_linear(self):
+        """GPT-2 Conv1D layers are converted and quantized along with Linear layers."""
+        xtts = MagicMock(spec=[])
+        xtts.gpt = TinyGpt().eval()
+        x = torch.randn(2, 8)
+        expected = xtts.gpt(x)
+
+        report = apply_profile(InferenceProfile(quantize_int8=True, **self.profile), xtts, 'cpu', torch)
+        self.assertEqual(report['quantized_layers'], 2)
+        self.assertNotIsInstance(xtts.gpt.head, torch.nn.Linear)
+        torch.testing.assert_close(xtts.gpt(x), expected, atol=0.1, rtol=0.1)
+
+    def test_quantization_skipped_off_cpu(self):
+        """int8 quantization is CPU only and the skip is reported."""
+        xtts = MagicMock(spec=[])
+        xtts.gpt = TinyGpt()
+        report = apply_profile(InferenceProfile(quantize_int8=True, **self.profile), xtts, 'cuda', torch)
+        self.assertEqual(report['quantized_layers'], 0)
+        self.assertTrue(report['notes'])
+        self.assertIsInstance(xtts.gpt.head, torch.nn.Linear)
+
+    def test_reports_effective_settings(self):
+        """Thread counts and inference mode are reported as applied."""
+        report = apply_profile(InferenceProfile(name='t', **self.profile), None, 'cpu', torch)
+        self.assertEqual(report['num_threads'], torch.get_num_threads())
+        self.assertTrue(report['inference_mode'])
+        self.assertEqual(report['profile']['name'], 't')
+
+    def test_inference_context(self):
+        """Generation runs under inference mode when the profile enables it."""
+        report = apply_profile(InferenceProfile(**self.profile), None, 'cpu', torch)
+        with inference_context(report, torch):
+            self.assertTrue(torch.is_inference_mode_enabled())
+        self.assertFalse(torch.is_inference_mode_enabled())
+
+    def test_unknown_profile(self):
+        """Unknown profile names are rejected."""
+        with self.assertRaises(ValueError):
+            get_profile('turbo')
+
+
+class TestEngineProfile(unittest.TestCase):
+    """Test cases for profiles applied through TextToSpeech."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch('tts.core.TTS')
+    def test_inference_runs_under_profile(self, mock_tts_class):
+        """XTTS inference is called with inference mode enabled."""
+        mock_model = MagicMock()
+        mock_tts_class.return_value = mock_model
+        mock_model.to.return_value = mock_model
+        mock_model.synthesizer.output_sample_rate = 24000
+        xtts = mock_model.synthesizer.tts_model
+        xtts.get_conditioning_latents.return_value = ('gpt', 'spk')
+        modes = []
+        def inference(**kwargs):
+            modes.append(torch.is_inference_mode_enabled())
+            return {'wav': np.zeros(10)}
+        xtts.inference.side_effect = inference
+
+        profile = InferenceProfile(num_threads=torch.get_num_threads())
+        tts = TextToSpeech(profile=profile)
+        self.assertTrue(tts.initialize_model())
+        self.assertTrue(tts.profile_report['inference_mode'])
+        tts.synthesize("One" + " more" * 45 + ". Two" + " more" * 45 + ".", self.ref_path, 'en')
+        self.assertEqual(modes, [True, True])
+        self.assertFalse(torch.is_inference_mode_enabled())
+
+    def test_non_torch_model_reports_not_applied(self):
+        """Profiles are reported as not applied for models without torch."""
+        with patch('tts.core.torch', None):
+            tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0), profile='cpu')
+            self.assertTrue(tts.initialize_model('stub'))
+            self.assertFalse(tts.profile_report['inference_mode'])
+            self.assertTrue(tts.profile_report['notes'])
+            self.assertGreater(tts.synthesize("Hi.", self.ref_path, 'en').duration, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Unit tests for reference audio preprocessing.
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+from tts.reference import PreprocessSettings, ReferencePreprocessor, preprocess_audio
+from tts.stub import StubModelFactory
+from tts.voice_cloning import VoiceCloning
+
+
+def speech_like(seconds, sample_rate, amplitude=0.05):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * 150 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))).astype(np.float32)
+
+
+class TestPreprocessAudio(unittest.TestCase):
+    """Test cases for the preprocessing chain."""
+
+    def test_downmix_resample_trim_normalize(self):
+        """Stereo 48 kHz audio with silent edges becomes trimmed, normalized mono."""
+        rate = 48000
+        voice = speech_like(4.0, rate)
+        silence = np.zeros(rate, dtype=np.float32)
+        mono = np.concatenate([silence, voice, silence])
+        stereo = np.stack([mono, mono * 0.5], axis=1)
+
+        out = preprocess_audio(stereo, rate, PreprocessSettings(sample_rate=22050, target_dbfs=-20.0))
+        self.assertEqual(out.ndim, 1)
+        self.assertEqual(out.dtype, np.float32)
+        self.assertAlmostEqual(len(out) / 22050, 4.0, delta=0.2)  # frame-granular trim
+        rms_dbfs = 20 * np.log10(np.sqrt(np.mean(out ** 2)))
+        self.assertAlmostEqual(rms_dbfs, -20.0, delta=1.5)
+        self.assertLessEqual(np.max(np.abs(out)), 10 ** (-1 / 20) + 1e-6)
+
+    def test_length_cap(self):
+        """Output never exceeds max_seconds."""
+        out = preprocess_audio(speech_like(10.0, 22050), 22050, PreprocessSettings(max_seconds=3.0))
+        self.assertEqual(len(out), 3 * 22050)
+
+    def test_silence_trims_to_nothing(self):
+        """All-silent input produces empty output."""
+        self.assertEqual(len(preprocess_audio(np.zeros(22050), 22050)), 0)
+
+
+class TestReferencePreprocessor(unittest.TestCase):
+    """Test cases for the on-disk preprocessing cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'prepared')
+        self.source = os.path.join(self.tmp_dir.name, 'upload.wav')
+        audio = speech_like(5.0, 44100)
+        sf.write(self.source, np.stack([audio, audio], axis=1), 44100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_processed_once_per_content(self):
+        """The same content under another path is served from the cache."""
+        preprocessor = ReferencePreprocessor(self.cache_dir)
+        path = preprocessor.prepare(self.source)
+        info = sf.info(path)
+        self.assertEqual((info.samplerate, info.channels, info.subtype), (22050, 1, 'PCM_16'))
+        self.assertLess(os.path.getsize(path), os.path.getsize(self.source))
+
+        copy = os.path.join(self.tmp_dir.name, 'copy.wav')
+        with open(self.source, 'rb') as src, open(copy, 'wb') as dst:
+            dst.write(src.read())
+        self.assertEqual(ReferencePreprocessor(self.cache_dir).prepare(copy), path)
+        self.assertEqual(preprocessor.stats(), {'hits': 0, 'misses': 1})
+
+    def test_settings_change_the_key(self):
+        """Different settings produce a separate cache entry."""
+        a = ReferencePreprocessor(self.cache_dir).prepare(self.source)
+        b = ReferencePreprocessor(self.cache_dir, PreprocessSettings(target_dbfs=-16.0)).prepare(self.source)
+        self.assertNotEqual(a, b)
+
+    def test_conditioning_uses_prepared_reference(self):
+        """The model is conditioned on the preprocessed file."""
+        vc = VoiceCloning(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                          reference_preprocessor=ReferencePreprocessor(self.cache_dir))
+        vc.initialize_model('stub')
+        xtts = vc.model.synthesizer.tts_model
+        seen = []
+        original = xtts.get_conditioning_latents
+        xtts.get_conditioning_latents = lambda audio_path: seen.append(audio_path) or original(audio_path)
+
+        vc.synthesize("Hello.", self.source, 'en')
+        self.assertEqual(seen, [[vc.preprocess_voice_sample(self.source)]])
+        self.assertTrue(seen[0][0].startswith(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
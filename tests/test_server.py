@@ -0,0 +1,125 @@
+"""
+Unit tests for the local synthesis server, run against the stub backend.
+"""
+import http.client
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import soundfile as sf
+
+from tts.async_executor import QueueFullError
+from tts.benchmark import write_reference_wav
+from tts.metrics import Metrics
+from tts.server import RequestLimiter, SynthesisServer
+from tts.stub import StubModelFactory
+from tts.voice_cloning import VoiceCloning
+from tts.voice_library import VoiceLibrary
+
+
+class TestRequestLimiter(unittest.TestCase):
+    """Test cases for admission control."""
+
+    def test_rejects_beyond_queue(self):
+        """Requests beyond concurrency plus queue are rejected without blocking."""
+        limiter = RequestLimiter(max_concurrency=1, max_queue=0)
+        with limiter.slot():
+            self.assertEqual(limiter.outstanding, 1)
+            with self.assertRaises(QueueFullError):
+                with limiter.slot():
+                    pass
+        self.assertEqual(limiter.outstanding, 0)
+
+
+class TestSynthesisServer(unittest.TestCase):
+    """Test cases for the HTTP endpoints."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+        engine = VoiceCloning(
+            model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+            voice_library=VoiceLibrary(os.path.join(self.tmp_dir.name, 'voices')),
+            metrics=Metrics(),
+        )
+        self.server = SynthesisServer(engine, port=0, max_concurrency=1, max_queue=0)
+        self.server.start()
+        self.assertTrue(self.server.wait_until_loaded(timeout=10))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.tmp_dir.cleanup()
+
+    def request(self, method, path, body=None):
+        connection = http.client.HTTPConnection(*self.server.address, timeout=10)
+        try:
+            connection.request(method, path, body=json.dumps(body) if body is not None else None)
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def create_voice(self):
+        status, _, body = self.request('POST', '/voices', {'voice_id': 'host', 'samples': [self.ref_path]})
+        self.assertEqual(status, 201, body)
+
+    def test_health_and_ready(self):
+        """Liveness and readiness report OK once the model is loaded."""
+        self.assertEqual(self.request('GET', '/health')[0], 200)
+        status, _, body = self.request('GET', '/ready')
+        self.assertEqual(status, 200)
+        self.assertTrue(json.loads(body)['ready'])
+
+    def test_streams_wav_for_registered_voice(self):
+        """Synthesis streams a chunked 16-bit WAV in the registered voice."""
+        self.create_voice()
+        self.assertEqual(json.loads(self.request('GET', '/voices')[2])['voices'][0]['voice_id'], 'host')
+        status, headers, body = self.request('POST', '/synthesize', {
+            'text': "Welcome to the show. Today we talk about caching.", 'voice': 'host',
+        })
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        audio, rate = sf.read(io.BytesIO(body), dtype='int16')
+        self.assertEqual(rate, 24000)
+        self.assertGreater(len(audio), 0)
+
+    def test_raw_pcm_format(self):
+        """format=pcm returns headerless 16-bit samples."""
+        self.create_voice()
+        status, headers, body = self.request('POST', '/synthesize', {
+            'text': "Short line.", 'voice': 'host', 'format': 'pcm', 'stream_chunk_size': None,
+        })
+        self.assertEqual(status, 200)
+        self.assertTrue(headers['Content-Type'].startswith('audio/L16'))
+        self.assertEqual(len(body) % 2, 0)
+        self.assertNotEqual(body[:4], b'RIFF')
+
+    def test_client_errors(self):
+        """Unknown voices, bad requests and routes get 4xx responses."""
+        self.assertEqual(self.request('POST', '/synthesize', {'text': 'Hi', 'voice': 'nobody'})[0], 404)
+        self.assertEqual(self.request('POST', '/synthesize', {'voice': 'host'})[0], 400)
+        self.assertEqual(self.request('POST', '/voices', {'voice_id': '../x', 'samples': ['a.wav']})[0], 400)
+        self.assertEqual(self.request('GET', '/nothing')[0], 404)
+
+    def test_queue_full(self):
+        """Requests are rejected with 503 when the queue limit is reached."""
+        self.create_voice()
+        with self.server.limiter.slot():
+            status, headers, _ = self.request('POST', '/synthesize', {'text': 'Hi there.', 'voice': 'host'})
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['Retry-After'], '1')
+
+    def test_metrics(self):
+        """The metrics endpoint serves the Prometheus text format."""
+        self.create_voice()
+        self.request('POST', '/synthesize', {'text': 'Hi there.', 'voice': 'host'})
+        status, _, body = self.request('GET', '/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn(b'tts_requests_total', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,271 @@
+"""
+Unit tests for once-only model loading, the shared model registry (with
+eviction) and single-flight request coalescing.
+"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.model_registry import ModelRegistry
+from tts.singleflight import SingleFlight
+from tts.stub import StubModelFactory
+
+
+class CountingFactory(StubModelFactory):
+    """Stub factory that counts loads and takes a while to load."""
+
+    def __init__(self, **options):
+        super().__init__(real_time_factor=0, conditioning_time=0, load_time=0.2, **options)
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, model_name):
+        with self._lock:
+            self.loads += 1
+        return super().__call__(model_name)
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Only the leader runs; followers get its result."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def work():
+            started.set()
+            release.wait(5)
+            return object()
+
+        def caller(_):
+            results.append(flight.do('key', work))
+
+        leader = threading.Thread(target=caller, args=(0,))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=caller, args=(i,)) for i in range(3)]
+        for thread in followers:
+            thread.start()
+        while flight.stats()['coalesced'] < 3:
+            time.sleep(0.01)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(len({id(result) for result, _ in results}), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+        self.assertEqual(flight.stats(), {'calls': 1, 'coalesced': 3, 'in_flight': 0})
+
+    def test_errors_propagate_and_are_not_kept(self):
+        """A failure reaches the caller and the next call runs again."""
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('key', lambda: (_ for _ in ()).throw(ValueError("boom")))
+        self.assertEqual(flight.do('key', lambda: 42), (42, False))
+
+
+class TestModelSharing(unittest.TestCase):
+    """Test cases for guarded initialization and the model registry."""
+
+    def test_concurrent_initialize_loads_once(self):
+        """Racing initialize_model calls on one instance load the model once."""
+        factory = CountingFactory()
+        tts = TextToSpeech(model_factory=factory)
+        outcomes = []
+        run_threads(lambda _: outcomes.append(tts.initialize_model('stub')), 4)
+        self.assertEqual(outcomes, [True] * 4)
+        self.assertEqual(factory.loads, 1)
+
+    def test_registry_shares_model_between_instances(self):
+        """Instances using a registry reuse one model; others load their own."""
+        factory = CountingFactory()
+        registry = ModelRegistry()
+        engines = [TextToSpeech(model_factory=factory, model_registry=registry) for _ in range(3)]
+        run_threads(lambda i: engines[i].initialize_model('stub'), 3)
+        self.assertEqual(factory.loads, 1)
+        self.assertEqual(len({id(engine.model) for engine in engines}), 1)
+        stats = registry.stats()
+        self.assertEqual((stats['models'], stats['loads'], stats['hits']), (1, 1, 2))
+
+        private = TextToSpeech(model_factory=factory)
+        private.initialize_model('stub')
+        self.assertEqual(factory.loads, 2)
+        self.assertIsNot(private.model, engines[0].model)
+
+    def test_failed_load_is_retried(self):
+        """A failed load is not cached in the registry."""
+        registry = ModelRegistry()
+        failing = TextToSpeech(model_factory=lambda name: 1 / 0, model_registry=registry)
+        self.assertFalse(failing.initialize_model('stub'))
+        self.assertEqual(len(registry), 0)
+
+
+class TestModelEviction(unittest.TestCase):
+    """Test cases for the registry's memory budget and idle eviction."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def engine(self, registry, factory):
+        return TextToSpeech(model_factory=factory, model_registry=registry)
+
+    def test_budget_evicts_least_recently_used(self):
+        """Loading past the budget evicts the LRU model, which reloads on its next use."""
+        registry = ModelRegistry(max_bytes=150, size_estimator=lambda model: 100)
+        factory_a, factory_b = CountingFactory(), CountingFactory()
+        engine_a, engine_b = self.engine(registry, factory_a), self.engine(registry, factory_b)
+        engine_a.initialize_model('a')
+        engine_b.initialize_model('b')
+        stats = registry.stats()
+        self.assertEqual((stats['models'], stats['bytes'], stats['evictions']), (1, 100, 1))
+
+        result = engine_a.synthesize("Back again.", self.ref_path, 'en')
+        self.assertGreater(result.duration, 0)
+        self.assertEqual(factory_a.loads, 2)
+        stats = registry.stats()
+        self.assertEqual((stats['reloads'], stats['evictions']), (1, 2))
+
+    def test_idle_models_are_unloaded(self):
+        """Models unused for idle_seconds are evicted in the background."""
+        registry = ModelRegistry(idle_seconds=0.1, size_estimator=lambda model: 1)
+        self.addCleanup(registry.close)
+        factory = CountingFactory()
+        engine = self.engine(registry, factory)
+        engine.initialize_model('a')
+        deadline = time.time() + 5
+        while len(registry) and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(len(registry), 0)
+        self.assertIsNotNone(engine.model)
+        self.assertEqual(factory.loads, 2)
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    """Test cases for coalescing identical synthesis requests."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+        self.tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0))
+        self.tts.initialize_model('stub')
+        self.renders = 0
+        original = self.tts.generate_audio
+
+        def slow_generate(**kwargs):
+            # Hold the leader until the follower has joined its flight
+            self.renders += 1
+            deadline = time.time() + 5
+            while self.tts.single_flight.coalesced < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            return original(**kwargs)
+
+        self.tts.generate_audio = slow_generate
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_identical_requests_render_once(self):
+        """Two identical text_to_speech calls share one render and both get the file."""
+        paths = [os.path.join(self.tmp_dir.name, f"out{i}.wav") for i in range(2)]
+        outcomes = []
+        run_threads(lambda i: outcomes.append(
+            self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path, 'en', paths[i])), 2)
+        self.assertEqual(outcomes, [True, True])
+        self.assertEqual(self.renders, 1)
+        with open(paths[0], 'rb') as a, open(paths[1], 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def run_leader_and_follower(self, leader_call, follower_call):
+        """Start leader_call, then follower_call once the leader is rendering."""
+        leader = threading.Thread(target=leader_call)
+        leader.start()
+        deadline = time.time() + 5
+        while self.renders < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        follower = threading.Thread(target=follower_call)
+        follower.start()
+        for thread in (leader, follower):
+            thread.join(10)
+
+    def test_leader_cancels_follower_succeeds(self):
+        """A cancelled leader gets False while the follower still receives the render."""
+        paths = [os.path.join(self.tmp_dir.name, f"out{i}.wav") for i in range(2)]
+        cancel = threading.Event()
+        cancel.set()
+        outcomes = {}
+        self.run_leader_and_follower(
+            lambda: outcomes.update(lead=self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path,
+                                                                  'en', paths[0], cancel_event=cancel)),
+            lambda: outcomes.update(follow=self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path,
+                                                                    'en', paths[1])))
+        self.assertEqual(outcomes, {'lead': False, 'follow': True})
+        self.assertEqual(self.renders, 1)
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertGreater(sf.info(paths[1]).frames, 0)
+
+    def test_render_stops_when_every_caller_cancels(self):
+        """The shared render is abandoned once all of its callers have cancelled."""
+        paths = [os.path.join(self.tmp_dir.name, f"out{i}.wav") for i in range(2)]
+        cancels = [threading.Event(), threading.Event()]
+        for cancel in cancels:
+            cancel.set()
+        outcomes = {}
+        self.run_leader_and_follower(
+            lambda: outcomes.update(lead=self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path,
+                                                                  'en', paths[0], cancel_event=cancels[0])),
+            lambda: outcomes.update(follow=self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path,
+                                                                    'en', paths[1], cancel_event=cancels[1])))
+        self.assertEqual(outcomes, {'lead': False, 'follow': False})
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+
+    def test_follower_keeps_output_when_leader_removes_its_own(self):
+        """The follower's copy is made before the leader's caller can remove its file."""
+        paths = [os.path.join(self.tmp_dir.name, f"out{i}.wav") for i in range(2)]
+        outcomes = {}
+
+        def lead():
+            outcomes['lead'] = self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path, 'en', paths[0])
+            os.remove(paths[0])
+
+        self.run_leader_and_follower(
+            lead,
+            lambda: outcomes.update(follow=self.tts.text_to_speech("Thanks to our sponsor.", self.ref_path,
+                                                                    'en', paths[1])))
+        self.assertEqual(outcomes, {'lead': True, 'follow': True})
+        self.assertEqual(self.renders, 1)
+        self.assertGreater(sf.info(paths[1]).frames, 0)
+
+    def test_different_requests_are_not_coalesced(self):
+        """Requests differing in text each run inference."""
+        first = self.tts.synthesize("First line.", self.ref_path, 'en')
+        second = self.tts.synthesize("Second line.", self.ref_path, 'en')
+        self.assertFalse(np.array_equal(first.samples, second.samples))
+        self.assertEqual(self.tts.single_flight.stats()['calls'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
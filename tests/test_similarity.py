@@ -0,0 +1,163 @@
+"""
+Unit tests for voice similarity scoring and the clone_voice similarity gate.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from tts.benchmark import write_reference_wav
+from tts.similarity import VoiceSimilarityScorer, cosine_similarity
+from tts.stub import StubModelFactory
+from tts.voice_cloning import VoiceCloning
+from tts.voice_library import VoiceLibrary
+
+
+def stub_factory():
+    return StubModelFactory(real_time_factor=0, conditioning_time=0)
+
+
+class TestVoiceSimilarityScorer(unittest.TestCase):
+    """Test cases for VoiceSimilarityScorer."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.voices = []
+        for i in range(2):
+            path = os.path.join(self.tmp_dir.name, f"voice{i}.wav")
+            write_reference_wav(path, seconds=3.0 + 4 * i)
+            self.voices.append(path)
+        self.vc = VoiceCloning(model_factory=stub_factory())
+        self.vc.initialize_model('stub')
+        # A clip of each voice serves as that voice's scoring reference
+        self.references = []
+        for i, voice in enumerate(self.voices):
+            path = os.path.join(self.tmp_dir.name, f"reference{i}.wav")
+            self.vc.synthesize("A reference line for this speaker.", voice, 'en', output_path=path)
+            self.references.append(path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def segments(self, voice, count=3):
+        return [self.vc.synthesize(f"Segment number {i}.", voice, 'en') for i in range(count)]
+
+    def test_cosine_similarity(self):
+        """Row-wise and broadcast cosine similarity match the definition."""
+        embeddings = np.array([[1.0, 0.0], [1.0, 1.0]])
+        np.testing.assert_allclose(cosine_similarity(embeddings, np.array([2.0, 0.0])), [1.0, np.sqrt(0.5)])
+        np.testing.assert_allclose(cosine_similarity(embeddings, embeddings[::-1]), [np.sqrt(0.5)] * 2)
+
+    def test_same_voice_scores_higher(self):
+        """Segments score above the threshold against their own voice and below it against another."""
+        scorer = self.vc.similarity_scorer
+        own = scorer.score(self.segments(self.voices[0]), self.references[0])
+        other = scorer.score(self.segments(self.voices[0]), self.references[1])
+        self.assertTrue(scorer.passes(own).all())
+        self.assertFalse(scorer.passes(other).any())
+
+    def test_references_are_embedded_once(self):
+        """Each distinct reference is embedded once per batch and cached across batches."""
+        scorer = self.vc.similarity_scorer
+        outputs = self.segments(self.voices[0], 2) + self.segments(self.voices[1], 2)
+        references = [self.references[0]] * 2 + [self.references[1]] * 2
+        scores = scorer.score(outputs, references)
+        self.assertEqual(scores.shape, (4,))
+        self.assertEqual(scorer.stats(), {'references': 2, 'hits': 0, 'misses': 2})
+        scorer.score(outputs[:1], self.references[0])
+        self.assertEqual(scorer.stats()['hits'], 1)
+        with self.assertRaises(ValueError):
+            scorer.score(outputs, references[:1])
+
+    def test_long_clips_are_cropped(self):
+        """Only the first max_seconds of a clip are encoded."""
+        scorer = VoiceSimilarityScorer(self.vc, max_seconds=1.0)
+        clip = self.vc.synthesize("A long sentence. " * 10, self.voices[0], 'en')
+        head = (clip.samples[:clip.sample_rate], clip.sample_rate)
+        np.testing.assert_array_equal(scorer.embed(clip), scorer.embed(head))
+
+    def test_long_files_are_read_partially(self):
+        """Only the first max_seconds of a clip file are decoded."""
+        scorer = VoiceSimilarityScorer(self.vc, max_seconds=1.0)
+        clip = self.vc.synthesize("A long sentence. " * 10, self.voices[0], 'en')
+        path = os.path.join(self.tmp_dir.name, 'clip.wav')
+        clip.write(path)
+        head = (sf.read(path, dtype='float32')[0][:clip.sample_rate], clip.sample_rate)
+        with patch('tts.similarity.sf.read', wraps=sf.read) as read:
+            embedding = scorer.embed(path)
+        self.assertEqual(read.call_args.kwargs['frames'], clip.sample_rate)
+        np.testing.assert_array_equal(embedding, scorer.embed(head))
+
+
+class TestSimilarityGate(unittest.TestCase):
+    """Test cases for clone_voice's optional similarity gate."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+        self.output_path = os.path.join(self.tmp_dir.name, 'out.wav')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_gate_passes_and_rejects(self):
+        """Outputs below the threshold are rejected and deleted; others are kept."""
+        lenient = VoiceCloning(model_factory=stub_factory(), similarity_threshold=-1.0)
+        self.assertTrue(lenient.clone_voice("Hello there.", self.ref_path, 'en', self.output_path))
+        self.assertIsNotNone(lenient.last_similarity)
+        self.assertTrue(os.path.exists(self.output_path))
+
+        strict = VoiceCloning(model_factory=stub_factory(), similarity_threshold=1.01)
+        self.assertFalse(strict.clone_voice("Hello there.", self.ref_path, 'en', self.output_path))
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_gate_with_library_voice(self):
+        """Library voices are scored against their stored speaker embedding."""
+        library = VoiceLibrary(os.path.join(self.tmp_dir.name, 'voices'))
+        lenient = VoiceCloning(model_factory=stub_factory(), voice_library=library, similarity_threshold=-1.0)
+        lenient.initialize_model('stub')
+        self.assertTrue(lenient.create_voice('host', [self.ref_path]))
+        self.assertTrue(lenient.clone_voice("Hello there.", 'host', 'en', self.output_path))
+        self.assertTrue(os.path.exists(self.output_path))
+        # The stored embedding matches what the speaker encoder gives for the sample
+        self.assertAlmostEqual(lenient.last_similarity,
+                               float(lenient.similarity_scorer.score([self.output_path], self.ref_path)[0]),
+                               places=5)
+
+        strict = VoiceCloning(model_factory=stub_factory(), voice_library=library, similarity_threshold=1.01)
+        strict.initialize_model('stub')
+        self.assertFalse(strict.clone_voice("Hello there.", 'host', 'en', self.output_path))
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_gate_is_off_by_default(self):
+        """Without a threshold, clone_voice does not score its output."""
+        vc = VoiceCloning(model_factory=stub_factory())
+        self.assertTrue(vc.clone_voice("Hello there.", self.ref_path, 'en', self.output_path))
+        self.assertIsNone(vc.last_similarity)
+        self.assertEqual(vc.similarity_scorer.stats()['misses'], 0)
+
+
+class TestAsyncSimilarityGate(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the similarity gate on aclone_voice."""
+
+    async def test_async_gate_rejects_and_deletes(self):
+        """aclone_voice applies the same gate as clone_voice."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ref_path = os.path.join(tmp_dir, 'ref.wav')
+            output_path = os.path.join(tmp_dir, 'out.wav')
+            write_reference_wav(ref_path)
+            strict = VoiceCloning(model_factory=stub_factory(), similarity_threshold=1.01)
+            self.assertFalse(await strict.aclone_voice("Hello there.", ref_path, 'en', output_path))
+            self.assertIsNotNone(strict.last_similarity)
+            self.assertFalse(os.path.exists(output_path))
+
+            lenient = VoiceCloning(model_factory=stub_factory(), similarity_threshold=-1.0)
+            self.assertTrue(await lenient.aclone_voice("Hello there.", ref_path, 'en', output_path))
+            self.assertTrue(os.path.exists(output_path))
+
+if __name__ == '__main__':
+    unittest.main()
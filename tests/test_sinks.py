@@ -0,0 +1,122 @@
+"""
+Unit tests for pipelined audio file sinks.
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+from tts.audio import AudioChunk
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.sinks import AudioFileSink, format_for_path
+from tts.stub import StubModelFactory
+
+
+def tone_chunks(count=4, rate=24000, seconds=0.5):
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (0.3 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+    return [AudioChunk(samples=samples, sample_rate=rate, index=i) for i in range(count)]
+
+
+class TestAudioFileSink(unittest.TestCase):
+    """Test cases for AudioFileSink."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_format_follows_extension(self):
+        """Compressed formats default to 16-bit FLAC and Vorbis."""
+        for name, fmt, subtype in (('out.wav', 'WAV', 'PCM_16'), ('out.flac', 'FLAC', 'PCM_16'),
+                                   ('out.ogg', 'OGG', 'VORBIS')):
+            path = self.path(name)
+            with AudioFileSink(path) as sink:
+                for chunk in tone_chunks():
+                    sink.write(chunk)
+            info = sf.info(path)
+            self.assertEqual((info.format, info.subtype), (fmt, subtype))
+            self.assertEqual(info.samplerate, 24000)
+            self.assertEqual(sink.frames, 4 * 12000)
+            self.assertAlmostEqual(info.duration, 2.0, delta=0.01)
+
+    def test_explicit_subtype(self):
+        """A configured bit depth is used."""
+        path = self.path('out.flac')
+        with AudioFileSink(path, subtype='PCM_24') as sink:
+            sink.write(tone_chunks(1)[0])
+        self.assertEqual(sf.info(path).subtype, 'PCM_24')
+
+    def test_invalid_configuration(self):
+        """Unsupported formats and subtypes are rejected up front."""
+        with self.assertRaises(ValueError):
+            AudioFileSink(self.path('out.flac'), subtype='VORBIS')
+        with self.assertRaises(ValueError):
+            AudioFileSink(self.path('out.wav'), format='XYZ')
+
+    def test_unknown_extension_writes_wav(self):
+        """Paths with no or an unknown extension fall back to WAV."""
+        self.assertEqual(format_for_path(self.path('out')), 'WAV')
+        self.assertEqual(format_for_path(self.path('out.tmp')), 'WAV')
+        path = self.path('out.tmp')
+        with AudioFileSink(path) as sink:
+            sink.write(tone_chunks(1)[0])
+        self.assertEqual(sf.info(path).format, 'WAV')
+
+    def test_no_chunks_no_file(self):
+        """A sink that receives nothing creates no file."""
+        path = self.path('out.flac')
+        AudioFileSink(path).close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_encoder_error_surfaces(self):
+        """Errors on the writer thread are raised by close()."""
+        sink = AudioFileSink(self.path('missing_dir/out.wav'))
+        sink.write(tone_chunks(1)[0])
+        with self.assertRaises(Exception):
+            sink.close()
+
+
+class TestGenerateAudioFormats(unittest.TestCase):
+    """Test cases for compressed output from generate_audio."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_flac_output(self):
+        """generate_audio encodes FLAC, with the configured subtype, for .flac paths."""
+        for subtype, expected in ((None, 'PCM_16'), ('PCM_24', 'PCM_24')):
+            out_path = os.path.join(self.tmp_dir.name, f"out_{expected}.flac")
+            tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                               output_subtype=subtype)
+            tts.initialize_model('stub')
+            self.assertTrue(tts.generate_audio("One sentence. Another sentence.", self.ref_path,
+                                               'en', out_path))
+            info = sf.info(out_path)
+            self.assertEqual((info.format, info.subtype), ('FLAC', expected))
+            self.assertGreater(info.frames, 0)
+
+    def test_extensionless_output_is_wav(self):
+        """text_to_speech still writes WAV to paths without an audio extension."""
+        tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0))
+        tts.initialize_model('stub')
+        for name in ('out', 'out.tmp'):
+            out_path = os.path.join(self.tmp_dir.name, name)
+            self.assertTrue(tts.text_to_speech("Hello there.", self.ref_path, 'en', out_path))
+            self.assertEqual(sf.info(out_path).format, 'WAV')
+
+
+if __name__ == '__main__':
+    unittest.main()
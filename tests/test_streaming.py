@@ -0,0 +1,133 @@
+"""
+Unit tests for streaming synthesis.
+"""
+import io
+import os
+import tempfile
+import unittest
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import soundfile as sf
+
+from tts.core import TextToSpeech
+from tts.text import split_sentences
+from tts.voice_cloning import VoiceCloning
+
+# Two sentences that together exceed the English character limit
+TWO_SEGMENTS = "One" + " more" * 45 + ". Two" + " more" * 45 + "!"
+
+
+class TestStreamAudio(unittest.TestCase):
+    """Test cases for TextToSpeech.stream_audio and the file path built on it."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        with wave.open(self.ref_path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b'\0' * 2 * 16000 * 3)
+
+        self.tts_patcher = patch('tts.core.TTS')
+        mock_tts_class = self.tts_patcher.start()
+        self.mock_model = MagicMock()
+        mock_tts_class.return_value = self.mock_model
+        self.mock_model.to.return_value = self.mock_model
+        self.mock_model.synthesizer.output_sample_rate = 24000
+        self.xtts = self.mock_model.synthesizer.tts_model
+        self.xtts.get_conditioning_latents.return_value = ('gpt', 'spk')
+
+        self.tts = TextToSpeech()
+        self.tts.initialize_model()
+
+    def tearDown(self):
+        self.tts_patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_stream_yields_xtts_chunks(self):
+        """XTTS stream chunks are yielded in order with sample rate metadata."""
+        self.xtts.inference_stream.return_value = iter([np.ones(100), np.ones(200) * 0.5])
+        chunks = list(self.tts.stream_audio("Hello there.", self.ref_path, "en"))
+
+        self.assertEqual([len(c.samples) for c in chunks], [100, 200])
+        self.assertEqual([c.index for c in chunks], [0, 1])
+        self.assertTrue(all(c.sample_rate == 24000 for c in chunks))
+        self.assertEqual(chunks[0].samples.dtype, np.float32)
+        _, kwargs = self.xtts.inference_stream.call_args
+        self.assertEqual(kwargs['stream_chunk_size'], 20)
+
+    def test_stream_reports_timing(self):
+        """Time to first chunk is recorded separately from total time."""
+        self.xtts.inference_stream.return_value = iter([np.zeros(2400), np.zeros(2400)])
+        for _ in self.tts.stream_audio("Hello.", self.ref_path, "en"):
+            pass
+        timing = self.tts.last_stream_timing
+        self.assertEqual(timing.chunks, 2)
+        self.assertAlmostEqual(timing.audio_seconds, 0.2)
+        self.assertLessEqual(timing.time_to_first_chunk, timing.total_time)
+
+    def test_generate_audio_writes_segment_chunks(self):
+        """The file path writes one inference result per character-limited segment."""
+        self.xtts.inference.side_effect = [{'wav': np.ones(240)}, {'wav': np.ones(480)}]
+        out_path = os.path.join(self.tmp_dir.name, 'out.wav')
+        self.assertTrue(self.tts.generate_audio(TWO_SEGMENTS, self.ref_path, "en", out_path))
+
+        audio, rate = sf.read(out_path)
+        self.assertEqual(rate, 24000)
+        self.assertEqual(len(audio), 720)
+        self.assertEqual(self.xtts.inference.call_count, 2)
+        self.xtts.inference_stream.assert_not_called()
+
+    def test_synthesize_returns_audio_in_memory(self):
+        """synthesize() returns the joined waveform without writing a file."""
+        self.xtts.inference.side_effect = [{'wav': np.ones(240)}, {'wav': np.zeros(480)}]
+        with patch('soundfile.SoundFile', side_effect=AssertionError("file I/O")):
+            result = self.tts.synthesize(TWO_SEGMENTS, self.ref_path, "en")
+
+        self.assertEqual(len(result.samples), 720)
+        self.assertEqual(result.sample_rate, 24000)
+        self.assertAlmostEqual(result.duration, 0.03)
+        self.assertEqual(result.metadata['chunks'], 2)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['ref.wav'])
+
+        audio, rate = sf.read(io.BytesIO(result.to_wav_bytes()))
+        self.assertEqual((len(audio), rate), (720, 24000))
+
+    def test_short_text_is_one_inference_call(self):
+        """Short text goes to XTTS whole, abbreviations included, in one call."""
+        self.xtts.inference.return_value = {'wav': np.ones(240)}
+        self.tts.synthesize("Hello Dr. Smith. How are you today? It is 5 p.m. now.", self.ref_path, "en")
+        self.assertEqual(self.xtts.inference.call_count, 1)
+        _, kwargs = self.xtts.inference.call_args
+        self.assertEqual(kwargs['text'], "Hello doctor Smith. How are you today? It is five p.m. now.")
+        self.assertTrue(kwargs['enable_text_splitting'])
+
+    def test_synthesize_file_sink(self):
+        """An output_path writes the in-memory result as an optional sink."""
+        self.xtts.inference.return_value = {'wav': np.ones(240)}
+        out_path = os.path.join(self.tmp_dir.name, 'out.flac')
+        self.tts.synthesize("One.", self.ref_path, "en", output_path=out_path)
+        self.assertEqual(sf.info(out_path).format, 'FLAC')
+
+    def test_stream_requires_model(self):
+        """Streaming without an initialized model raises RuntimeError."""
+        with self.assertRaises(RuntimeError):
+            next(TextToSpeech().stream_audio("Hi.", self.ref_path, "en"))
+
+    def test_clone_stream_rejects_invalid_reference(self):
+        """Reference audio is validated before any synthesis starts."""
+        vc = VoiceCloning()
+        with patch.object(vc, 'validate_voice_sample', return_value=False):
+            with self.assertRaises(ValueError):
+                next(vc.stream_clone_voice("Hi.", self.ref_path, "en"))
+
+    def test_split_sentences(self):
+        """Sentences split on terminal punctuation and drop blanks."""
+        self.assertEqual(split_sentences(" One.  Two?Three! "), ["One.", "Two?Three!"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Unit tests for text normalization and segmentation.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tts.benchmark import write_reference_wav
+from tts.core import TextToSpeech
+from tts.stub import StubModelFactory
+from tts.text import char_limit, chunk_text, normalize_for_speech
+
+
+class TestNormalization(unittest.TestCase):
+    """Test cases for normalize_for_speech."""
+
+    def test_whitespace_abbreviations_and_numbers(self):
+        """Whitespace collapses; abbreviations and English numbers are spelled out."""
+        text = "Dr.  Smith paid\n1,250 dollars, 12.5% more than Mr. Jones."
+        self.assertEqual(
+            normalize_for_speech(text, 'en'),
+            "doctor Smith paid one thousand two hundred fifty dollars, "
+            "twelve point five percent more than mister Jones."
+        )
+
+    def test_ambiguous_words_are_not_expanded(self):
+        """'no', 'St', 'Co' and 'Ms' stay as written; 'No.' becomes 'number' only before a digit."""
+        self.assertEqual(normalize_for_speech("I said no. Then we left.", 'en'), "I said no. Then we left.")
+        self.assertEqual(normalize_for_speech("Main St. It was cold.", 'en'), "Main St. It was cold.")
+        self.assertEqual(normalize_for_speech("Acme Co. and Ms. Lee", 'en'), "Acme Co. and Ms. Lee")
+        self.assertEqual(normalize_for_speech("Room No. 5 is free.", 'en'), "Room number five is free.")
+
+    def test_sentence_final_abbreviation_keeps_period(self):
+        """An abbreviation that ends a sentence keeps the boundary for segmentation."""
+        self.assertEqual(normalize_for_speech("Pens, ink, etc. Then we left.", 'en'),
+                         "Pens, ink, et cetera. Then we left.")
+        self.assertEqual(normalize_for_speech("Bob Smith Jr. arrived.", 'en'), "Bob Smith junior arrived.")
+        self.assertEqual(normalize_for_speech("We sold to Acme Inc.", 'en'), "We sold to Acme incorporated.")
+        self.assertEqual(chunk_text("Pens, ink, etc. Then we left.", 'en', max_chars=25),
+                         ["Pens, ink, et cetera.", "Then we left."])
+
+    def test_phone_numbers_times_and_dates_left_alone(self):
+        """Digits joined by '-', ':' or '/' are not spelled out piecewise."""
+        for text in ("Call 555-1234 now.", "Meet at 10:30 today.", "Due 5/1/2024 or 2024-05-01."):
+            self.assertEqual(normalize_for_speech(text, 'en'), text)
+
+    def test_numbers_left_for_other_languages(self):
+        """Digits are only expanded for English."""
+        self.assertEqual(normalize_for_speech(" Il a 42 ans. ", 'fr'), "Il a 42 ans.")
+
+    def test_memoized(self):
+        """Repeated strings are normalized once."""
+        normalize_for_speech.cache_clear()
+        normalize_for_speech("Repeat 1.", 'en')
+        normalize_for_speech("Repeat 1.", 'en')
+        self.assertEqual(normalize_for_speech.cache_info().hits, 1)
+
+
+class TestChunkText(unittest.TestCase):
+    """Test cases for chunk_text."""
+
+    def test_packs_short_sentences(self):
+        """Short sentences are packed together up to the budget."""
+        self.assertEqual(chunk_text("One. Two. Three. Four.", 'en', max_chars=10),
+                         ["One. Two.", "Three.", "Four."])
+
+    def test_splits_long_sentence_on_clauses_then_words(self):
+        """Overlong sentences break at clauses first, then at word boundaries."""
+        text = "alpha beta gamma, delta epsilon zeta eta theta iota kappa."
+        segments = chunk_text(text, 'en', max_chars=20)
+        self.assertEqual(segments[0], "alpha beta gamma,")
+        self.assertTrue(all(len(s) <= 20 for s in segments))
+        self.assertEqual(' '.join(segments), text)
+
+    def test_language_budget(self):
+        """Every segment respects the per-language limit."""
+        text = "这是一个很长的句子。" * 30
+        segments = chunk_text(text, 'zh-cn')
+        self.assertEqual(char_limit('zh-cn'), 82)
+        self.assertTrue(all(len(s) <= 82 for s in segments))
+        self.assertEqual(''.join(segments), text)
+
+    def test_blank_text(self):
+        """Whitespace-only text produces no segments."""
+        self.assertEqual(chunk_text("   \n "), [])
+
+
+class TestLongInputPipeline(unittest.TestCase):
+    """Test cases for segmentation inside text_to_speech."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ref_path = os.path.join(self.tmp_dir.name, 'ref.wav')
+        write_reference_wav(self.ref_path)
+        self.out_path = os.path.join(self.tmp_dir.name, 'out.wav')
+        self.tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0))
+        self.tts.initialize_model('stub')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_long_input_is_chunked(self):
+        """Text over the language limit is synthesized in budget-sized segments."""
+        text = "This sentence is about forty characters. " * 20
+        xtts = self.tts.model.synthesizer.tts_model
+        self.assertTrue(self.tts.text_to_speech(text, self.ref_path, 'en', self.out_path))
+        # 20 sentences of 41 chars pack six to a 250-char segment
+        self.assertEqual(xtts.calls['inference'], 4)
+
+    def test_short_input_is_passed_through(self):
+        """Text within the limit is generated unchanged with sentence splitting."""
+        with patch.object(self.tts, 'generate_audio', return_value=True) as mock_generate:
+            self.tts.text_to_speech("Short. Text.", self.ref_path, 'en', self.out_path)
+        mock_generate.assert_called_once_with(text="Short. Text.", speaker_wav=self.ref_path,
+                                              language='en', output_path=self.out_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ import os
 import tempfile
 import wave
 from tts.core import TextToSpeech
+from tts.stub import StubModelFactory
 
 class TestTTSInitialization(unittest.TestCase):
     """Test cases for TextToSpeech initialization logic."""
@@ -65,6 +66,44 @@ class TestTTSInitialization(unittest.TestCase):
                 mock_generate.assert_called_once()   # Verify generate_audio was called
                 self.assertTrue(result)              # Verify successful result
 
+class TestModelStartup(unittest.TestCase):
+    """Test cases for offline loading, warm-up and the load-time report."""
+
+    @patch('tts.core.TTS')
+    def test_offline_load_from_model_dir(self, mock_tts_class):
+        """A model_dir is loaded by path, bypassing the model manager."""
+        mock_model = MagicMock()
+        mock_tts_class.return_value = mock_model
+        mock_model.to.return_value = mock_model
+        with tempfile.TemporaryDirectory() as model_dir:
+            open(os.path.join(model_dir, 'config.json'), 'w').close()
+            tts = TextToSpeech(model_dir=model_dir)
+            self.assertTrue(tts.initialize_model())
+            mock_tts_class.assert_called_once_with(
+                model_path=model_dir, config_path=os.path.join(model_dir, 'config.json'),
+                progress_bar=False
+            )
+        self.assertEqual(tts.model_name, "tts_models/multilingual/multi-dataset/xtts_v2")
+        self.assertEqual(set(tts.load_report), {'import', 'load', 'to_device', 'total'})
+
+    @patch('tts.core.TTS')
+    def test_missing_checkpoint_config(self, mock_tts_class):
+        """A model_dir without config.json fails initialization."""
+        with tempfile.TemporaryDirectory() as model_dir:
+            self.assertFalse(TextToSpeech(model_dir=model_dir).initialize_model())
+        mock_tts_class.assert_not_called()
+
+    def test_warmup_runs_one_synthesis(self):
+        """warmup=True conditions and synthesizes once during initialization."""
+        tts = TextToSpeech(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                           warmup=True)
+        self.assertTrue(tts.initialize_model('stub'))
+        xtts = tts.model.synthesizer.tts_model
+        self.assertEqual(xtts.calls['inference'], 1)
+        self.assertIn('warmup', tts.load_report)
+        self.assertEqual(len(tts.latent_cache), 0)
+
+
 # Note: TestTextNormalization tests are removed as process_text is no longer needed with XTTS
 
 class TestWAVFileOutput(unittest.TestCase):
@@ -0,0 +1,123 @@
+"""
+Unit tests for persistent voice profiles.
+"""
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tts.benchmark import write_reference_wav
+from tts.stub import StubModelFactory
+from tts.voice_cloning import VoiceCloning
+from tts.voice_library import VoiceLibrary
+
+
+class TestVoiceLibrary(unittest.TestCase):
+    """Test cases for the on-disk library, independent of any model."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.library_dir = os.path.join(self.tmp_dir.name, 'voices')
+        self.sample = os.path.join(self.tmp_dir.name, 'a.wav')
+        write_reference_wav(self.sample)
+        self.latents = (np.ones((1, 32, 1024), dtype=np.float32), np.zeros((1, 512, 1), dtype=np.float32))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_add_list_load_remove(self):
+        """Voices persist across library instances and can be removed."""
+        library = VoiceLibrary(self.library_dir)
+        profile = library.add('alice', self.latents, [self.sample], 'stub', name="Alice")
+        self.assertEqual(profile.samples[0]['path'], os.path.abspath(self.sample))
+
+        reopened = VoiceLibrary(self.library_dir)
+        self.assertEqual([v.voice_id for v in reopened.list_voices()], ['alice'])
+        self.assertEqual(reopened.get('alice').name, "Alice")
+        gpt, spk = reopened.load_latents('alice')
+        np.testing.assert_array_equal(gpt, self.latents[0])
+
+        self.assertTrue(reopened.remove('alice'))
+        self.assertFalse(reopened.remove('alice'))
+        self.assertEqual(VoiceLibrary(self.library_dir).list_voices(), [])
+        self.assertEqual(os.listdir(self.library_dir), ['index.json'])
+
+    def test_index_is_versioned(self):
+        """The index records the file format version."""
+        VoiceLibrary(self.library_dir).add('bob', self.latents, [self.sample], 'stub')
+        with open(os.path.join(self.library_dir, 'index.json')) as f:
+            self.assertEqual(json.load(f)['format_version'], 1)
+
+    def test_rejects_unsafe_ids(self):
+        """Voice IDs that could escape the library directory are rejected."""
+        library = VoiceLibrary(self.library_dir)
+        for voice_id in ('../evil', '', 'a/b'):
+            with self.assertRaises(ValueError):
+                library.add(voice_id, self.latents, [self.sample], 'stub')
+
+    def test_missing_voice(self):
+        """Loading an unknown voice raises KeyError."""
+        with self.assertRaises(KeyError):
+            VoiceLibrary(self.library_dir).load_latents('nobody')
+
+
+class TestVoiceProfiles(unittest.TestCase):
+    """Test cases for creating and synthesizing with voice profiles."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.samples = []
+        for i in range(3):
+            path = os.path.join(self.tmp_dir.name, f'sample{i}.wav')
+            write_reference_wav(path, seconds=4.0 + i)
+            self.samples.append(path)
+        self.library = VoiceLibrary(os.path.join(self.tmp_dir.name, 'voices'))
+        self.out_path = os.path.join(self.tmp_dir.name, 'out.wav')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def new_cloner(self):
+        vc = VoiceCloning(model_factory=StubModelFactory(real_time_factor=0, conditioning_time=0),
+                          voice_library=self.library)
+        vc.initialize_model('stub')
+        return vc
+
+    def test_synthesize_by_voice_id_without_reconditioning(self):
+        """A saved voice is used by ID and never re-reads the reference samples."""
+        creator = self.new_cloner()
+        self.assertTrue(creator.create_voice('host', self.samples, name="Host"))
+        self.assertEqual(creator.model.synthesizer.tts_model.calls['conditioning'], 1)
+
+        vc = self.new_cloner()
+        self.assertTrue(vc.clone_voice("Hello there.", 'host', 'en', self.out_path))
+        result = vc.synthesize("Hello there.", 'host', 'en')
+        self.assertGreater(result.duration, 0)
+        self.assertEqual(vc.model.synthesizer.tts_model.calls['conditioning'], 0)
+
+    def test_invalid_sample_rejects_voice(self):
+        """A voice is not created if any sample fails validation."""
+        short = os.path.join(self.tmp_dir.name, 'short.wav')
+        write_reference_wav(short, seconds=1.0)
+        vc = self.new_cloner()
+        self.assertFalse(vc.create_voice('host', self.samples + [short]))
+        self.assertEqual(vc.list_voices(), [])
+
+    def test_list_and_remove_without_model(self):
+        """Listing and removing voices never loads the model."""
+        self.new_cloner().create_voice('host', self.samples[:1])
+        vc = VoiceCloning(voice_library=self.library)
+        self.assertEqual([v.voice_id for v in vc.list_voices()], ['host'])
+        self.assertTrue(vc.remove_voice('host'))
+        self.assertIsNone(vc.model)
+
+    def test_unknown_voice_id(self):
+        """An ID that is neither a file nor a library voice fails cleanly."""
+        vc = self.new_cloner()
+        self.assertFalse(vc.clone_voice("Hi.", 'nobody', 'en', self.out_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,11 @@ import unittest
 import os
 import tempfile
 from unittest.mock import patch
+import numpy as np
+import soundfile as sf
 from tts.core import validate_voice_sample
+from tts.validation import check_voice_sample, validate_voice_samples
+from tts.voice_cloning import VoiceCloning
 
 class TestVoiceSampleValidation(unittest.TestCase):
     def test_empty_file_detection(self):
@@ -31,5 +35,73 @@ class TestVoiceSampleValidation(unittest.TestCase):
         # This will be implemented once we have the collection function
         pass
 
+    def test_low_sample_rate_only_warns(self):
+        """Low-rate samples log a warning instead of failing on an undefined logger."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'low.wav')
+            sf.write(path, np.full(8000 * 2, 0.5), 8000, subtype='PCM_16')
+            with self.assertLogs('tts.core', level='WARNING'):
+                validate_voice_sample(path)
+
+
+class TestBoundedValidation(unittest.TestCase):
+    """Test cases for header-based, block-streamed and batch validation."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, seconds=4.0, rate=16000, amplitude=0.5):
+        path = os.path.join(self.tmp_dir.name, name)
+        sf.write(path, np.full(int(seconds * rate), amplitude), rate, subtype='PCM_16')
+        return path
+
+    def test_reasons(self):
+        """Each rejection carries a specific reason and header details."""
+        self.assertTrue(check_voice_sample(self.write('ok.wav')).valid)
+        short = check_voice_sample(self.write('short.wav', seconds=1))
+        self.assertIn('too short', short.reason)
+        self.assertAlmostEqual(short.duration, 1.0)
+        self.assertIn('too low', check_voice_sample(self.write('low.wav', rate=8000)).reason)
+        self.assertIn('silent', check_voice_sample(self.write('quiet.wav', amplitude=0.0)).reason)
+        self.assertIn('does not exist', check_voice_sample('/missing.wav').reason)
+
+    def test_does_not_load_whole_file(self):
+        """Validation reads the header and streams blocks instead of sf.read."""
+        path = self.write('ok.wav')
+        with patch('soundfile.read', side_effect=AssertionError("full read")):
+            self.assertTrue(VoiceCloning().validate_voice_sample(path))
+
+    def test_silence_check_stops_at_first_loud_block(self):
+        """Only blocks up to the first non-silent one are read."""
+        path = self.write('long.wav', seconds=60)
+        blocks_read = []
+        original_blocks = sf.blocks
+
+        def counting_blocks(*args, **kwargs):
+            for block in original_blocks(*args, **kwargs):
+                blocks_read.append(len(block))
+                yield block
+
+        with patch('tts.validation.sf.blocks', side_effect=counting_blocks):
+            result = check_voice_sample(path)
+        self.assertTrue(result.valid)
+        self.assertEqual(len(blocks_read), 1)
+
+    def test_batch_validation_of_directory(self):
+        """A directory is scanned recursively and validated in parallel."""
+        self.write('a.wav')
+        os.makedirs(os.path.join(self.tmp_dir.name, 'sub'))
+        self.write(os.path.join('sub', 'b.wav'), seconds=1)
+        with open(os.path.join(self.tmp_dir.name, 'notes.txt'), 'w') as f:
+            f.write('ignored')
+
+        results = validate_voice_samples(self.tmp_dir.name, workers=2)
+        self.assertEqual([os.path.basename(r.path) for r in results], ['a.wav', 'b.wav'])
+        self.assertEqual([r.valid for r in results], [True, False])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
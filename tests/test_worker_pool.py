@@ -0,0 +1,74 @@
+"""
+Unit tests for the multi-process synthesis worker pool.
+"""
+import os
+import unittest
+
+import numpy as np
+
+from tts.audio import SynthesisResult
+from tts.worker_pool import SynthesisWorkerPool, WorkerCrashedError
+
+
+class FakeEngine:
+    """Engine that returns a ramp whose length is the text length."""
+
+    def synthesize(self, text, speaker_wav, language):
+        if text == 'CRASH':
+            os._exit(3)
+        if text == 'ERROR':
+            raise ValueError("bad input")
+        return SynthesisResult(samples=np.arange(len(text), dtype=np.float32), sample_rate=8000)
+
+
+def make_fake_engine(model_name):
+    """Picklable engine factory used by the worker processes."""
+    return FakeEngine()
+
+
+def failing_engine(model_name):
+    """Engine factory that fails to load the model."""
+    raise RuntimeError("model missing")
+
+
+class TestSynthesisWorkerPool(unittest.TestCase):
+    """Test cases for dispatch, shared-memory results and crash recovery."""
+
+    def test_results_are_returned_in_memory(self):
+        """Requests are spread over workers and return the full waveform."""
+        with SynthesisWorkerPool(num_workers=2, engine_factory=make_fake_engine) as pool:
+            futures = [pool.submit('x' * n, 'ref.wav', 'en') for n in range(1, 7)]
+            results = [f.result(timeout=30) for f in futures]
+
+        for n, result in enumerate(results, start=1):
+            np.testing.assert_array_equal(result.samples, np.arange(n, dtype=np.float32))
+            self.assertEqual(result.sample_rate, 8000)
+        self.assertEqual(pool.completed, 6)
+
+    def test_worker_errors_fail_only_that_request(self):
+        """An exception in the engine is reported without killing the worker."""
+        with SynthesisWorkerPool(num_workers=1, engine_factory=make_fake_engine) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.synthesize('ERROR', 'ref.wav', 'en', timeout=30)
+            self.assertEqual(len(pool.synthesize('ok', 'ref.wav', 'en', timeout=30).samples), 2)
+            self.assertEqual(pool.restarts, 0)
+
+    def test_crashed_worker_is_respawned(self):
+        """A crash fails the in-flight request and a new worker takes over."""
+        with SynthesisWorkerPool(num_workers=1, engine_factory=make_fake_engine) as pool:
+            with self.assertRaises(WorkerCrashedError):
+                pool.synthesize('CRASH', 'ref.wav', 'en', timeout=30)
+            result = pool.synthesize('after', 'ref.wav', 'en', timeout=60)
+            self.assertEqual(len(result.samples), 5)
+            self.assertEqual(pool.stats()['restarts'], 1)
+            self.assertEqual(pool.stats()['workers_alive'], 1)
+
+    def test_initialization_failure_is_raised(self):
+        """start() surfaces a worker that cannot load its model."""
+        pool = SynthesisWorkerPool(num_workers=1, engine_factory=failing_engine)
+        with self.assertRaises(RuntimeError):
+            pool.start(timeout=60)
+
+
+if __name__ == '__main__':
+    unittest.main()
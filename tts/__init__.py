@@ -5,6 +5,29 @@ This module provides functionality to convert text to speech using Coqui XTTS v2
 
 from .core import TextToSpeech
 from .voice_cloning import VoiceCloning
+from .latent_cache import VoiceLatentCache
+from .audio import AudioChunk, StreamTiming, SynthesisResult
+from .episode import EpisodePipeline, EpisodeReport
+from .worker_pool import SynthesisWorkerPool, WorkerCrashedError
+from .async_executor import AsyncInferenceExecutor, QueueFullError
+from .output_cache import AudioOutputCache
+from .validation import ValidationResult, check_voice_sample, validate_voice_samples
+from .metrics import Metrics, MetricsRegistry, StageEvent
+from .profile import InferenceProfile
+from .voice_library import VoiceLibrary, VoiceProfile
+from .reference import PreprocessSettings, ReferencePreprocessor
+from .postprocess import PostProcessSettings, PostProcessor
+from .sinks import AudioFileSink
+from .model_registry import ModelRegistry
+from .singleflight import SingleFlight
+from .similarity import VoiceSimilarityScorer
 
-__all__ = ['TextToSpeech', 'VoiceCloning']
+__all__ = ['TextToSpeech', 'VoiceCloning', 'VoiceLatentCache', 'AudioChunk', 'StreamTiming',
+           'SynthesisResult', 'EpisodePipeline', 'EpisodeReport', 'SynthesisWorkerPool',
+           'WorkerCrashedError', 'AsyncInferenceExecutor', 'QueueFullError', 'AudioOutputCache',
+           'ValidationResult', 'check_voice_sample', 'validate_voice_samples', 'Metrics',
+           'MetricsRegistry', 'StageEvent', 'InferenceProfile', 'VoiceLibrary',
+           'VoiceProfile', 'PreprocessSettings', 'ReferencePreprocessor',
+           'PostProcessSettings', 'PostProcessor', 'AudioFileSink', 'ModelRegistry',
+           'SingleFlight', 'VoiceSimilarityScorer']
 __version__ = '0.1.0'
\ No newline at end of file
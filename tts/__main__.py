@@ -0,0 +1,31 @@
+"""
+Command-line entry point for AI Voice Assistant (python -m tts).
+
+Subcommands:
+    batch      Render a JSONL manifest of synthesis jobs (tts.batch)
+    serve      Run the local synthesis server (tts.server)
+    benchmark  Run the performance benchmarks (tts.benchmark)
+"""
+
+import importlib
+import sys
+from typing import List, Optional
+
+COMMANDS = {
+    'batch': 'tts.batch',
+    'serve': 'tts.server',
+    'benchmark': 'tts.benchmark',
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Dispatch to a subcommand's main(). Returns a process exit code."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"usage: python -m tts {{{','.join(COMMANDS)}}} ...", file=sys.stderr)
+        return 0 if argv and argv[0] in ('-h', '--help') else 2
+    return importlib.import_module(COMMANDS[argv[0]]).main(argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
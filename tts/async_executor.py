@@ -0,0 +1,114 @@
+"""
+Bounded executor for running blocking inference from asyncio code.
+
+Model inference blocks for seconds at a time, so async callers hand it to a
+worker thread. This module adds the controls an asyncio service needs:
+1. A fixed number of inference threads (concurrency limit)
+2. A bounded wait queue that fails fast with QueueFullError when full
+3. Timeouts and cancellation that signal the running job to stop
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a request is rejected because the inference queue is full."""
+
+
+class InferenceCancelled(Exception):
+    """Raised inside a job when its caller cancelled or timed out."""
+
+
+class AsyncInferenceExecutor:
+    """
+    Runs blocking jobs on a fixed thread pool with a bounded queue.
+
+    Each job receives a threading.Event that is set when the awaiting caller
+    is cancelled or times out. Long-running jobs should check it between
+    units of work (e.g. audio chunks) and stop early. The slot a job holds
+    is only released when its thread actually finishes, so the queue limit
+    reflects real load rather than abandoned awaits.
+
+    Attributes:
+        max_concurrency: Number of jobs allowed to run at once.
+        max_queue: Number of jobs allowed to wait for a free thread.
+    """
+
+    def __init__(self, max_concurrency: int = 1, max_queue: int = 8):
+        """
+        Initialize the executor.
+
+        Args:
+            max_concurrency (int): Number of inference threads.
+            max_queue (int): Jobs allowed to wait beyond the running ones.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.logger = logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='tts-inference')
+        self._outstanding = 0
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding(self) -> int:
+        """Number of jobs running or waiting for a thread."""
+        with self._lock:
+            return self._outstanding
+
+    async def run(self, job: Callable[[threading.Event], T], timeout: Optional[float] = None) -> T:
+        """
+        Run a blocking job on the inference pool and await its result.
+
+        Args:
+            job (Callable): Called on a worker thread with a cancellation event.
+            timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+            The job's return value.
+
+        Raises:
+            QueueFullError: If the concurrency limit and queue are exhausted.
+            asyncio.TimeoutError: If the job does not finish within timeout.
+            asyncio.CancelledError: If the awaiting task is cancelled.
+        """
+        with self._lock:
+            if self._outstanding >= self.max_concurrency + self.max_queue:
+                raise QueueFullError(
+                    f"Inference queue full ({self._outstanding} requests outstanding)"
+                )
+            self._outstanding += 1
+
+        cancel_event = threading.Event()
+
+        def release(_future) -> None:
+            with self._lock:
+                self._outstanding -= 1
+
+        try:
+            future = self._pool.submit(job, cancel_event)
+        except BaseException:
+            release(None)
+            raise
+        future.add_done_callback(release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Drop the job if it has not started; otherwise ask it to stop
+            future.cancel()
+            cancel_event.set()
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and release the worker threads."""
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,102 @@
+"""
+Audio data containers for AI Voice Assistant.
+
+These lightweight types describe audio produced by the synthesis pipeline
+so callers can play, send or post-process it without touching the disk.
+"""
+
+import io
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+import soundfile as sf
+
+
+@dataclass
+class AudioChunk:
+    """
+    A block of mono PCM audio produced during streaming synthesis.
+
+    Attributes:
+        samples: Float32 waveform in the range [-1.0, 1.0].
+        sample_rate: Sample rate of the waveform in Hz.
+        index: Position of the chunk within its stream, starting at 0.
+    """
+    samples: np.ndarray
+    sample_rate: int
+    index: int
+
+    @property
+    def duration(self) -> float:
+        """Duration of the chunk in seconds."""
+        return len(self.samples) / float(self.sample_rate)
+
+
+@dataclass
+class StreamTiming:
+    """
+    Latency figures for a single streaming synthesis call.
+
+    Attributes:
+        time_to_first_chunk: Seconds from the request until the first chunk
+            was ready, or None if no audio was produced.
+        total_time: Seconds from the request until the stream was exhausted.
+        audio_seconds: Total duration of the audio produced.
+        chunks: Number of chunks yielded.
+    """
+    time_to_first_chunk: Optional[float] = None
+    total_time: float = 0.0
+    audio_seconds: float = 0.0
+    chunks: int = 0
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Processing time divided by audio duration (lower is faster)."""
+        if self.audio_seconds <= 0:
+            return None
+        return self.total_time / self.audio_seconds
+
+
+@dataclass
+class SynthesisResult:
+    """
+    A complete synthesized utterance held in memory.
+
+    Attributes:
+        samples: Float32 mono waveform in the range [-1.0, 1.0].
+        sample_rate: Sample rate of the waveform in Hz.
+        metadata: Free-form details about how the audio was produced.
+    """
+    samples: np.ndarray
+    sample_rate: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the utterance in seconds."""
+        return len(self.samples) / float(self.sample_rate)
+
+    def to_wav_bytes(self, subtype: str = 'PCM_16') -> bytes:
+        """
+        Encode the utterance as an in-memory WAV file.
+
+        Args:
+            subtype (str): soundfile subtype, e.g. 'PCM_16' or 'FLOAT'.
+
+        Returns:
+            bytes: A complete WAV file.
+        """
+        buffer = io.BytesIO()
+        sf.write(buffer, self.samples, self.sample_rate, format='WAV', subtype=subtype)
+        return buffer.getvalue()
+
+    def write(self, output_path: str, subtype: Optional[str] = None) -> None:
+        """
+        Write the utterance to an audio file; the format follows the extension.
+
+        Args:
+            output_path (str): Destination path.
+            subtype (Optional[str]): soundfile subtype, or None for the format default.
+        """
+        sf.write(output_path, self.samples, self.sample_rate, subtype=subtype)
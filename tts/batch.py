@@ -0,0 +1,452 @@
+"""
+Manifest-driven batch synthesis for AI Voice Assistant.
+
+Nightly renders run hundreds of segments, which the interactive demos in
+examples/ are not built for. This module renders a JSONL manifest instead
+(python -m tts batch manifest.jsonl):
+1. Each manifest row names the text, voice, language and output file
+2. Rows are rendered on a configurable number of worker threads sharing
+   one warm model, with a progress line as items finish
+3. Per-item status is recorded in a local SQLite job store, so a crashed
+   or killed run resumes without re-rendering completed items
+4. A summary of throughput, audio produced and failures is printed (and
+   optionally written as JSON)
+
+Manifest rows look like:
+
+    {"id": "ep12-intro", "text": "Welcome back.", "voice": "host", "language": "en", "output": "out/ep12-intro.wav"}
+
+'voice' is a reference WAV or a voice library ID; 'id' defaults to the
+output path and 'language' to 'en'. Relative paths are resolved against
+the manifest's directory.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import soundfile as sf
+
+from .core import DEFAULT_MODEL_NAME, TextToSpeech
+from .hashing import file_digest
+
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+@dataclass
+class BatchItem:
+    """
+    One manifest row to render.
+
+    Attributes:
+        item_id: Unique ID of the row, used to track it across runs.
+        text: Text to synthesize.
+        voice: Reference WAV path or voice library ID.
+        language: Language code (e.g., 'en').
+        output: Path of the audio file to write.
+    """
+    item_id: str
+    text: str
+    voice: str
+    language: str
+    output: str
+
+
+@dataclass
+class BatchSummary:
+    """
+    Outcome of a batch run.
+
+    Attributes:
+        total: Items in the manifest.
+        skipped: Items already completed by an earlier run.
+        succeeded: Items rendered by this run.
+        failed: Items that failed in this run.
+        wall_seconds: Wall-clock seconds spent rendering.
+        audio_seconds: Duration of the audio rendered by this run.
+        failures: (item ID, error) of each failed item.
+    """
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_seconds: float = 0.0
+    audio_seconds: float = 0.0
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def items_per_minute(self) -> float:
+        """Rendered items (succeeded or failed) per minute of wall time."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return (self.succeeded + self.failed) * 60.0 / self.wall_seconds
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Wall time divided by audio produced (lower is faster)."""
+        if self.audio_seconds <= 0:
+            return None
+        return self.wall_seconds / self.audio_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary, including derived rates, as a JSON-ready dict."""
+        summary = asdict(self)
+        summary['failures'] = [{'id': item_id, 'error': error} for item_id, error in self.failures]
+        summary['items_per_minute'] = self.items_per_minute
+        summary['real_time_factor'] = self.real_time_factor
+        return summary
+
+
+def read_manifest(path: str) -> List[BatchItem]:
+    """
+    Read a JSONL manifest.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path (str): Path to the manifest.
+
+    Returns:
+        List[BatchItem]: Items in manifest order.
+
+    Raises:
+        ValueError: If a row is malformed, lacks a required field, or
+            repeats an ID.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    items: List[BatchItem] = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e.msg})")
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object")
+            for key in ('text', 'voice', 'output'):
+                if not isinstance(row.get(key), str) or not row[key].strip():
+                    raise ValueError(f"{path}:{line_number}: '{key}' must be a non-empty string")
+            voice = row['voice']
+            voice_path = os.path.join(base_dir, voice)
+            if not os.path.isabs(voice) and os.path.exists(voice_path):
+                voice = voice_path
+            output = os.path.join(base_dir, row['output'])
+            item_id = str(row.get('id') or row['output'])
+            if item_id in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate id '{item_id}'")
+            seen.add(item_id)
+            items.append(BatchItem(item_id=item_id, text=row['text'], voice=voice,
+                                   language=row.get('language') or 'en', output=output))
+    return items
+
+
+class JobStore:
+    """
+    SQLite record of per-item status, shared by the worker threads.
+
+    An item counts as completed only while its fingerprint matches and its
+    output file still exists; anything else (failed, never attempted, or left
+    'running' by a killed run) is rendered again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the job store.
+
+        Args:
+            path (str): SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS items ('
+                ' item_id TEXT PRIMARY KEY,'
+                ' fingerprint TEXT NOT NULL,'
+                ' status TEXT NOT NULL,'
+                ' attempts INTEGER NOT NULL DEFAULT 0,'
+                ' error TEXT,'
+                ' seconds REAL,'
+                ' audio_seconds REAL,'
+                ' updated_at REAL NOT NULL)'
+            )
+
+    def is_completed(self, item: BatchItem, fingerprint: str) -> bool:
+        """Return True if item was rendered by an earlier run with the same fingerprint."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT fingerprint, status FROM items WHERE item_id = ?', (item.item_id,)
+            ).fetchone()
+        return row == (fingerprint, DONE) and os.path.exists(item.output)
+
+    def mark_running(self, item: BatchItem, fingerprint: str) -> None:
+        """Record that item is being rendered with the given fingerprint."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO items (item_id, fingerprint, status, attempts, updated_at)'
+                ' VALUES (?, ?, ?, 1, ?)'
+                ' ON CONFLICT(item_id) DO UPDATE SET fingerprint = excluded.fingerprint,'
+                ' status = excluded.status, attempts = attempts + 1, error = NULL,'
+                ' updated_at = excluded.updated_at',
+                (item.item_id, fingerprint, RUNNING, time.time())
+            )
+
+    def mark_done(self, item: BatchItem, seconds: float, audio_seconds: float) -> None:
+        """Record a successful render."""
+        self._finish(item, DONE, None, seconds, audio_seconds)
+
+    def mark_failed(self, item: BatchItem, error: str, seconds: float) -> None:
+        """Record a failed render; it is retried by the next run."""
+        self._finish(item, FAILED, error, seconds, None)
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of recorded items per status."""
+        with self._lock:
+            rows = self._conn.execute('SELECT status, COUNT(*) FROM items GROUP BY status').fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _finish(self, item: BatchItem, status: str, error: Optional[str],
+                seconds: float, audio_seconds: Optional[float]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE items SET status = ?, error = ?, seconds = ?, audio_seconds = ?,'
+                ' updated_at = ? WHERE item_id = ?',
+                (status, error, seconds, audio_seconds, time.time(), item.item_id)
+            )
+
+
+class BatchRunner:
+    """
+    Renders manifest items on a thread pool, recording status in a JobStore.
+
+    Workers share one TextToSpeech instance, as in EpisodePipeline; PyTorch
+    releases the GIL during inference, so items overlap on multi-core hosts.
+
+    Attributes:
+        engine: TextToSpeech (or VoiceCloning) instance used for synthesis.
+        store: Job store recording per-item status.
+        workers: Number of items rendered concurrently.
+        model_name: Model loaded if the engine is not yet initialized.
+        progress: Called as progress(finished, to_render, item, status)
+            after each item.
+    """
+
+    def __init__(self, engine: TextToSpeech, store: JobStore, workers: int = 1,
+                 model_name: str = DEFAULT_MODEL_NAME,
+                 progress: Optional[Callable[[int, int, BatchItem, str], None]] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            engine (TextToSpeech): Synthesis engine; initialized on first use.
+            store (JobStore): Where item status is recorded.
+            workers (int): Number of concurrent rendering workers.
+            model_name (str): Model to load, only once there is work to do.
+            progress (Optional[Callable]): Progress callback.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.store = store
+        self.workers = workers
+        self.model_name = model_name
+        self.progress = progress
+
+    def run(self, items: List[BatchItem]) -> BatchSummary:
+        """
+        Render every item not completed by an earlier run.
+
+        Args:
+            items (List[BatchItem]): Items to render, e.g. from read_manifest().
+
+        Returns:
+            BatchSummary: Counts, throughput and failures of this run.
+        """
+        summary = BatchSummary(total=len(items))
+        fingerprints = {}
+        for item in items:
+            try:
+                fingerprints[item.item_id] = self.fingerprint(item)
+            except OSError:
+                # Unreadable reference: render it, so the failure is reported
+                fingerprints[item.item_id] = ''
+        todo = [item for item in items if not self.store.is_completed(item, fingerprints[item.item_id])]
+        summary.skipped = len(items) - len(todo)
+        if summary.skipped:
+            self.logger.info(f"Skipping {summary.skipped} items completed by an earlier run")
+        if not todo:
+            return summary
+
+        start = time.perf_counter()
+        if not self.engine.model and not self.engine.initialize_model(self.model_name):
+            for item in todo:
+                summary.failed += 1
+                summary.failures.append((item.item_id, "Failed to initialize TTS model"))
+            summary.wall_seconds = time.perf_counter() - start
+            return summary
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tts-batch-item') as pool:
+            futures = [pool.submit(self._render, item, fingerprints[item.item_id]) for item in todo]
+            for finished, future in enumerate(as_completed(futures), start=1):
+                item, error, audio_seconds = future.result()
+                if error is None:
+                    summary.succeeded += 1
+                    summary.audio_seconds += audio_seconds
+                else:
+                    summary.failed += 1
+                    summary.failures.append((item.item_id, error))
+                if self.progress is not None:
+                    self.progress(finished, len(todo), item, DONE if error is None else FAILED)
+        summary.wall_seconds = time.perf_counter() - start
+        return summary
+
+    def fingerprint(self, item: BatchItem) -> str:
+        """
+        Digest of everything that determines an item's output.
+
+        Covers the row itself, the reference audio's contents (or the stored
+        digest of a library voice), the model and the engine's render
+        settings, so edited rows, re-recorded references and model or
+        profile changes are all re-rendered.
+
+        Raises:
+            OSError: If the reference file cannot be read.
+        """
+        voice_id = self.engine._library_voice(item.voice)
+        if voice_id is not None:
+            voice = f"voice:{voice_id}:{self.engine.voice_library.get(voice_id).digest}"
+        else:
+            voice = file_digest(item.voice)
+        payload = json.dumps({
+            'text': item.text,
+            'voice': voice,
+            'language': item.language,
+            'output': item.output,
+            'model': self.engine.model_name or self.model_name,
+            'params': self.engine._render_params(item.output),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _render(self, item: BatchItem, fingerprint: str) -> Tuple[BatchItem, Optional[str], float]:
+        """Render one item, returning it, its error (None on success) and audio seconds."""
+        self.store.mark_running(item, fingerprint)
+        start = time.perf_counter()
+        error = None
+        audio_seconds = 0.0
+        try:
+            output_dir = os.path.dirname(item.output)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            if self.engine.text_to_speech(item.text, item.voice, item.language, item.output):
+                audio_seconds = sf.info(item.output).duration
+            else:
+                error = "Synthesis failed (see log for details)"
+        except Exception as e:
+            error = str(e)
+        seconds = time.perf_counter() - start
+        if error is None:
+            self.store.mark_done(item, seconds, audio_seconds)
+        else:
+            self.logger.error(f"Item '{item.item_id}' failed: {error}")
+            self.store.mark_failed(item, error, seconds)
+        return item, error, audio_seconds
+
+
+def print_progress(stream=sys.stderr) -> Callable[[int, int, BatchItem, str], None]:
+    """Return a progress callback that redraws one line on a terminal, or prints one per item."""
+    start = time.perf_counter()
+    interactive = stream.isatty()
+
+    def report(finished: int, total: int, item: BatchItem, status: str) -> None:
+        elapsed = time.perf_counter() - start
+        eta = elapsed / finished * (total - finished)
+        line = f"[{finished}/{total}] {status:<6} {item.item_id}  elapsed {elapsed:.0f}s  eta {eta:.0f}s"
+        if interactive:
+            stream.write(f"\r\033[K{line}" + ('\n' if finished == total else ''))
+        else:
+            stream.write(line + '\n')
+        stream.flush()
+
+    return report
+
+
+def format_summary(summary: BatchSummary) -> str:
+    """Render a summary as human-readable lines."""
+    lines = [
+        f"Items: {summary.total} total, {summary.succeeded} rendered, "
+        f"{summary.skipped} already done, {summary.failed} failed",
+        f"Time: {summary.wall_seconds:.1f}s for {summary.audio_seconds:.1f}s of audio "
+        f"({summary.items_per_minute:.1f} items/min"
+        + (f", RTF {summary.real_time_factor:.2f})" if summary.real_time_factor is not None else ")"),
+    ]
+    for item_id, error in summary.failures:
+        lines.append(f"  FAILED {item_id}: {error}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point. Returns 0 if every item is rendered, 1 if any failed."""
+    parser = argparse.ArgumentParser(prog='python -m tts batch',
+                                     description="Render a JSONL manifest of synthesis jobs, resumably.")
+    parser.add_argument('manifest', help="JSONL file with text, voice, language and output per line")
+    parser.add_argument('--jobs-db', help="SQLite job store (default: <manifest>.jobs.sqlite)")
+    parser.add_argument('--workers', type=int, default=1, help="Items rendered concurrently")
+    parser.add_argument('--backend', choices=['xtts', 'stub'], default='xtts',
+                        help="Coqui XTTS (default) or the synthetic stub model for local testing")
+    parser.add_argument('--model-name', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--model-dir', help="Load XTTS offline from this local checkpoint directory")
+    parser.add_argument('--profile', help="Inference profile, e.g. cpu or cpu_int8")
+    parser.add_argument('--voice-library', help="Voice library directory for voice IDs in the manifest")
+    parser.add_argument('--summary-json', help="Also write the summary to this JSON file")
+    parser.add_argument('--no-progress', action='store_true', help="Do not print per-item progress")
+    parser.add_argument('--stub-rtf', type=float, default=0.1,
+                        help="Simulated real-time factor of the stub model")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        items = read_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read manifest: {e}", file=sys.stderr)
+        return 2
+
+    from .server import build_engine
+    engine = build_engine(args.backend, args.voice_library, metrics=False, profile=args.profile,
+                          stub_rtf=args.stub_rtf, model_dir=args.model_dir)
+    store = JobStore(args.jobs_db or f"{args.manifest}.jobs.sqlite")
+    try:
+        runner = BatchRunner(engine, store, workers=args.workers, model_name=args.model_name,
+                             progress=None if args.no_progress else print_progress())
+        summary = runner.run(items)
+    finally:
+        store.close()
+
+    print(format_summary(summary))
+    if args.summary_json:
+        with open(args.summary_json, 'w') as f:
+            json.dump(summary.to_dict(), f, indent=2, sort_keys=True)
+            f.write('\n')
+    return 0 if summary.failed == 0 else 1
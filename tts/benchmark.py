@@ -0,0 +1,411 @@
+"""
+Reproducible performance benchmarks for AI Voice Assistant.
+
+Runs on a CPU-only box with no network by default, using the deterministic
+stub backend; the real XTTS model is used only when requested and already
+cached locally. Measures:
+1. Model initialization time by phase, and cold start to first audio with
+   and without a warm-up pass
+2. Time to first audio (cold and warm speaker latents)
+3. Real-time factor of full synthesis
+4. Throughput and latency under concurrency
+5. Voice sample validation throughput
+6. Real-time factor per inference profile (threads, int8, bf16)
+7. Voice similarity scoring cost relative to synthesis time
+8. Peak resident memory
+
+Results are emitted as JSON with sorted keys so runs can be diffed between
+releases:
+
+    python -m tts.benchmark --output bench.json
+    python -m tts.benchmark --backend xtts --only init,rtf
+    python -m tts.benchmark --backend xtts --model-dir /models/xtts_v2 --only init
+    python -m tts.benchmark --backend xtts --only profiles --profiles default,cpu_int8
+    python -m tts.benchmark --backend xtts --only similarity
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from . import __version__
+from .core import DEFAULT_MODEL_NAME, TextToSpeech
+from .profile import PROFILES
+from .similarity import VoiceSimilarityScorer
+from .stub import STUB_MODEL_NAME, StubModelFactory
+from .validation import validate_voice_samples
+
+DEFAULT_TEXT = (
+    "Welcome back to the show. Today we are talking about how small, local models "
+    "can produce natural sounding speech. We will look at latency, quality and cost, "
+    "and finish with a few listener questions."
+)
+DEFAULT_SENTENCE = "Thanks for listening, and see you next week."
+
+
+@dataclass
+class BenchmarkConfig:
+    """
+    Settings for a benchmark run.
+
+    Attributes:
+        backend: 'stub' for the synthetic model or 'xtts' for the real one.
+        model_name: Model to load for the xtts backend.
+        model_dir: Local checkpoint directory for the xtts backend, loaded
+            offline instead of through the Coqui model manager.
+        stub_real_time_factor: Simulated compute per second of stub audio.
+        stub_conditioning_time: Simulated seconds per stub conditioning call.
+        iterations: Repetitions for latency and real-time-factor measurements.
+        concurrency_levels: Thread counts for the throughput benchmark.
+        requests_per_level: Requests issued at each concurrency level.
+        validation_files: Number of synthetic samples for the validation benchmark.
+        text: Paragraph synthesized by the latency and RTF benchmarks.
+        profiles: Inference profiles compared by the profiles benchmark.
+        only: Names of benchmarks to run, or empty for all.
+    """
+    backend: str = 'stub'
+    model_name: str = DEFAULT_MODEL_NAME
+    model_dir: Optional[str] = None
+    stub_real_time_factor: float = 0.1
+    stub_conditioning_time: float = 0.05
+    iterations: int = 3
+    concurrency_levels: List[int] = field(default_factory=lambda: [1, 2, 4])
+    requests_per_level: int = 8
+    validation_files: int = 20
+    text: str = DEFAULT_TEXT
+    profiles: List[str] = field(default_factory=lambda: ['default', 'cpu', 'cpu_int8', 'cpu_bf16'])
+    only: List[str] = field(default_factory=list)
+
+
+class BenchmarkContext:
+    """Shared state for one benchmark run: config, engine and scratch files."""
+
+    def __init__(self, config: BenchmarkConfig, work_dir: str):
+        self.config = config
+        self.work_dir = work_dir
+        self.reference_wav = os.path.join(work_dir, 'reference.wav')
+        write_reference_wav(self.reference_wav)
+        self.tts: Optional[TextToSpeech] = None
+
+    def new_engine(self, profile: Optional[str] = None, warmup: bool = False) -> TextToSpeech:
+        """Create an engine for the configured backend (model not yet loaded)."""
+        if self.config.backend == 'stub':
+            return TextToSpeech(model_factory=StubModelFactory(
+                real_time_factor=self.config.stub_real_time_factor,
+                conditioning_time=self.config.stub_conditioning_time
+            ), profile=profile, warmup=warmup)
+        return TextToSpeech(profile=profile, model_dir=self.config.model_dir, warmup=warmup)
+
+    @property
+    def model_name(self) -> str:
+        return STUB_MODEL_NAME if self.config.backend == 'stub' else self.config.model_name
+
+    def engine(self) -> TextToSpeech:
+        """Return the shared, initialized engine."""
+        if self.tts is None:
+            self.tts = self.new_engine()
+            if not self.tts.initialize_model(self.model_name):
+                raise RuntimeError(f"Failed to initialize model for backend '{self.config.backend}'")
+        return self.tts
+
+
+def write_reference_wav(path: str, seconds: float = 6.0, sample_rate: int = 22050) -> None:
+    """Write a deterministic speech-like reference sample."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    audio = 0.3 * np.sin(2 * np.pi * 140 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    audio += 0.02 * rng.standard_normal(len(t))
+    sf.write(path, audio.astype(np.float32), sample_rate, subtype='PCM_16')
+
+
+def model_is_cached(model_name: str) -> bool:
+    """Return True if the Coqui model is already downloaded (no network needed)."""
+    try:
+        from trainer.io import get_user_data_dir
+    except ImportError:
+        # Coqui TTS releases before the trainer package provided it
+        from TTS.utils.generic_utils import get_user_data_dir
+    return os.path.isdir(os.path.join(str(get_user_data_dir('tts')), model_name.replace('/', '--')))
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB elsewhere
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Return mean, p50, p99, min and max of a list of measurements."""
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        'mean': float(array.mean()),
+        'p50': float(np.percentile(array, 50)),
+        'p99': float(np.percentile(array, 99)),
+        'min': float(array.min()),
+        'max': float(array.max()),
+    }
+
+
+def _cold_start(ctx: BenchmarkContext, warmup: bool) -> Dict[str, Any]:
+    """Initialize a fresh engine and time it through to the first streamed chunk."""
+    engine = ctx.new_engine(warmup=warmup)
+    start = time.perf_counter()
+    ok = engine.initialize_model(ctx.model_name)
+    result = {'seconds': time.perf_counter() - start, 'success': ok, 'phases': engine.load_report,
+              'first_audio_seconds': None}
+    if ok:
+        stream = engine.stream_audio(DEFAULT_SENTENCE, ctx.reference_wav, 'en')
+        first_start = time.perf_counter()
+        next(stream)
+        result['first_audio_seconds'] = time.perf_counter() - first_start
+        result['cold_start_seconds'] = time.perf_counter() - start
+        stream.close()
+    return result
+
+
+def bench_init(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Time model initialization by phase, then the first request, with and without warm-up."""
+    result = _cold_start(ctx, warmup=False)
+    result['warmup'] = _cold_start(ctx, warmup=True)
+    return result
+
+
+def bench_time_to_first_audio(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Measure time to first streamed chunk with cold and warm speaker latents."""
+    tts = ctx.engine()
+    tts.latent_cache.clear()
+    cold = None
+    warm = []
+    for i in range(ctx.config.iterations + 1):
+        stream = tts.stream_audio(ctx.config.text, ctx.reference_wav, 'en')
+        start = time.perf_counter()
+        next(stream)
+        elapsed = time.perf_counter() - start
+        stream.close()
+        if i == 0:
+            cold = elapsed
+        else:
+            warm.append(elapsed)
+    return {'cold_seconds': cold, 'warm_seconds': summarize(warm)}
+
+
+def bench_real_time_factor(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Measure full-synthesis real-time factor (processing time / audio duration)."""
+    tts = ctx.engine()
+    tts.synthesize(DEFAULT_SENTENCE, ctx.reference_wav, 'en')  # warm the latent cache
+    factors = []
+    audio_seconds = 0.0
+    for _ in range(ctx.config.iterations):
+        result = tts.synthesize(ctx.config.text, ctx.reference_wav, 'en')
+        factors.append(result.metadata['synthesis_time'] / result.duration)
+        audio_seconds = result.duration
+    return {'rtf': summarize(factors), 'audio_seconds': audio_seconds}
+
+
+def request_text(index: int) -> str:
+    """Distinct text per request, so concurrent requests are not coalesced."""
+    return f"{DEFAULT_SENTENCE} This is request {index}."
+
+
+def bench_concurrency(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Measure throughput and latency with several concurrent callers."""
+    tts = ctx.engine()
+    tts.synthesize(DEFAULT_SENTENCE, ctx.reference_wav, 'en')
+    levels = {}
+    for level in ctx.config.concurrency_levels:
+        def one_request(index):
+            start = time.perf_counter()
+            result = tts.synthesize(request_text(index), ctx.reference_wav, 'en')
+            return time.perf_counter() - start, result.duration
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            outcomes = list(pool.map(one_request, range(ctx.config.requests_per_level)))
+        wall = time.perf_counter() - start
+        levels[str(level)] = {
+            'requests_per_second': len(outcomes) / wall,
+            'audio_seconds_per_second': sum(d for _, d in outcomes) / wall,
+            'latency_seconds': summarize([latency for latency, _ in outcomes]),
+        }
+    return {'levels': levels, 'requests_per_level': ctx.config.requests_per_level}
+
+
+def bench_validation(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Measure voice sample validation throughput over a synthetic library."""
+    library = os.path.join(ctx.work_dir, 'library')
+    os.makedirs(library, exist_ok=True)
+    for i in range(ctx.config.validation_files):
+        write_reference_wav(os.path.join(library, f'sample_{i:04d}.wav'), seconds=10.0)
+    start = time.perf_counter()
+    results = validate_voice_samples(library)
+    elapsed = time.perf_counter() - start
+    return {
+        'files': len(results),
+        'valid': sum(1 for r in results if r.valid),
+        'files_per_second': len(results) / elapsed if elapsed > 0 else None,
+    }
+
+
+def bench_profiles(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Compare real-time factor across inference profiles, each on a fresh engine."""
+    profiles = {}
+    for name in ctx.config.profiles:
+        tts = ctx.new_engine(profile=name)
+        if not tts.initialize_model(ctx.model_name):
+            profiles[name] = {'error': "model initialization failed"}
+            continue
+        tts.synthesize(DEFAULT_SENTENCE, ctx.reference_wav, 'en')
+        factors = []
+        for _ in range(ctx.config.iterations):
+            result = tts.synthesize(ctx.config.text, ctx.reference_wav, 'en')
+            factors.append(result.metadata['synthesis_time'] / result.duration)
+        profiles[name] = {'rtf': summarize(factors), 'applied': tts.profile_report}
+    return {'profiles': profiles}
+
+
+def bench_similarity(ctx: BenchmarkContext) -> Dict[str, Any]:
+    """Measure scoring a batch of segments against their reference, relative to synthesizing them."""
+    tts = ctx.engine()
+    segments = [tts.synthesize(request_text(i), ctx.reference_wav, 'en')
+                for i in range(ctx.config.requests_per_level)]
+    synthesis_seconds = sum(result.metadata['synthesis_time'] for result in segments)
+    scorer = VoiceSimilarityScorer(tts)
+    start = time.perf_counter()
+    scores = scorer.score(segments, ctx.reference_wav)
+    scoring_seconds = time.perf_counter() - start
+    return {
+        'segments': len(segments),
+        'scoring_seconds': scoring_seconds,
+        'seconds_per_segment': scoring_seconds / len(segments),
+        'overhead_vs_synthesis': scoring_seconds / synthesis_seconds if synthesis_seconds > 0 else None,
+        'similarity': summarize(scores.tolist()),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Dict[str, Any]]] = {
+    'init': bench_init,
+    'time_to_first_audio': bench_time_to_first_audio,
+    'rtf': bench_real_time_factor,
+    'concurrency': bench_concurrency,
+    'validation': bench_validation,
+    'profiles': bench_profiles,
+    'similarity': bench_similarity,
+}
+
+
+def _round_floats(value: Any, digits: int = 6) -> Any:
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {k: _round_floats(v, digits) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(v, digits) for v in value]
+    return value
+
+
+def run_benchmarks(config: BenchmarkConfig) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks and collect their results.
+
+    Args:
+        config (BenchmarkConfig): Benchmark settings.
+
+    Returns:
+        Dict[str, Any]: Environment details, the config and per-benchmark results.
+            A benchmark that raises is recorded as {'error': message}.
+    """
+    unknown = [name for name in config.only if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    selected = config.only or list(BENCHMARKS)
+
+    work_dir = tempfile.mkdtemp(prefix='tts-bench-')
+    results: Dict[str, Any] = {}
+    try:
+        ctx = BenchmarkContext(config, work_dir)
+        for name in selected:
+            try:
+                results[name] = BENCHMARKS[name](ctx)
+            except Exception as e:
+                results[name] = {'error': str(e)}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results['peak_rss_mb'] = peak_rss_mb()
+    return _round_floats({
+        'tts_version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': asdict(config),
+        'results': results,
+    })
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Tuple[BenchmarkConfig, Optional[str]]:
+    """Parse command-line arguments into a config and an optional output path."""
+    parser = argparse.ArgumentParser(description="Run TTS performance benchmarks and emit JSON.")
+    parser.add_argument('--backend', choices=['stub', 'xtts'], default='stub',
+                        help="Synthetic stub model (default) or the locally cached XTTS model")
+    parser.add_argument('--model-name', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--model-dir', help="Local XTTS checkpoint directory (xtts backend, offline load)")
+    parser.add_argument('--stub-rtf', type=float, default=0.1,
+                        help="Simulated real-time factor of the stub model")
+    parser.add_argument('--iterations', type=int, default=3)
+    parser.add_argument('--concurrency', default='1,2,4',
+                        help="Comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=8, help="Requests per concurrency level")
+    parser.add_argument('--validation-files', type=int, default=20)
+    parser.add_argument('--profiles', default='default,cpu,cpu_int8,cpu_bf16',
+                        help=f"Comma-separated inference profiles to compare: {', '.join(PROFILES)}")
+    parser.add_argument('--only', default='', help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--output', help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    config = BenchmarkConfig(
+        backend=args.backend,
+        model_name=args.model_name,
+        model_dir=args.model_dir,
+        stub_real_time_factor=args.stub_rtf,
+        iterations=args.iterations,
+        concurrency_levels=[int(c) for c in args.concurrency.split(',') if c],
+        requests_per_level=args.requests,
+        validation_files=args.validation_files,
+        profiles=[name for name in args.profiles.split(',') if name],
+        only=[name for name in args.only.split(',') if name],
+    )
+    return config, args.output
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point. Returns a process exit code."""
+    config, output = parse_args(argv)
+    if config.backend == 'xtts' and not config.model_dir and not model_is_cached(config.model_name):
+        print(f"Model '{config.model_name}' is not cached locally; refusing to download. "
+              f"Use --backend stub or download the model first.", file=sys.stderr)
+        return 2
+
+    report = run_benchmarks(config)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,17 +3,91 @@ Core Text-to-Speech implementation for AI Voice Assistant.
 
 This module contains the main TextToSpeech class that handles:
 1. TTS model initialization
-2. Text processing pipeline
+2. Text processing pipeline (long inputs are segmented by tts.text)
 3. Audio file generation
-4. Error handling
+4. Speaker conditioning latent caching
+5. Synthesis with saved voice profiles
+6. Per-stage instrumentation
+7. Error handling
 """
 
 import os
+import json
 import logging
+import shutil
+import tempfile
+import threading
+import time
 import wave
-from typing import Optional
-from TTS.api import TTS
-import torch
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import numpy as np
+import soundfile as sf
+from .async_executor import AsyncInferenceExecutor, InferenceCancelled
+from .audio import AudioChunk, StreamTiming, SynthesisResult
+from .latent_cache import SpeakerLatents, VoiceLatentCache, to_numpy
+from .metrics import NULL_METRICS, Metrics
+from .model_registry import LoadedModel, ModelRegistry
+from .output_cache import AudioOutputCache
+from .postprocess import PostProcessor, PostProcessSettings
+from .reference import ReferencePreprocessor
+from .singleflight import FlightCancellation, SingleFlight
+from .sinks import AudioFileSink, format_for_path
+from .profile import InferenceProfile, apply_profile, get_profile, inference_context
+from .text import char_limit, chunk_text
+from .voice_library import VoiceLibrary
+
+DEFAULT_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+DEFAULT_SAMPLE_RATE = 24000  # XTTS v2 native output rate
+DEFAULT_STREAM_CHUNK_SIZE = 20  # GPT tokens per streamed chunk (XTTS default)
+WARMUP_TEXT = "Warming up."
+
+# torch and Coqui TTS take seconds and hundreds of MB to import, so they are
+# loaded on first use by initialize_model(). The module-level names stay
+# patchable in tests.
+TTS = None
+torch = None
+
+
+def _load_backend() -> None:
+    """Import torch and the Coqui TTS API on first use."""
+    global TTS, torch
+    if torch is None:
+        import torch as torch_module
+        torch = torch_module
+    if TTS is None:
+        from TTS.api import TTS as tts_class
+        TTS = tts_class
+
+
+def _until_cancelled(chunks: Iterable[AudioChunk],
+                     cancel_event: Union[threading.Event, FlightCancellation]) -> Iterator[AudioChunk]:
+    """Pass chunks through, raising InferenceCancelled once cancel_event is set."""
+    for chunk in chunks:
+        if cancel_event.is_set():
+            raise InferenceCancelled()
+        yield chunk
+    if cancel_event.is_set():
+        raise InferenceCancelled()
+
+
+def _write_warmup_reference(path: str, seconds: float = 3.0, sample_rate: int = 22050) -> None:
+    """Write a short voiced-sounding tone to condition the model on during warm-up."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    audio = 0.3 * np.sin(2 * np.pi * 140 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    sf.write(path, audio.astype(np.float32), sample_rate, subtype='PCM_16')
+
+
+def _xtts_of(model: Any) -> Optional[Any]:
+    """Return the XTTS model inside a loaded model, or None if it has none."""
+    if model is None:
+        return None
+    synthesizer = getattr(model, 'synthesizer', None)
+    xtts = getattr(synthesizer, 'tts_model', None)
+    if xtts is not None and hasattr(xtts, 'get_conditioning_latents'):
+        return xtts
+    return None
+
 
 class TextToSpeech:
     """
@@ -24,44 +98,591 @@ class TextToSpeech:
         model: The loaded Coqui TTS model instance.
         logger: Logger instance for error tracking.
         device: The computing device ('cuda' or 'cpu') used by the model.
+        model_name: Name of the loaded model, used to key cached latents.
+        latent_cache: Cache of speaker conditioning latents per reference voice.
+        last_stream_timing: Latency figures for the most recent stream_audio() call.
+        async_executor: Bounded executor backing the async API.
+        output_cache: Optional cache of rendered audio files.
+        inference_kwargs: Extra XTTS generation parameters.
+        model_factory: Optional replacement for Coqui TTS model loading.
+        metrics: Instrumentation for pipeline stages (no-op unless enabled).
+        profile: Inference performance profile applied at initialization.
+        profile_report: Settings the profile actually applied, once initialized.
+        voice_library: Optional library of saved voice profiles.
+        reference_preprocessor: Optional cache of cleaned-up reference audio.
+        postprocess: Optional post-processing applied to generated files.
+        output_subtype: Bit depth or codec of generated files (format default when None).
+        model_registry: Optional registry the model is shared through.
+        single_flight: Coalesces identical in-flight requests.
+        model_dir: Optional local XTTS checkpoint directory loaded offline.
+        warmup: Whether initialization runs a warm-up synthesis.
+        load_report: Seconds spent in each phase of the last model load.
     """
     
-    def __init__(self):
-        """Initialize the TTS system."""
+    def __init__(self, latent_cache: Optional[VoiceLatentCache] = None,
+                 async_executor: Optional[AsyncInferenceExecutor] = None,
+                 output_cache: Optional[AudioOutputCache] = None,
+                 inference_kwargs: Optional[Dict[str, Any]] = None,
+                 model_factory: Optional[Callable[[str], Any]] = None,
+                 metrics: Optional[Metrics] = None,
+                 profile: Optional[Union[str, InferenceProfile]] = None,
+                 voice_library: Optional[VoiceLibrary] = None,
+                 reference_preprocessor: Optional[ReferencePreprocessor] = None,
+                 postprocess: Optional[PostProcessSettings] = None,
+                 output_subtype: Optional[str] = None,
+                 model_registry: Optional[ModelRegistry] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 model_dir: Optional[str] = None,
+                 warmup: bool = False):
+        """
+        Initialize the TTS system.
+
+        Args:
+            latent_cache (Optional[VoiceLatentCache]): Speaker latent cache to use.
+                Pass a shared instance (optionally with a cache_dir) to reuse
+                latents across instances; a private in-memory cache is created
+                otherwise.
+            async_executor (Optional[AsyncInferenceExecutor]): Executor used by
+                the async API. Defaults to one inference thread with a queue of 8.
+            output_cache (Optional[AudioOutputCache]): Cache of rendered audio
+                consulted by text_to_speech(). Disabled when None.
+            inference_kwargs (Optional[Dict[str, Any]]): Extra XTTS generation
+                parameters (e.g. temperature, speed) passed to every inference call.
+            model_factory (Optional[Callable[[str], Any]]): Loads a model by name
+                in place of Coqui TTS, e.g. tts.stub.StubModelFactory for
+                benchmarks and tests. The model is used on the CPU.
+            metrics (Optional[Metrics]): Records stage latencies, request
+                counts and audio produced. Instrumentation is disabled when None.
+            profile (Optional[Union[str, InferenceProfile]]): Thread counts,
+                inference mode, int8 quantization and bf16 settings, by name
+                from tts.profile.PROFILES or as an instance. The model runs
+                with torch defaults when None.
+            voice_library (Optional[VoiceLibrary]): Saved voice profiles.
+                When set, the speaker_wav argument of the synthesis methods
+                also accepts a voice ID from the library.
+            reference_preprocessor (Optional[ReferencePreprocessor]): When set,
+                reference audio is downmixed, resampled, trimmed and
+                loudness-normalized once and the cached result is used for
+                conditioning. References are used as-is when None.
+            postprocess (Optional[PostProcessSettings]): Crossfade, silence
+                trimming, resampling and loudness normalization applied
+                block-wise by generate_audio() while writing. Audio is
+                written as generated when None.
+            output_subtype (Optional[str]): soundfile subtype of generated
+                files, e.g. 'PCM_24' or 'VORBIS'. The container format
+                follows the output extension (.wav, .flac, .ogg, .opus) and
+                defaults to 16-bit PCM for WAV and FLAC when None.
+            model_registry (Optional[ModelRegistry]): Registry to obtain the
+                model from, e.g. tts.model_registry.SHARED_MODELS, so that
+                instances with the same model name, model factory and
+                profile share one loaded model. The instance then fetches
+                the model through the registry on use, so a registry with a
+                memory budget or idle timeout can evict and later reload
+                it. Each instance loads and keeps its own model when None.
+            single_flight (Optional[SingleFlight]): Coalesces identical
+                concurrent synthesize() and text_to_speech() requests into
+                one inference. Pass a shared instance to coalesce across
+                engines; a private one is created otherwise.
+            model_dir (Optional[str]): Directory holding an XTTS checkpoint
+                (config.json, model.pth, vocab.json). The model is loaded
+                from it directly, skipping the Coqui model manager and any
+                download. initialize_model's model_name still names the
+                model for latent caches and voice profiles.
+            warmup (bool): Run one short conditioning and synthesis pass at
+                initialization, so one-time costs (kernel selection,
+                allocator growth, lazy imports) are paid before the first
+                real request.
+        """
         self.logger = logging.getLogger(__name__)
-        self.model: Optional[TTS] = None # Type hint for clarity
+        self._model: Optional["TTS"] = None
+        self._model_key: Optional[Any] = None
+        self._model_loader: Optional[Callable[[], LoadedModel]] = None
         self.device: Optional[str] = None
+        self.model_name: Optional[str] = None
+        self.latent_cache = latent_cache if latent_cache is not None else VoiceLatentCache()
+        self.last_stream_timing: Optional[StreamTiming] = None
+        self.async_executor = async_executor if async_executor is not None else AsyncInferenceExecutor()
+        self.output_cache = output_cache
+        self.inference_kwargs: Dict[str, Any] = dict(inference_kwargs or {})
+        self.model_factory = model_factory
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.profile = get_profile(profile) if profile is not None else None
+        self.profile_report: Optional[Dict[str, Any]] = None
+        self.voice_library = voice_library
+        self.reference_preprocessor = reference_preprocessor
+        self.postprocess = postprocess
+        self.output_subtype = output_subtype
+        self.model_registry = model_registry
+        self.single_flight = single_flight if single_flight is not None else SingleFlight()
+        self.model_dir = model_dir
+        self.warmup = warmup
+        self.load_report: Dict[str, float] = {}
+        self._init_lock = threading.Lock()
         
-    def initialize_model(self, model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2") -> bool:
+    def initialize_model(self, model_name: str = DEFAULT_MODEL_NAME) -> bool:
         """
         Load and initialize the Coqui TTS model.
 
+        Safe to call from several threads: the model is loaded once and the
+        other callers wait for it. With a model registry, the model is shared
+        with other instances loading the same model.
+
         Args:
             model_name (str): The name of the XTTS model to load.
 
         Returns:
             bool: True if initialization succeeded, False otherwise.
         """
-        try:
-            if self.model is not None:
-                self.logger.info("TTS model already initialized.")
+        with self._init_lock:
+            try:
+                if self.model is not None:
+                    self.logger.info("TTS model already initialized.")
+                    return True
+
+                with self.metrics.stage('model_init'):
+                    if self.model_registry is not None:
+                        key = (model_name, self.model_factory or self.model_dir or 'coqui', self.profile)
+                        loader = lambda: self._load_model(model_name)
+                        loaded = self.model_registry.get_or_load(key, loader)
+                    else:
+                        loaded = self._load_model(model_name)
+                if self.model_registry is not None:
+                    # Hold the key, not the model, so the registry can evict it
+                    self._model = None
+                    self._model_key, self._model_loader = key, loader
+                else:
+                    self.model = loaded.model
+                self.device = loaded.device
+                self.model_name = loaded.model_name
+                self.profile_report = loaded.profile_report
+                self.load_report = loaded.load_report
+
+                self.logger.info("Coqui TTS model initialized successfully.")
                 return True
+            except Exception as e:
+                self.logger.error(f"Failed to initialize Coqui TTS model: {str(e)}", exc_info=True)
+                self.model = None
+                self.device = None
+                self.profile_report = None
+                return False
 
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            self.logger.info(f"Initializing Coqui TTS model '{model_name}' on device: {self.device}")
-            
-            # Note: The model files will be downloaded on first run if not cached
-            self.model = TTS(model_name=model_name, progress_bar=True).to(self.device)
-            
-            self.logger.info("Coqui TTS model initialized successfully.")
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Coqui TTS model: {str(e)}", exc_info=True)
-            self.model = None
-            self.device = None
-            return False
+    @property
+    def model(self) -> Optional[Any]:
+        """
+        The loaded model, or None before initialization.
+
+        With a model registry the model is looked up on every access and
+        reloaded if the registry evicted it.
+        """
+        if self._model_key is not None:
+            return self.model_registry.use(self._model_key, self._model_loader).model
+        return self._model
+
+    @model.setter
+    def model(self, value: Optional[Any]) -> None:
+        self._model = value
+        self._model_key = None
+        self._model_loader = None
+
+    def _load_model(self, model_name: str) -> LoadedModel:
+        """Load a model and apply the inference profile, without touching instance state."""
+        phases: Dict[str, float] = {}
+        start = phase_start = time.perf_counter()
+
+        def mark(phase: str) -> None:
+            nonlocal phase_start
+            now = time.perf_counter()
+            phases[phase] = now - phase_start
+            phase_start = now
+
+        if self.model_factory is not None:
+            device = "cpu"
+            self.logger.info(f"Loading model '{model_name}' from custom model factory")
+            model = self.model_factory(model_name)
+            mark('load')
+        else:
+            _load_backend()
+            mark('import')
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            if self.model_dir is not None:
+                config_path = os.path.join(self.model_dir, 'config.json')
+                if not os.path.exists(config_path):
+                    raise FileNotFoundError(f"No config.json in model directory: {self.model_dir}")
+                self.logger.info(f"Loading model '{model_name}' from {self.model_dir} on device: {device}")
+                model = TTS(model_path=self.model_dir, config_path=config_path, progress_bar=False)
+            else:
+                self.logger.info(f"Initializing Coqui TTS model '{model_name}' on device: {device}")
+                # Note: The model files will be downloaded on first run if not cached
+                model = TTS(model_name=model_name, progress_bar=True)
+            mark('load')
+            model = model.to(device)
+            mark('to_device')
+
+        profile_report = None
+        if self.profile is not None:
+            profile_report = apply_profile(self.profile, _xtts_of(model), device, torch)
+            mark('profile')
+        if self.warmup:
+            self._warm_up(model, profile_report)
+            mark('warmup')
+        phases['total'] = time.perf_counter() - start
+
+        breakdown = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in phases.items() if phase != 'total')
+        self.logger.info(f"Model '{model_name}' ready in {phases['total']:.2f}s ({breakdown})")
+        return LoadedModel(model=model, device=device, model_name=model_name,
+                           profile_report=profile_report, load_report=phases)
+
+    def _warm_up(self, model: Any, profile_report: Optional[Dict[str, Any]]) -> None:
+        """Run one short conditioning and synthesis pass on a synthetic reference."""
+        with tempfile.TemporaryDirectory(prefix='tts-warmup-') as tmp_dir:
+            reference = os.path.join(tmp_dir, 'reference.wav')
+            _write_warmup_reference(reference)
+            xtts = _xtts_of(model)
+            try:
+                with inference_context(profile_report, torch):
+                    if xtts is None:
+                        model.tts(text=WARMUP_TEXT, speaker_wav=reference, language='en')
+                        return
+                    gpt_cond_latent, speaker_embedding = xtts.get_conditioning_latents(audio_path=[reference])
+                    xtts.inference(text=WARMUP_TEXT, language='en', gpt_cond_latent=gpt_cond_latent,
+                                   speaker_embedding=speaker_embedding, **self.inference_kwargs)
+            except Exception as e:
+                # The model loaded; a failed warm-up only means a slower first request
+                self.logger.warning(f"Model warm-up failed: {str(e)}")
+
+    def _get_xtts_model(self) -> Optional[Any]:
+        """
+        Return the underlying XTTS model if the loaded model exposes one.
+
+        Returns:
+            The XTTS model supporting explicit conditioning latents, or None.
+        """
+        return _xtts_of(self.model)
+
+    def _output_sample_rate(self) -> int:
+        """Return the sample rate of the audio produced by the loaded model."""
+        synthesizer = getattr(self.model, 'synthesizer', None)
+        sample_rate = getattr(synthesizer, 'output_sample_rate', None)
+        return sample_rate if isinstance(sample_rate, int) else DEFAULT_SAMPLE_RATE
+
+    def _restore_latent(self, array):
+        """Move a latent loaded from the disk cache back onto the model device."""
+        if torch is None:
+            # Non-torch model (e.g. the stub backend) works on NumPy arrays
+            return array
+        return torch.from_numpy(array).to(self.device or 'cpu')
+
+    def _library_voice(self, speaker_wav: str) -> Optional[str]:
+        """Return speaker_wav if it names a library voice rather than a file, else None."""
+        if self.voice_library is None or os.path.exists(speaker_wav):
+            return None
+        return speaker_wav if speaker_wav in self.voice_library else None
+
+    def _speaker_exists(self, speaker_wav: str) -> bool:
+        return os.path.exists(speaker_wav) or self._library_voice(speaker_wav) is not None
+
+    def _prepare_reference(self, speaker_wav: str) -> str:
+        """Return the preprocessed reference path, or speaker_wav if preprocessing is off."""
+        if self.reference_preprocessor is None:
+            return speaker_wav
+        return self.reference_preprocessor.prepare(speaker_wav)
+
+    def get_speaker_latents(self, speaker_wav: str) -> SpeakerLatents:
+        """
+        Return the XTTS conditioning latents for a reference voice.
+
+        Latents are looked up in the latent cache by the content hash of the
+        reference WAV and the model name, and only computed on a miss. A
+        voice ID from the voice library is loaded from its saved profile.
+
+        Args:
+            speaker_wav (str): Path to the reference audio file (.wav), or a
+                voice ID when a voice library is configured.
+
+        Returns:
+            SpeakerLatents: (gpt_cond_latent, speaker_embedding).
+
+        Raises:
+            RuntimeError: If the loaded model does not expose XTTS latents.
+            ValueError: If a voice profile was computed by a different model.
+        """
+        xtts = self._get_xtts_model()
+        if xtts is None:
+            raise RuntimeError("Loaded model does not support speaker conditioning latents.")
+
+        voice_id = self._library_voice(speaker_wav)
+        if voice_id is not None:
+            voice = self.voice_library.get(voice_id)
+            if voice.model_name and voice.model_name != self.model_name:
+                raise ValueError(f"Voice '{voice_id}' was created with model '{voice.model_name}', "
+                                 f"not '{self.model_name}'")
+            # The profile digest changes when the voice is re-created
+            return self.latent_cache.get_or_compute(
+                f"voice:{voice_id}:{voice.digest}",
+                lambda: self.voice_library.load_latents(voice_id, restore=self._restore_latent)
+            )
+
+        reference = self._prepare_reference(speaker_wav)
+
+        def compute() -> SpeakerLatents:
+            with self.metrics.stage('conditioning'), self._inference_context():
+                return xtts.get_conditioning_latents(audio_path=[reference])
+
+        key = self.latent_cache.make_key(reference, self.model_name)
+        return self.latent_cache.get_or_compute(key, compute, restore=self._restore_latent)
         
-    def generate_audio(self, text: str, speaker_wav: str, language: str, output_path: str) -> bool:
+    def stream_audio(self, text: str, speaker_wav: str, language: str,
+                     stream_chunk_size: Optional[int] = DEFAULT_STREAM_CHUNK_SIZE,
+                     segments: Optional[List[str]] = None) -> Iterator[AudioChunk]:
+        """
+        Synthesize speech incrementally, yielding audio as soon as it is ready.
+
+        With an XTTS model and a stream_chunk_size, chunks come from XTTS
+        streaming inference every stream_chunk_size GPT tokens, so playback
+        can start well before the utterance is complete. With
+        stream_chunk_size=None one chunk is yielded per segment of
+        tts.text.chunk_text (sentences packed up to the language's character
+        limit, so short text is a single model call), which is what the
+        file-writing path uses. Latency figures for the call are
+        stored on last_stream_timing once the generator is exhausted.
+
+        Args:
+            text (str): Text to convert to speech.
+            speaker_wav (str): Path to the reference audio file (.wav) for voice cloning.
+            language (str): Language code for the text (e.g., 'en').
+            stream_chunk_size (Optional[int]): GPT tokens per chunk, or None
+                for segment-sized chunks.
+            segments (Optional[List[str]]): Pre-split text (e.g. from
+                tts.text.chunk_text) synthesized one model call per segment
+                in place of chunk_text.
+
+        Yields:
+            AudioChunk: Consecutive float32 PCM chunks with their sample rate.
+
+        Raises:
+            RuntimeError: If the model has not been initialized.
+            FileNotFoundError: If the reference speaker WAV does not exist.
+        """
+        if not self.model:
+            raise RuntimeError("TTS model not initialized. Call initialize_model() first.")
+        if not self._speaker_exists(speaker_wav):
+            raise FileNotFoundError(f"Reference speaker WAV file not found: {speaker_wav}")
+
+        start = time.perf_counter()
+        timing = StreamTiming()
+        sample_rate = self._output_sample_rate()
+        self.metrics.track_inflight(1)
+        try:
+            waveforms = self._iter_waveforms(text, speaker_wav, language, stream_chunk_size, segments)
+            for index, samples in enumerate(waveforms):
+                if timing.time_to_first_chunk is None:
+                    timing.time_to_first_chunk = time.perf_counter() - start
+                chunk = AudioChunk(
+                    samples=np.asarray(to_numpy(samples), dtype=np.float32).reshape(-1),
+                    sample_rate=sample_rate,
+                    index=index
+                )
+                timing.chunks += 1
+                timing.audio_seconds += chunk.duration
+                yield chunk
+        except Exception:
+            self.metrics.count_request(success=False)
+            raise
+        finally:
+            self.metrics.track_inflight(-1)
+            self.metrics.add_audio_seconds(timing.audio_seconds)
+
+        self.metrics.count_request(success=True)
+        timing.total_time = time.perf_counter() - start
+        self.last_stream_timing = timing
+        if timing.time_to_first_chunk is not None:
+            self.logger.info(
+                f"Streamed {timing.audio_seconds:.2f}s of audio in {timing.chunks} chunks: "
+                f"first chunk after {timing.time_to_first_chunk:.3f}s, total {timing.total_time:.3f}s"
+            )
+
+    def _iter_waveforms(self, text: str, speaker_wav: str, language: str,
+                        stream_chunk_size: Optional[int],
+                        segments: Optional[List[str]] = None) -> Iterator[Any]:
+        """Yield raw waveforms from the model in the requested granularity."""
+        xtts = self._get_xtts_model()
+        if xtts is None:
+            if self._library_voice(speaker_wav) is not None:
+                raise RuntimeError("Voice profiles require a model with speaker conditioning latents.")
+            # Models without explicit latent support synthesize per segment
+            reference = self._prepare_reference(speaker_wav)
+            yield from self._run_inference((
+                self.model.tts(text=segment, speaker_wav=reference, language=language)
+                for segment in (segments or chunk_text(text, language))
+            ), language)
+            return
+
+        # Reuse cached conditioning latents instead of re-reading the reference
+        gpt_cond_latent, speaker_embedding = self.get_speaker_latents(speaker_wav)
+        if stream_chunk_size:
+            yield from self._run_inference((
+                chunk
+                for segment in (segments or [text])
+                for chunk in xtts.inference_stream(
+                    text=segment,
+                    language=language,
+                    gpt_cond_latent=gpt_cond_latent,
+                    speaker_embedding=speaker_embedding,
+                    stream_chunk_size=stream_chunk_size,
+                    enable_text_splitting=True,
+                    **self.inference_kwargs
+                )
+            ), language)
+            return
+
+        yield from self._run_inference((
+            xtts.inference(
+                text=segment,
+                language=language,
+                gpt_cond_latent=gpt_cond_latent,
+                speaker_embedding=speaker_embedding,
+                enable_text_splitting=True,
+                **self.inference_kwargs
+            )["wav"]
+            # XTTS splits sentences itself; one call per sentence would
+            # cost a model call for every abbreviation the regex splits on
+            for segment in (segments or chunk_text(text, language))
+        ), language)
+
+    def _inference_context(self):
+        """Return the context (inference mode, bf16 autocast) model calls run under."""
+        return inference_context(self.profile_report, torch)
+
+    def _run_inference(self, waveforms: Iterable[Any], language: str) -> Iterable[Any]:
+        """
+        Produce waveforms under the profile's inference context, timed as one
+        'inference' stage.
+
+        The context is entered only while the model works, never while the
+        consumer handles a chunk, and only the model's time is recorded.
+        Returns waveforms untouched when neither is needed.
+        """
+        if not self.metrics.enabled and self.profile_report is None:
+            return waveforms
+        return self._instrument_iterator(waveforms, language)
+
+    def _instrument_iterator(self, waveforms: Iterable[Any], language: str) -> Iterator[Any]:
+        elapsed = 0.0
+        success = True
+        iterator = iter(waveforms)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    with self._inference_context():
+                        waveform = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield waveform
+        except Exception:
+            success = False
+            raise
+        finally:
+            self.metrics.observe_stage('inference', elapsed, success=success, language=language)
+
+    def synthesize(self, text: str, speaker_wav: str, language: str,
+                   output_path: Optional[str] = None) -> SynthesisResult:
+        """
+        Synthesize speech and return the waveform in memory.
+
+        No audio touches the filesystem unless output_path is given, in which
+        case the result is additionally written there as a sink. Identical
+        concurrent calls share one inference and the same result object.
+
+        Args:
+            text (str): Text to convert to speech.
+            speaker_wav (str): Path to the reference audio file (.wav) for voice cloning.
+            language (str): Language code for the text (e.g., 'en').
+            output_path (Optional[str]): Also write the audio to this path.
+
+        Returns:
+            SynthesisResult: Float32 waveform, sample rate and metadata
+            (text, language, speaker, model, chunk count and timings).
+
+        Raises:
+            RuntimeError: If the model is not initialized or produced no audio.
+            FileNotFoundError: If the reference speaker WAV does not exist.
+        """
+        key = ('synthesize', text, speaker_wav, language, self.model_name, self._params_key())
+        result, shared = self.single_flight.do(key, lambda: self._synthesize(text, speaker_wav, language))
+        if shared:
+            self.logger.info(f"Shared in-flight synthesis for text: '{text[:50]}...'")
+        if output_path is not None:
+            result.write(output_path)
+        return result
+
+    def _synthesize(self, text: str, speaker_wav: str, language: str) -> SynthesisResult:
+        """Run synthesize() inference; shared by coalesced callers."""
+        # Timed locally: last_stream_timing may be overwritten by concurrent calls
+        start = time.perf_counter()
+        first_chunk_time = None
+        chunks = []
+        for chunk in self.stream_audio(text, speaker_wav, language, stream_chunk_size=None):
+            if first_chunk_time is None:
+                first_chunk_time = time.perf_counter() - start
+            chunks.append(chunk)
+        if not chunks:
+            raise RuntimeError("Synthesis produced no audio (empty text?)")
+        result = SynthesisResult(
+            samples=np.concatenate([c.samples for c in chunks]),
+            sample_rate=chunks[0].sample_rate,
+            metadata={
+                'text': text,
+                'language': language,
+                'speaker_wav': speaker_wav,
+                'model_name': self.model_name,
+                'chunks': len(chunks),
+                'synthesis_time': time.perf_counter() - start,
+                'time_to_first_chunk': first_chunk_time,
+            }
+        )
+        return result
+
+    def _write_chunks(self, chunks: Iterable[AudioChunk], output_path: str,
+                      format: Optional[str] = None, subtype: Optional[str] = None) -> int:
+        """
+        Write streamed chunks to an audio file as they arrive.
+
+        Encoding runs on the sink's writer thread, overlapping with
+        generation of the following chunks.
+
+        Args:
+            chunks (Iterable[AudioChunk]): Audio to write, in order.
+            output_path (str): Destination path; the extension selects the format.
+            format (Optional[str]): Container format overriding the extension.
+            subtype (Optional[str]): Subtype overriding output_subtype.
+
+        Returns:
+            int: Number of chunks written.
+        """
+        written = 0
+        success = False
+        if os.path.exists(output_path) and os.stat(output_path).st_nlink > 1:
+            # Hard-linked from the output cache; replace rather than overwrite in place
+            os.remove(output_path)
+        sink = AudioFileSink(output_path, format=format, subtype=subtype or self.output_subtype)
+        try:
+            with sink:
+                for chunk in chunks:
+                    sink.write(chunk)
+                    written += 1
+            success = True
+        finally:
+            if written:
+                # Only the time spent encoding and writing, not waiting on inference
+                self.metrics.observe_stage('file_write', sink.encode_time, success=success)
+        return written
+
+    def generate_audio(self, text: str, speaker_wav: str, language: str, output_path: str,
+                       cancel_event: Optional[Union[threading.Event, FlightCancellation]] = None,
+                       segments: Optional[List[str]] = None) -> bool:
         """
         Generate WAV audio from text using the specified speaker voice.
 
@@ -70,6 +691,12 @@ class TextToSpeech:
             speaker_wav (str): Path to the reference audio file (.wav) for voice cloning.
             language (str): Language code for the text (e.g., 'en').
             output_path (str): Path to save the generated WAV file.
+            cancel_event (Optional[Union[threading.Event, FlightCancellation]]):
+                When set (for a FlightCancellation, once every caller sharing
+                the render has cancelled), generation stops at the next
+                segment boundary and the partial file is removed.
+            segments (Optional[List[str]]): Pre-split text synthesized one
+                model call per segment in place of chunk_text.
 
         Returns:
             bool: True if successful, False otherwise.
@@ -79,7 +706,7 @@ class TextToSpeech:
             return False
             
         # Validate speaker_wav exists before passing to the model
-        if not os.path.exists(speaker_wav):
+        if not self._speaker_exists(speaker_wav):
              self.logger.error(f"Reference speaker WAV file not found: {speaker_wav}")
              return False
 
@@ -89,58 +716,193 @@ class TextToSpeech:
             self.logger.info(f"Language: {language}")
             self.logger.info(f"Output path: {output_path}")
 
-            # Use tts_to_file for synthesis
-            self.model.tts_to_file(
-                text=text,
-                speaker_wav=speaker_wav,
-                language=language,
-                file_path=output_path
-            )
+            chunks = self.stream_audio(text, speaker_wav, language, stream_chunk_size=None,
+                                       segments=segments)
+            if cancel_event is not None:
+                chunks = _until_cancelled(chunks, cancel_event)
+            processor = PostProcessor(self.postprocess) if self.postprocess is not None else None
+            if processor is not None:
+                chunks = processor.process(chunks)
+            if processor is not None and processor.normalizes:
+                # The gain depends on the whole stream: stage it as float WAV
+                # and apply the gain while encoding the output, once
+                staging_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.float.wav"
+                try:
+                    if self._write_chunks(chunks, staging_path, format='WAV', subtype='FLOAT'):
+                        processor.finalize_file(staging_path, output_path,
+                                                subtype=self.output_subtype)
+                finally:
+                    if os.path.exists(staging_path):
+                        os.remove(staging_path)
+            else:
+                self._write_chunks(chunks, output_path)
             
             if os.path.exists(output_path):
                 self.logger.info(f"Successfully generated audio file: {output_path}")
                 return True
             else:
-                # This case might not be reached if tts_to_file raises an error on failure
+                # No chunks were produced (e.g. empty text), so no file was opened
                 self.logger.error(f"Failed to create output file: {output_path}")
                 return False
+        except InferenceCancelled:
+            self.logger.info(f"Audio generation cancelled: {output_path}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return False
         except Exception as e:
             self.logger.error(f"Failed to generate audio: {str(e)}", exc_info=True)
             return False
         
-    def text_to_speech(self, text: str, speaker_wav: str, language: str, output_path: str) -> bool:
+    async def agenerate_audio(self, text: str, speaker_wav: str, language: str, output_path: str,
+                              timeout: Optional[float] = None) -> bool:
+        """
+        Async counterpart of generate_audio() with bounded concurrency.
+
+        Inference runs on async_executor. If the executor's concurrency limit
+        and queue are exhausted the call fails immediately instead of queueing
+        another thread. Cancelling the awaiting task or hitting the timeout
+        stops generation at the next segment boundary.
+
+        Args:
+            text (str): Text to convert to speech.
+            speaker_wav (str): Path to the reference audio file (.wav) for voice cloning.
+            language (str): Language code for the text (e.g., 'en').
+            output_path (str): Path to save the generated WAV file.
+            timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+            bool: True if successful, False otherwise.
+
+        Raises:
+            QueueFullError: If too many requests are already outstanding.
+            asyncio.TimeoutError: If generation does not finish within timeout.
+        """
+        return await self.async_executor.run(
+            lambda cancel_event: self.generate_audio(
+                text, speaker_wav, language, output_path, cancel_event=cancel_event
+            ),
+            timeout=timeout
+        )
+
+    def text_to_speech(self, text: str, speaker_wav: str, language: str, output_path: str,
+                       cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Complete text-to-speech pipeline using Coqui TTS for voice cloning.
 
+        When an output cache is configured, a previously rendered identical
+        request is served from the cache without loading the model, and new
+        renders are added to it. Text longer than the language's XTTS
+        character limit is normalized and packed into budget-sized segments
+        by tts.text.chunk_text before synthesis.
+
         Args:
             text (str): Input text to convert.
             speaker_wav (str): Path to the reference audio file (.wav).
             language (str): Language code (e.g., 'en').
             output_path (str): Where to save the generated WAV file.
+            cancel_event (Optional[threading.Event]): When set, this call
+                returns False. A render shared with identical concurrent
+                calls stops at the next segment boundary only once every
+                caller has cancelled.
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Initialize model if it hasn't been already
-            if not self.model:
-                if not self.initialize_model():
-                    # Initialization failed, error logged in initialize_model
-                    return False
-                
-            # Proceed with generation
-            return self.generate_audio(
-                text=text, 
-                speaker_wav=speaker_wav, 
-                language=language, 
-                output_path=output_path
-            )
+            params = self._render_params(output_path)
+            cache_key = None
+            if self.output_cache is not None and os.path.exists(speaker_wav):
+                # Served from cache without loading the model
+                cache_key = self.output_cache.make_key(
+                    text, speaker_wav, language,
+                    self.model_name or DEFAULT_MODEL_NAME, params
+                )
+                if self.output_cache.fetch(cache_key, output_path):
+                    self.logger.info(f"Served cached audio for text: '{text[:50]}...'")
+                    return True
+
+            key = ('text_to_speech', text, speaker_wav, language,
+                   self.model_name or DEFAULT_MODEL_NAME, self._params_key(params))
+            # Only stop a shared render once every caller waiting on it has cancelled
+            flight_cancel = self.single_flight.cancellation(key) if cancel_event is not None else None
+            led = []
+
+            def render() -> Optional[str]:
+                led.append(True)
+                return self._render_file(text, speaker_wav, language, output_path, cache_key, flight_cancel)
+
+            def deliver(rendered: Optional[str]) -> Optional[str]:
+                # Runs before the leader returns, while its file is still intact
+                if rendered is not None and os.path.abspath(rendered) != os.path.abspath(output_path):
+                    shutil.copyfile(rendered, output_path)
+                    self.logger.info(f"Shared in-flight render for text: '{text[:50]}...'")
+                return rendered
+
+            try:
+                rendered, _ = self.single_flight.do(key, render, cancel_event=cancel_event, deliver=deliver)
+            except InferenceCancelled:
+                # The render went on for other callers; this caller gets no file
+                if led and os.path.exists(output_path):
+                    os.remove(output_path)
+                self.logger.info(f"Text-to-speech cancelled: {output_path}")
+                return False
+            return rendered is not None
             
         except Exception as e:
             # Catch any unexpected errors during the process
             self.logger.error(f"TTS conversion failed: {str(e)}", exc_info=True)
             return False
 
+    def _render_file(self, text: str, speaker_wav: str, language: str, output_path: str,
+                     cache_key: Optional[str],
+                     cancel_event: Optional[FlightCancellation] = None) -> Optional[str]:
+        """Render text_to_speech() output, returning its path or None on failure."""
+        # Initialize model if it hasn't been already
+        if not self.model:
+            if not self.initialize_model():
+                # Initialization failed, error logged in initialize_model
+                return None
+            
+        # Proceed with generation
+        options: Dict[str, Any] = {}
+        if cancel_event is not None:
+            options['cancel_event'] = cancel_event
+        if len(text) > char_limit(language):
+            options['segments'] = chunk_text(text, language)
+        success = self.generate_audio(
+            text=text,
+            speaker_wav=speaker_wav,
+            language=language,
+            output_path=output_path,
+            **options
+        )
+        if success and cache_key is not None:
+            self.output_cache.store(cache_key, output_path)
+        return output_path if success else None
+
+    def _render_params(self, output_path: Optional[str] = None) -> Dict[str, Any]:
+        """Generation and output settings that affect the rendered audio."""
+        params = self.inference_kwargs
+        if self.profile is not None:
+            # int8 and bf16 profiles change the generated audio
+            params = dict(params, profile=asdict(self.profile))
+        if self.reference_preprocessor is not None:
+            params = dict(params, reference_preprocessor=asdict(self.reference_preprocessor.settings))
+        if self.postprocess is not None:
+            params = dict(params, postprocess=asdict(self.postprocess))
+        if output_path is not None:
+            if self.output_subtype is not None:
+                params = dict(params, output_subtype=self.output_subtype)
+            output_format = format_for_path(output_path)
+            if output_format != 'WAV':
+                params = dict(params, output_format=output_format)
+        return params
+
+    def _params_key(self, params: Optional[Dict[str, Any]] = None) -> str:
+        """Serialize render parameters for use in a coalescing key."""
+        params = self.inference_kwargs if params is None else params
+        return json.dumps(params, sort_keys=True, default=str)
+
 def validate_voice_sample(file_path: str) -> None:
     """
     Validate a voice sample file meets basic requirements. 
@@ -175,7 +937,7 @@ def validate_voice_sample(file_path: str) -> None:
             # Add a check for sample rate if possible (XTTS works best with 24kHz or 16kHz)
             # This basic check might not be sufficient for all cases.
             if rate < 16000:
-                 self.logger.warning(f"Sample rate ({rate}Hz) is lower than typically recommended for XTTS (>= 16kHz).")
+                 logging.getLogger(__name__).warning(f"Sample rate ({rate}Hz) is lower than typically recommended for XTTS (>= 16kHz).")
 
     except EOFError:
         raise ValueError("Empty or corrupted WAV file (EOFError)")
@@ -0,0 +1,402 @@
+"""
+Long-form episode synthesis for AI Voice Assistant.
+
+Podcast-length scripts are too long to push through a single synthesis call.
+This module provides an EpisodePipeline that:
+1. Splits a script into paragraph-aware segments
+2. Synthesizes segments concurrently on a pool of workers
+3. Stitches the results in order, with configurable silence, into one file
+4. Reports per-segment timings and the overall real-time factor
+5. Optionally renders incrementally: segments are stored next to the episode
+   under a manifest of content hashes, so after an edit only inserted or
+   changed segments are synthesized and the rest are re-stitched from disk
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from .audio import AudioChunk
+from .core import DEFAULT_MODEL_NAME, TextToSpeech
+from .hashing import file_digest
+from .sinks import AudioFileSink, format_for_path
+from .text import chunk_text
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+@dataclass
+class Segment:
+    """
+    A unit of script text synthesized in one call.
+
+    Attributes:
+        index: Position of the segment in the episode.
+        text: Text to synthesize.
+        ends_paragraph: Whether the segment closes a paragraph.
+    """
+    index: int
+    text: str
+    ends_paragraph: bool = False
+
+
+@dataclass
+class SegmentResult:
+    """
+    Outcome of synthesizing one segment.
+
+    Attributes:
+        index: Position of the segment in the episode.
+        text: Text that was synthesized.
+        synthesis_time: Seconds spent synthesizing the segment.
+        audio_seconds: Duration of the audio produced.
+        error: Error message if synthesis failed, otherwise None.
+        reused: Whether the audio came from an earlier incremental render.
+    """
+    index: int
+    text: str
+    synthesis_time: float = 0.0
+    audio_seconds: float = 0.0
+    error: Optional[str] = None
+    reused: bool = False
+
+
+@dataclass
+class EpisodeReport:
+    """
+    Summary of an episode render.
+
+    Attributes:
+        output_path: Path of the stitched episode file.
+        success: True if every segment was synthesized and written.
+        segments: Per-segment results in script order.
+        total_time: Wall-clock seconds for the whole render.
+        audio_seconds: Duration of the stitched episode, including silence.
+    """
+    output_path: str
+    success: bool = False
+    segments: List[SegmentResult] = field(default_factory=list)
+    total_time: float = 0.0
+    audio_seconds: float = 0.0
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Render time divided by episode duration (lower is faster)."""
+        if self.audio_seconds <= 0:
+            return None
+        return self.total_time / self.audio_seconds
+
+
+def split_script(script: str, language: str = 'en', max_chars: Optional[int] = None) -> List[Segment]:
+    """
+    Split a script into segments that respect paragraph boundaries.
+
+    Paragraphs are separated by blank lines. Each paragraph is segmented
+    with tts.text.chunk_text, the same way TextToSpeech.text_to_speech()
+    splits long text: sentences are packed while they fit the language's
+    XTTS character budget, and longer sentences are split at clauses or words.
+
+    Args:
+        script (str): Full episode script.
+        language (str): Language code, which selects the character budget.
+        max_chars (Optional[int]): Budget override in characters.
+
+    Returns:
+        List[Segment]: Segments in script order.
+    """
+    segments: List[Segment] = []
+    for paragraph in _PARAGRAPH_BREAK.split(script):
+        pieces = chunk_text(paragraph, language, max_chars)
+        for i, text in enumerate(pieces):
+            segments.append(Segment(index=len(segments), text=text, ends_paragraph=i == len(pieces) - 1))
+    return segments
+
+
+class SegmentStore:
+    """
+    Rendered segments of one episode, kept for incremental re-renders.
+
+    Segment audio is stored losslessly as <hash>.wav in the store directory;
+    manifest.json lists the hashes of the episode's segments in script
+    order. A segment is reusable while its hash is in the manifest and its
+    file exists.
+
+    Attributes:
+        directory: Directory holding the manifest and segment files.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, directory: str):
+        """
+        Open a store, reading its manifest if one exists.
+
+        Args:
+            directory (str): Store directory; created on first save.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self._known = set()
+        try:
+            with open(os.path.join(directory, self.MANIFEST)) as f:
+                self._known = {entry['hash'] for entry in json.load(f)['segments']}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable segment manifest in {directory}: {str(e)}")
+
+    def path(self, digest: str) -> str:
+        """Return the file a segment's audio is stored in."""
+        return os.path.join(self.directory, f"{digest}.wav")
+
+    def has(self, digest: str) -> bool:
+        """Return True if the segment can be reused."""
+        return digest in self._known and os.path.exists(self.path(digest))
+
+    def load(self, digest: str):
+        """Return the stored waveform and sample rate of a segment."""
+        audio, sample_rate = sf.read(self.path(digest), dtype='float32')
+        return audio, sample_rate
+
+    def save(self, digest: str, audio: np.ndarray, sample_rate: int) -> None:
+        """Store a segment's audio; it becomes reusable once committed."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f".{digest}.{uuid.uuid4().hex}.tmp")
+        sf.write(tmp_path, audio, sample_rate, format='WAV', subtype='FLOAT')
+        os.replace(tmp_path, self.path(digest))
+
+    def commit(self, segments: List[Segment], digests: List[str]) -> None:
+        """
+        Record the episode's current segments and delete audio no longer used.
+
+        Segments without stored audio (e.g. failed ones) are left out, so a
+        retry synthesizes only those.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        entries = [{'hash': digest, 'text': segment.text}
+                   for segment, digest in zip(segments, digests) if os.path.exists(self.path(digest))]
+        tmp_path = os.path.join(self.directory, f".{self.MANIFEST}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'segments': entries}, f, indent=1)
+        os.replace(tmp_path, os.path.join(self.directory, self.MANIFEST))
+        self._known = {entry['hash'] for entry in entries}
+        for name in os.listdir(self.directory):
+            if name.endswith('.wav') and name[:-len('.wav')] not in self._known:
+                os.remove(os.path.join(self.directory, name))
+
+
+def segment_digest(text: str, speaker_wav: str, language: str, model_name: str, params_key: str) -> str:
+    """
+    Hash everything that determines a segment's audio.
+
+    A reference file is identified by its contents, so re-recording it
+    invalidates the segments rendered from it; a voice ID is used as is.
+    """
+    speaker = file_digest(speaker_wav) if os.path.isfile(speaker_wav) else speaker_wav
+    payload = json.dumps([text, speaker, language, model_name, params_key])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class EpisodePipeline:
+    """
+    Renders long scripts by synthesizing segments in parallel and stitching them.
+
+    Workers are threads sharing one TextToSpeech instance; PyTorch releases
+    the GIL during inference, so segments overlap on multi-core hosts.
+    Finished segments are appended to the output as soon as every earlier
+    segment is written, so memory holds only out-of-order stragglers.
+
+    Attributes:
+        tts: TextToSpeech instance used for synthesis.
+        workers: Number of segments synthesized concurrently.
+        segment_silence: Seconds of silence between segments.
+        paragraph_silence: Seconds of silence after a paragraph.
+        max_segment_chars: Characters per segment, or None for the
+            language's XTTS character budget.
+        output_subtype: Bit depth or codec of the episode file (format default when None).
+    """
+
+    def __init__(self, tts: Optional[TextToSpeech] = None, workers: int = 2,
+                 segment_silence: float = 0.25, paragraph_silence: float = 0.75,
+                 max_segment_chars: Optional[int] = None, output_subtype: Optional[str] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            tts (Optional[TextToSpeech]): Synthesis engine; a new one is created if None.
+            workers (int): Number of concurrent synthesis workers.
+            segment_silence (float): Silence inserted between segments, in seconds.
+            paragraph_silence (float): Silence inserted after paragraphs, in seconds.
+            max_segment_chars (Optional[int]): Characters per segment; defaults
+                to the language's XTTS character budget (tts.text.char_limit).
+            output_subtype (Optional[str]): soundfile subtype of the episode,
+                e.g. 'PCM_24'. The format follows the output extension.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.logger = logging.getLogger(__name__)
+        self.tts = tts if tts is not None else TextToSpeech()
+        self.workers = workers
+        self.segment_silence = segment_silence
+        self.paragraph_silence = paragraph_silence
+        self.max_segment_chars = max_segment_chars
+        self.output_subtype = output_subtype
+
+    def render(self, script: str, speaker_wav: str, language: str, output_path: str,
+               incremental: bool = False) -> EpisodeReport:
+        """
+        Render a full script into a single audio file.
+
+        The output is written to a temporary file and moved into place only
+        if every segment succeeds, so a failed render never leaves a
+        truncated episode behind.
+
+        With incremental=True, segment audio is kept in a SegmentStore at
+        <output_path>.segments. Re-rendering a revised script synthesizes
+        only segments whose text (or voice, language, model or settings)
+        changed and re-stitches the rest from the store; the model is not
+        even loaded if nothing changed. Sentences are packed per paragraph,
+        so an edit can also re-render its paragraph neighbours.
+
+        Args:
+            script (str): Full episode script.
+            speaker_wav (str): Path to the reference audio file (.wav).
+            language (str): Language code (e.g., 'en').
+            output_path (str): Where to save the stitched episode.
+            incremental (bool): Reuse segments from the previous render of
+                this output and store the new ones.
+
+        Returns:
+            EpisodeReport: Per-segment timings and overall statistics.
+        """
+        start = time.perf_counter()
+        report = EpisodeReport(output_path=output_path)
+        segments = split_script(script, language, self.max_segment_chars)
+        if not segments:
+            self.logger.error("Episode script contains no text to synthesize.")
+            return report
+        store, digests = None, None
+        if incremental:
+            store = SegmentStore(f"{output_path}.segments")
+            model_name = self.tts.model_name or DEFAULT_MODEL_NAME
+            # Profile, reference preprocessing and post-processing change the audio too
+            params_key = self.tts._params_key(self.tts._render_params())
+            digests = [segment_digest(s.text, speaker_wav, language, model_name, params_key) for s in segments]
+        needs_model = store is None or not all(store.has(digest) for digest in digests)
+        if needs_model and not self.tts.model and not self.tts.initialize_model():
+            return report
+
+        results: Dict[int, SegmentResult] = {}
+        tmp_path = f"{output_path}.partial"
+        try:
+            results = self._synthesize_and_stitch(segments, speaker_wav, language, tmp_path, report,
+                                                  format_for_path(output_path), store, digests)
+            report.success = all(r.error is None for r in results.values())
+            if report.success:
+                os.replace(tmp_path, output_path)
+        except Exception as e:
+            self.logger.error(f"Episode render failed: {str(e)}", exc_info=True)
+            report.success = False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if store is not None:
+                store.commit(segments, digests)
+
+        report.segments = [results[i] for i in sorted(results)]
+        report.total_time = time.perf_counter() - start
+        self._log_report(report)
+        return report
+
+    def _synthesize_segment(self, segment: Segment, speaker_wav: str, language: str,
+                            store: Optional[SegmentStore] = None, digest: Optional[str] = None):
+        """Synthesize (or load from store) one segment, returning its waveform, sample rate and result."""
+        result = SegmentResult(index=segment.index, text=segment.text)
+        start = time.perf_counter()
+        try:
+            if store is not None and store.has(digest):
+                audio, sample_rate = store.load(digest)
+                result.reused = True
+            else:
+                synthesized = self.tts.synthesize(segment.text, speaker_wav, language)
+                audio, sample_rate = synthesized.samples, synthesized.sample_rate
+                if store is not None:
+                    store.save(digest, audio, sample_rate)
+            result.audio_seconds = len(audio) / float(sample_rate)
+        except Exception as e:
+            self.logger.error(f"Segment {segment.index} failed: {str(e)}")
+            audio, sample_rate = None, None
+            result.error = str(e)
+        result.synthesis_time = time.perf_counter() - start
+        return audio, sample_rate, result
+
+    def _synthesize_and_stitch(self, segments: List[Segment], speaker_wav: str, language: str,
+                               output_path: str, report: EpisodeReport, output_format: str = 'WAV',
+                               store: Optional[SegmentStore] = None,
+                               digests: Optional[List[str]] = None) -> Dict[int, SegmentResult]:
+        """Run segments on the worker pool and append them to output_path in order.
+
+        Encoding runs on a sink thread, so it overlaps with synthesis of the
+        remaining segments.
+        """
+        results: Dict[int, SegmentResult] = {}
+        pending_audio: Dict[int, np.ndarray] = {}
+        next_index = 0
+        sink = None
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='episode') as pool:
+                futures = [
+                    pool.submit(self._synthesize_segment, segment, speaker_wav, language,
+                                store, digests[segment.index] if digests else None)
+                    for segment in segments
+                ]
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    audio, sample_rate, result = future.result()
+                    results[result.index] = result
+                    if result.error is not None:
+                        # Stop queued segments; the episode cannot be completed
+                        for f in futures:
+                            f.cancel()
+                        continue
+                    pending_audio[result.index] = audio
+                    if sink is None:
+                        sink = AudioFileSink(output_path, format=output_format,
+                                             subtype=self.output_subtype)
+                    while next_index in pending_audio:
+                        segment = segments[next_index]
+                        sink.write(AudioChunk(pending_audio.pop(next_index), sample_rate, next_index))
+                        report.audio_seconds += results[next_index].audio_seconds
+                        if next_index < len(segments) - 1:
+                            pause = self.paragraph_silence if segment.ends_paragraph else self.segment_silence
+                            silence = np.zeros(int(round(pause * sample_rate)), dtype=np.float32)
+                            sink.write(AudioChunk(silence, sample_rate, next_index))
+                            report.audio_seconds += len(silence) / float(sample_rate)
+                        next_index += 1
+        finally:
+            if sink is not None:
+                sink.close()
+        return results
+
+    def _log_report(self, report: EpisodeReport) -> None:
+        failed = sum(1 for r in report.segments if r.error is not None)
+        reused = sum(1 for r in report.segments if r.reused)
+        rtf = report.real_time_factor
+        rtf_text = f"{rtf:.2f}" if rtf is not None else "n/a"
+        self.logger.info(
+            f"Episode render {'succeeded' if report.success else 'failed'}: "
+            f"{len(report.segments)} segments ({failed} failed, {reused} reused), "
+            f"{report.audio_seconds:.1f}s audio in {report.total_time:.1f}s (RTF {rtf_text})"
+        )
@@ -0,0 +1,61 @@
+"""
+Content hashing helpers for AI Voice Assistant.
+
+Reference audio files are identified by the SHA-256 of their contents so that
+caches stay valid when files are renamed and are invalidated when a file is
+re-recorded in place.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+_CHUNK_SIZE = 1 << 20  # 1 MiB reads keep memory flat for long recordings
+_MAX_MEMO_ENTRIES = 1024
+
+# path -> (mtime_ns, size, digest), least recently used first. A re-recorded
+# file replaces its entry, so the memo holds one digest per path at most.
+_digest_memo: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Return the hex SHA-256 digest of a file's contents.
+
+    The digest is memoized per path together with the file's modification
+    time and size, so repeated calls for an unchanged file only cost a
+    stat(). The memo keeps the most recently used _MAX_MEMO_ENTRIES paths.
+
+    Args:
+        file_path (str): Path to the file to hash.
+
+    Returns:
+        str: Hex-encoded SHA-256 digest.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        cached = _digest_memo.get(path)
+        if cached is not None and cached[:2] == signature:
+            _digest_memo.move_to_end(path)
+            return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(block)
+    result = digest.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[path] = signature + (result,)
+        _digest_memo.move_to_end(path)
+        while len(_digest_memo) > _MAX_MEMO_ENTRIES:
+            _digest_memo.popitem(last=False)
+    return result
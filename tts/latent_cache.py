@@ -0,0 +1,222 @@
+"""
+Speaker conditioning latent cache for AI Voice Assistant.
+
+XTTS derives a GPT conditioning latent and a speaker embedding from the
+reference audio before every synthesis call. This module caches those
+latents per reference voice so repeat synthesis skips the conditioning step:
+1. In-memory LRU tier for the hot set of voices
+2. Optional on-disk tier (.npz) that survives process restarts
+3. Hit/miss counters for monitoring
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .hashing import file_digest
+from .singleflight import SingleFlight
+
+# (gpt_cond_latent, speaker_embedding) as returned by the model
+SpeakerLatents = Tuple[Any, Any]
+
+
+def to_numpy(value: Any) -> np.ndarray:
+    """Convert a torch tensor (on any device) or array-like to a NumPy array."""
+    if hasattr(value, 'detach'):
+        value = value.detach().cpu().numpy()
+    return np.asarray(value)
+
+
+class VoiceLatentCache:
+    """
+    Two-tier cache of XTTS speaker conditioning latents.
+
+    Keys combine the SHA-256 of the reference WAV contents with the model
+    name, so the same recording is shared across paths and never reused
+    across incompatible models.
+
+    Attributes:
+        max_entries: Maximum number of voices kept in the memory tier.
+        cache_dir: Directory for the on-disk tier, or None to disable it.
+        hits: Number of lookups served from memory.
+        disk_hits: Number of lookups served from disk.
+        misses: Number of lookups that required computing the latents.
+    """
+
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Capacity of the in-memory LRU tier.
+            cache_dir (Optional[str]): Directory for persisted latents.
+                The on-disk tier is disabled when None.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, SpeakerLatents]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = SingleFlight()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(speaker_wav: str, model_name: Optional[str]) -> str:
+        """
+        Build the cache key for a reference WAV and model.
+
+        Args:
+            speaker_wav (str): Path to the reference audio file.
+            model_name (Optional[str]): Name of the model computing the latents.
+
+        Returns:
+            str: Hex digest identifying the (audio content, model) pair.
+        """
+        combined = f"{file_digest(speaker_wav)}:{model_name or ''}"
+        return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+
+    def get(self, key: str,
+            restore: Optional[Callable[[np.ndarray], Any]] = None) -> Optional[SpeakerLatents]:
+        """
+        Look up latents, checking memory first and then disk.
+
+        Args:
+            key (str): Cache key from make_key().
+            restore (Optional[Callable]): Converts each array loaded from disk
+                back into the model's tensor type before it is cached in memory.
+
+        Returns:
+            Optional[SpeakerLatents]: The cached latents, or None on a miss.
+        """
+        with self._lock:
+            latents = self._entries.get(key)
+            if latents is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return latents
+
+        latents = self._load_from_disk(key)
+        if latents is not None:
+            if restore is not None:
+                latents = (restore(latents[0]), restore(latents[1]))
+            with self._lock:
+                self.disk_hits += 1
+                self._store(key, latents)
+            return latents
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, latents: SpeakerLatents) -> None:
+        """
+        Store latents in the memory tier and, if enabled, on disk.
+
+        Args:
+            key (str): Cache key from make_key().
+            latents (SpeakerLatents): (gpt_cond_latent, speaker_embedding).
+        """
+        with self._lock:
+            self._store(key, latents)
+        if self.cache_dir:
+            self._save_to_disk(key, latents)
+
+    def get_or_compute(self, key: str, compute: Callable[[], SpeakerLatents],
+                       restore: Optional[Callable[[np.ndarray], Any]] = None) -> SpeakerLatents:
+        """
+        Return cached latents, computing and storing them on a miss.
+
+        Concurrent misses for the same key compute the latents once.
+
+        Args:
+            key (str): Cache key from make_key().
+            compute (Callable): Produces the latents when they are not cached.
+            restore (Optional[Callable]): See get().
+
+        Returns:
+            SpeakerLatents: The cached or freshly computed latents.
+        """
+        latents = self.get(key, restore=restore)
+        if latents is None:
+            def compute_and_put() -> SpeakerLatents:
+                result = compute()
+                self.put(key, result)
+                return result
+            latents, _ = self._inflight.do(key, compute_and_put)
+        return latents
+
+    def clear(self, include_disk: bool = False) -> None:
+        """
+        Drop all cached entries and reset the counters.
+
+        Args:
+            include_disk (bool): Also delete persisted latents.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if include_disk and self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters and size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _store(self, key: str, latents: SpeakerLatents) -> None:
+        """Insert into the LRU tier; caller must hold the lock."""
+        self._entries[key] = latents
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return data['gpt_cond_latent'], data['speaker_embedding']
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable latent cache entry {path}: {str(e)}")
+            return None
+
+    def _save_to_disk(self, key: str, latents: SpeakerLatents) -> None:
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, gpt_cond_latent=to_numpy(latents[0]),
+                         speaker_embedding=to_numpy(latents[1]))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Failed to persist speaker latents to {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
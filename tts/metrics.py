@@ -0,0 +1,358 @@
+"""
+Pipeline instrumentation for AI Voice Assistant.
+
+TextToSpeech reports every pipeline stage (validation, model init, speaker
+conditioning, inference and file write) through a Metrics object:
+1. Stage latencies are recorded in histograms, failures in counters
+2. In-flight requests are tracked with a gauge
+3. Audio seconds produced and request outcomes are counted
+4. Collectors are pluggable; MetricsRegistry keeps values in process and
+   renders them in the Prometheus text exposition format
+5. Hook callbacks receive a StageEvent for every completed stage
+
+Instrumentation is off by default: the shared NULL_METRICS object turns every
+call into a no-op without reading the clock.
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_DURATION = 'tts_stage_duration_seconds'
+STAGE_FAILURES = 'tts_stage_failures_total'
+REQUESTS = 'tts_requests_total'
+INFLIGHT = 'tts_inflight_requests'
+AUDIO_SECONDS = 'tts_audio_seconds_total'
+
+_HELP = {
+    STAGE_DURATION: 'Time spent in each synthesis pipeline stage.',
+    STAGE_FAILURES: 'Pipeline stages that raised an error.',
+    REQUESTS: 'Synthesis requests by outcome.',
+    INFLIGHT: 'Synthesis requests currently running.',
+    AUDIO_SECONDS: 'Seconds of audio produced.',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class StageEvent:
+    """
+    A completed pipeline stage, as passed to hook callbacks.
+
+    Attributes:
+        stage: Stage name (e.g. 'inference').
+        duration: Wall-clock seconds spent in the stage.
+        success: False if the stage raised.
+        labels: Extra context such as the language.
+    """
+    stage: str
+    duration: float
+    success: bool = True
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """
+    In-process collector of counters, gauges and histograms.
+
+    Series are identified by metric name and label values. All methods are
+    thread-safe.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (Iterable[float]): Upper bounds of the histogram buckets in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+        """Add value to a counter."""
+        key = _label_key(labels or {})
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def add(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Add value (which may be negative) to a gauge."""
+        key = _label_key(labels or {})
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record a value in a histogram."""
+        key = _label_key(labels or {})
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """
+        Return the current value of a counter or gauge, or a histogram's count.
+
+        Returns:
+            float: The value, or 0.0 if the series has not been recorded.
+        """
+        key = _label_key(labels or {})
+        with self._lock:
+            if name in self._histograms:
+                histogram = self._histograms[name].get(key)
+                return float(histogram.count) if histogram else 0.0
+            for store in (self._counters, self._gauges):
+                if name in store:
+                    return store[name].get(key, 0.0)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Return a copy of every series.
+
+        Returns:
+            Dict[str, Dict]: {'counters', 'gauges', 'histograms'}, each mapping
+            metric name to {label key: value}. Histogram values are
+            {'count', 'sum', 'buckets'}.
+        """
+        with self._lock:
+            return {
+                'counters': {n: dict(s) for n, s in self._counters.items()},
+                'gauges': {n: dict(s) for n, s in self._gauges.items()},
+                'histograms': {
+                    n: {k: {'count': h.count, 'sum': h.sum,
+                            'buckets': dict(zip(h.buckets, h.counts))}
+                        for k, h in s.items()}
+                    for n, s in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Render all series in the Prometheus text exposition format (v0.0.4).
+
+        Returns:
+            str: The exposition text, ending with a newline.
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for kind, type_name in (('counters', 'counter'), ('gauges', 'gauge')):
+            for name in sorted(snapshot[kind]):
+                _append_header(lines, name, type_name)
+                for key, value in sorted(snapshot[kind][name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name in sorted(snapshot['histograms']):
+            _append_header(lines, name, 'histogram')
+            for key, histogram in sorted(snapshot['histograms'][name].items()):
+                for bound, count in histogram['buckets'].items():
+                    bucket_key = key + (('le', _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_key)} {count}")
+                inf_key = key + (('le', '+Inf'),)
+                lines.append(f"{name}_bucket{_format_labels(inf_key)} {histogram['count']}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram['sum'])}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram['count']}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _append_header(lines: List[str], name: str, type_name: str) -> None:
+    if name in _HELP:
+        lines.append(f"# HELP {name} {_HELP[name]}")
+    lines.append(f"# TYPE {name} {type_name}")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    escaped = (v.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') for _, v in key)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(key, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _StageTimer:
+    """Context manager timing one stage for an enabled Metrics instance."""
+
+    __slots__ = ('metrics', 'stage', 'labels', 'start')
+
+    def __init__(self, metrics: 'Metrics', stage: str, labels: Dict[str, str]):
+        self.metrics = metrics
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self) -> '_StageTimer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.metrics.observe_stage(self.stage, time.perf_counter() - self.start,
+                                   success=exc_type is None, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Instrumentation front end used by the synthesis pipeline.
+
+    Every measurement is forwarded to each collector, so a MetricsRegistry can
+    sit alongside any object with the same inc/add/observe methods (e.g. an
+    adapter for a StatsD or OpenTelemetry client).
+
+    Attributes:
+        registry: The default in-process collector.
+        collectors: All collectors receiving measurements, registry first.
+        hooks: Callbacks invoked with a StageEvent after every stage.
+        enabled: Always True; NullMetrics sets it to False.
+    """
+
+    enabled = True
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 collectors: Iterable = (),
+                 hooks: Iterable[Callable[[StageEvent], None]] = ()):
+        """
+        Args:
+            registry (Optional[MetricsRegistry]): In-process collector. A new
+                one is created when None.
+            collectors (Iterable): Additional collectors.
+            hooks (Iterable[Callable[[StageEvent], None]]): Stage callbacks.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.collectors = [self.registry] + list(collectors)
+        self.hooks: List[Callable[[StageEvent], None]] = list(hooks)
+
+    def add_hook(self, hook: Callable[[StageEvent], None]) -> None:
+        """Register a callback invoked with a StageEvent after every stage."""
+        self.hooks.append(hook)
+
+    def stage(self, name: str, **labels: str):
+        """
+        Time a pipeline stage.
+
+        Usage: ``with metrics.stage('inference', language='en'): ...``
+
+        Args:
+            name (str): Stage name.
+            **labels: Extra labels recorded with the measurement.
+
+        Returns:
+            A context manager recording the stage's duration and outcome.
+        """
+        return _StageTimer(self, name, labels)
+
+    def observe_stage(self, name: str, duration: float, success: bool = True, **labels: str) -> None:
+        """Record an already measured stage duration and notify hooks."""
+        series = dict(labels, stage=name)
+        for collector in self.collectors:
+            collector.observe(STAGE_DURATION, duration, series)
+            if not success:
+                collector.inc(STAGE_FAILURES, 1, series)
+        if self.hooks:
+            event = StageEvent(stage=name, duration=duration, success=success, labels=labels)
+            for hook in self.hooks:
+                try:
+                    hook(event)
+                except Exception as e:
+                    self.logger.warning(f"Metrics hook failed: {str(e)}")
+
+    def count_request(self, success: bool) -> None:
+        """Count a finished synthesis request by outcome."""
+        labels = {'status': 'success' if success else 'failure'}
+        for collector in self.collectors:
+            collector.inc(REQUESTS, 1, labels)
+
+    def add_audio_seconds(self, seconds: float) -> None:
+        """Count seconds of audio produced."""
+        for collector in self.collectors:
+            collector.inc(AUDIO_SECONDS, seconds)
+
+    def track_inflight(self, delta: int) -> None:
+        """Adjust the in-flight request gauge by delta."""
+        for collector in self.collectors:
+            collector.add(INFLIGHT, delta)
+
+
+class NullMetrics(Metrics):
+    """Disabled instrumentation: every method is a no-op."""
+
+    enabled = False
+
+    def __init__(self):
+        self.registry = None
+        self.collectors = []
+        self.hooks = []
+
+    def add_hook(self, hook: Callable[[StageEvent], None]) -> None:
+        raise RuntimeError("Cannot add hooks to disabled metrics; pass a Metrics instance instead.")
+
+    def stage(self, name: str, **labels: str):
+        return _NULL_TIMER
+
+    def observe_stage(self, name: str, duration: float, success: bool = True, **labels: str) -> None:
+        pass
+
+    def count_request(self, success: bool) -> None:
+        pass
+
+    def add_audio_seconds(self, seconds: float) -> None:
+        pass
+
+    def track_inflight(self, delta: int) -> None:
+        pass
+
+
+NULL_METRICS = NullMetrics()
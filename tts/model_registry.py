@@ -0,0 +1,283 @@
+"""
+Process-wide model manager for AI Voice Assistant.
+
+XTTS takes several GB of memory and tens of seconds to load. Without a
+registry, every TextToSpeech or VoiceCloning instance loads its own copy,
+and every variant (default and quantized, per-language fine-tunes) stays
+resident forever. The registry lets instances share models and bounds what
+stays loaded:
+1. One loaded model per (model name, loader, profile) key
+2. Concurrent requests for the same key load it exactly once; different
+   keys load in parallel
+3. Each model's memory footprint is estimated when it loads
+4. Least recently used models are evicted to stay within a byte budget,
+   and models idle for longer than idle_seconds are unloaded
+5. Engines fetch their model through the registry on use, so an evicted
+   model is transparently reloaded on its next request
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def estimate_model_bytes(model: Any) -> Optional[int]:
+    """
+    Estimate a model's memory from its parameters and buffers.
+
+    Returns:
+        Optional[int]: Bytes held by the torch module inside model, or None
+        if it exposes no parameters (e.g. the stub backend).
+    """
+    synthesizer = getattr(model, 'synthesizer', None)
+    module = getattr(synthesizer, 'tts_model', model)
+    if not hasattr(module, 'parameters'):
+        return None
+    tensors = list(module.parameters()) + list(getattr(module, 'buffers', lambda: [])())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+@dataclass
+class LoadedModel:
+    """
+    A model ready for inference, with what loading it produced.
+
+    Attributes:
+        model: The loaded model (a Coqui TTS instance or factory product).
+        device: Device the model runs on.
+        model_name: Name the model was loaded by.
+        profile_report: Settings the inference profile applied, if any.
+        load_report: Seconds spent in each loading phase, plus 'total'.
+        size_bytes: Estimated memory footprint, set by the registry.
+        last_used: time.monotonic() of the last request for the model.
+    """
+    model: Any
+    device: str
+    model_name: str
+    profile_report: Optional[Dict[str, Any]] = None
+    load_report: Dict[str, float] = field(default_factory=dict)
+    size_bytes: int = 0
+    last_used: float = 0.0
+
+
+class ModelRegistry:
+    """
+    Thread-safe map from model keys to loaded models, with eviction.
+
+    Footprints are estimated from parameter sizes, falling back to the
+    growth in process RSS while the model loaded. Evicted models are freed
+    once in-flight requests holding them finish. Failed loads are not
+    cached, so a later request retries.
+
+    Attributes:
+        max_bytes: Budget for the summed model footprints, or None for no limit.
+        idle_seconds: Unload models unused for this long, or None to keep them.
+        loads: Number of models loaded (including reloads).
+        reloads: Number of loads of a previously evicted model.
+        hits: Number of initializations served by an already loaded model.
+        evictions: Number of models evicted (budget or idle).
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, idle_seconds: Optional[float] = None,
+                 size_estimator: Callable[[Any], Optional[int]] = estimate_model_bytes):
+        """
+        Args:
+            max_bytes (Optional[int]): Memory budget for loaded models. The
+                most recently used model is always kept, even if it alone
+                exceeds the budget.
+            idle_seconds (Optional[float]): Idle time after which a model is
+                unloaded; a background thread checks periodically.
+            size_estimator (Callable): Returns a model's footprint in bytes,
+                or None to fall back to the RSS growth during loading.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.size_estimator = size_estimator
+        self.loads = 0
+        self.reloads = 0
+        self.hits = 0
+        self.evictions = 0
+        self._models: "OrderedDict[Hashable, LoadedModel]" = OrderedDict()
+        self._evicted_sizes: Dict[Hashable, int] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if idle_seconds is not None:
+            interval = min(max(idle_seconds / 2.0, 0.05), 60.0)
+            threading.Thread(target=self._reap, args=(interval,), name='model-reaper', daemon=True).start()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], LoadedModel]) -> LoadedModel:
+        """
+        Return the model for key, loading it on first use.
+
+        Args:
+            key (Hashable): Identifies the model and how it was loaded.
+            load (Callable): Loads the model; called at most once per key
+                until it succeeds.
+
+        Returns:
+            LoadedModel: The shared model.
+        """
+        return self._get(key, load, count_hit=True)
+
+    def use(self, key: Hashable, load: Callable[[], LoadedModel]) -> LoadedModel:
+        """
+        Return the model for key for a request, reloading it if it was evicted.
+
+        Unlike get_or_load() this does not count as a hit; it marks the model
+        as recently used.
+        """
+        return self._get(key, load, count_hit=False)
+
+    def evict_idle(self) -> int:
+        """
+        Unload models unused for longer than idle_seconds.
+
+        Returns:
+            int: Number of models evicted.
+        """
+        if self.idle_seconds is None:
+            return 0
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [k for k, m in self._models.items() if m.last_used < cutoff]
+            for key in idle:
+                self._evict(key, 'idle')
+        if idle:
+            gc.collect()
+        return len(idle)
+
+    def remove(self, key: Hashable) -> bool:
+        """
+        Drop a model from the registry.
+
+        Instances already holding it keep working; new instances load afresh.
+
+        Returns:
+            bool: True if the key was registered.
+        """
+        with self._lock:
+            self._key_locks.pop(key, None)
+            self._evicted_sizes.pop(key, None)
+            return self._models.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop every model and reset the counters."""
+        with self._lock:
+            self._models.clear()
+            self._evicted_sizes.clear()
+            self._key_locks.clear()
+            self.loads = 0
+            self.reloads = 0
+            self.hits = 0
+            self.evictions = 0
+
+    def close(self) -> None:
+        """Stop the idle eviction thread."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the registry counters and resident footprint."""
+        with self._lock:
+            return {
+                'models': len(self._models),
+                'bytes': sum(m.size_bytes for m in self._models.values()),
+                'loads': self.loads,
+                'reloads': self.reloads,
+                'hits': self.hits,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def _get(self, key: Hashable, load: Callable[[], LoadedModel], count_hit: bool) -> LoadedModel:
+        loaded = self._lookup(key, count_hit)
+        if loaded is not None:
+            return loaded
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            loaded = self._lookup(key, count_hit)
+            if loaded is not None:
+                # Loaded by another thread while this one waited
+                return loaded
+            with self._lock:
+                # Make room first when the footprint is known from a previous load
+                self._enforce_budget(incoming=self._evicted_sizes.get(key, 0))
+            rss_before = current_rss_bytes()
+            loaded = load()
+            size = self.size_estimator(loaded.model)
+            if size is None:
+                rss_after = current_rss_bytes()
+                size = max(0, rss_after - rss_before) if rss_before is not None and rss_after is not None else 0
+            loaded.size_bytes = size
+            loaded.last_used = time.monotonic()
+            with self._lock:
+                if self._evicted_sizes.pop(key, None) is not None:
+                    self.reloads += 1
+                self._models[key] = loaded
+                self.loads += 1
+                self._enforce_budget()
+        self.logger.info(f"Registered shared model '{loaded.model_name}' ({size / 2 ** 20:.0f} MiB)")
+        return loaded
+
+    def _lookup(self, key: Hashable, count_hit: bool) -> Optional[LoadedModel]:
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is not None:
+                self._models.move_to_end(key)
+                loaded.last_used = time.monotonic()
+                if count_hit:
+                    self.hits += 1
+            return loaded
+
+    def _enforce_budget(self, incoming: int = 0) -> None:
+        """Evict least recently used models over the budget; caller must hold the lock."""
+        if self.max_bytes is None:
+            return
+        total = sum(m.size_bytes for m in self._models.values()) + incoming
+        # The most recently used model is kept even if it alone is over budget
+        while total > self.max_bytes and len(self._models) > (0 if incoming else 1):
+            key = next(iter(self._models))
+            total -= self._models[key].size_bytes
+            self._evict(key, 'memory budget')
+
+    def _evict(self, key: Hashable, reason: str) -> None:
+        """Drop a model, remembering its size for reloads; caller must hold the lock."""
+        loaded = self._models.pop(key)
+        self._evicted_sizes[key] = loaded.size_bytes
+        self.evictions += 1
+        self.logger.info(f"Evicted model '{loaded.model_name}' ({reason})")
+
+    def _reap(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                self.logger.error(f"Idle model eviction failed: {str(e)}")
+
+
+# Opt-in registry shared by every engine in the process
+SHARED_MODELS = ModelRegistry()
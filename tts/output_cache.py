@@ -0,0 +1,217 @@
+"""
+Content-addressed cache of synthesized audio for AI Voice Assistant.
+
+Recurring phrases (intros, outros, sponsor reads) are re-synthesized every
+episode. This module stores rendered audio on disk keyed by everything that
+affects the output, so repeats are served by a file copy or hard link:
+1. Keys hash normalized text, speaker audio, language, model and parameters
+2. Entries are evicted least-recently-used against a byte budget
+3. Hit/miss/eviction counters are exposed via stats()
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .hashing import file_digest
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: Unicode NFC and collapsed whitespace."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class AudioOutputCache:
+    """
+    Disk cache of rendered audio files with LRU eviction by total size.
+
+    Recency is persisted through file modification times, so the LRU order
+    survives restarts. Served files are copied by default; with
+    hardlink=True they are hard-linked instead, which is near-instant but
+    means the caller must not modify the output file in place.
+
+    Attributes:
+        cache_dir: Directory holding cached audio files.
+        max_bytes: Byte budget for all cached files.
+        hardlink: Serve hits by hard-linking instead of copying.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1 << 30, hardlink: bool = False):
+        """
+        Initialize the cache, indexing any entries already on disk.
+
+        Args:
+            cache_dir (str): Directory for cached audio.
+            max_bytes (int): Maximum total size of cached audio.
+            hardlink (bool): Serve hits by hard-linking when possible.
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hardlink = hardlink
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, LRU first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, speaker_wav: str, language: str, model_name: Optional[str],
+                 params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a synthesis request.
+
+        Args:
+            text (str): Text to synthesize; normalized before hashing.
+            speaker_wav (str): Reference audio path; its contents are hashed.
+            language (str): Language code.
+            model_name (Optional[str]): Model producing the audio.
+            params (Optional[Dict[str, Any]]): Generation parameters (JSON-serializable).
+
+        Returns:
+            str: Hex digest identifying the rendered output.
+        """
+        payload = json.dumps({
+            'text': normalize_text(text),
+            'speaker': file_digest(speaker_wav),
+            'language': language,
+            'model': model_name or '',
+            'params': params or {},
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """
+        Place the cached audio for key at output_path.
+
+        Args:
+            key (str): Cache key from make_key().
+            output_path (str): Destination for the audio file.
+
+        Returns:
+            bool: True on a hit, False if the key is not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = self._path(key)
+        try:
+            os.utime(path)  # persist recency for the next process
+            self._place(path, output_path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Dropping unusable audio cache entry {path}: {str(e)}")
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+                self._forget(key)
+            return False
+
+    def store(self, key: str, source_path: str) -> None:
+        """
+        Add a rendered file to the cache and evict to stay within budget.
+
+        Args:
+            key (str): Cache key from make_key().
+            source_path (str): Rendered audio file to cache.
+        """
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            self.logger.info(f"Not caching {source_path}: {size} bytes exceeds the cache budget")
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to cache rendered audio {source_path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._forget(key, remove_file=False)
+            self._entries[key] = size
+            self._total_bytes += size
+            self.stores += 1
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached file and reset the counters."""
+        with self._lock:
+            for key in list(self._entries):
+                self._forget(key)
+            self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters and size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.audio")
+
+    def _place(self, cached_path: str, output_path: str) -> None:
+        if self.hardlink:
+            try:
+                if os.path.lexists(output_path):
+                    os.remove(output_path)
+                os.link(cached_path, output_path)
+                return
+            except OSError:
+                pass  # e.g. different filesystem; fall back to a copy
+        shutil.copyfile(cached_path, output_path)
+
+    def _load_index(self) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.audio'):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime_ns, name[:-len('.audio')], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _forget(self, key: str, remove_file: bool = True) -> None:
+        """Drop key from the index; caller must hold the lock."""
+        size = self._entries.pop(key, None)
+        if size is None:
+            return
+        self._total_bytes -= size
+        if remove_file:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        """Evict least recently used entries; caller must hold the lock."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._forget(key)
+            self.evictions += 1
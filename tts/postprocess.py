@@ -0,0 +1,410 @@
+"""
+Block-wise audio post-processing for AI Voice Assistant.
+
+Synthesized audio used to be normalized, trimmed and joined by external
+tools, costing a full decode/encode pass per file. This module does the
+same work on in-memory NumPy blocks as they stream out of the model:
+1. Equal-power crossfades between consecutive segments
+2. Trimming of leading and trailing silence
+3. Optional streaming resampling (soxr)
+4. Integrated loudness measurement (ITU-R BS.1770 K-weighting and gating)
+5. Loudness normalization with a peak ceiling, applied block-wise while a
+   float intermediate is encoded to the output format, so lossy formats
+   are still encoded only once
+
+Every stage holds at most a crossfade, a trailing-silence window or a
+resampler delay line in memory, so hour-long episodes are processed with a
+bounded buffer.
+"""
+
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from .audio import AudioChunk
+from .sinks import default_subtype, format_for_path
+
+BLOCK_FRAMES = 65536  # frames per block when rewriting a file
+_ABSOLUTE_GATE_LUFS = -70.0
+_RELATIVE_GATE_LU = -10.0
+
+
+@dataclass(frozen=True)
+class PostProcessSettings:
+    """
+    Post-processing options; None or 0 disables a stage.
+
+    Attributes:
+        crossfade_seconds: Equal-power crossfade between consecutive segments.
+        trim_dbfs: Leading and trailing audio quieter than this is trimmed.
+        max_trailing_seconds: Longest trailing silence that can be trimmed;
+            bounds the buffer held while waiting to see if silence is trailing.
+        target_lufs: Integrated loudness to normalize file output to.
+        peak_dbfs: Sample peak ceiling when normalizing.
+        sample_rate: Resample output to this rate.
+    """
+    crossfade_seconds: float = 0.0
+    trim_dbfs: Optional[float] = -50.0
+    max_trailing_seconds: float = 2.0
+    target_lufs: Optional[float] = -16.0
+    peak_dbfs: float = -1.0
+    sample_rate: Optional[int] = None
+
+
+def _biquad(kind: str, gain_db: float, q: float, fc: float, rate: int) -> List[float]:
+    """Second-order section for the BS.1770 K-weighting filters at any rate."""
+    a = 10 ** (gain_db / 40.0)
+    w0 = 2.0 * math.pi * fc / rate
+    alpha = math.sin(w0) / (2.0 * q)
+    cos_w0 = math.cos(w0)
+    if kind == 'high_shelf':
+        sqrt_a = math.sqrt(a)
+        b = [a * ((a + 1) + (a - 1) * cos_w0 + 2 * sqrt_a * alpha),
+             -2 * a * ((a - 1) + (a + 1) * cos_w0),
+             a * ((a + 1) + (a - 1) * cos_w0 - 2 * sqrt_a * alpha)]
+        den = [(a + 1) - (a - 1) * cos_w0 + 2 * sqrt_a * alpha,
+               2 * ((a - 1) - (a + 1) * cos_w0),
+               (a + 1) - (a - 1) * cos_w0 - 2 * sqrt_a * alpha]
+    else:
+        b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+        den = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    return [b[0] / den[0], b[1] / den[0], b[2] / den[0], 1.0, den[1] / den[0], den[2] / den[0]]
+
+
+def k_weighting_sos(rate: int) -> np.ndarray:
+    """Return the BS.1770 K-weighting filter as second-order sections."""
+    return np.array([
+        _biquad('high_shelf', 4.0, 1 / math.sqrt(2), 1500.0, rate),
+        _biquad('high_pass', 0.0, 0.5, 38.0, rate),
+    ])
+
+
+class LoudnessMeter:
+    """
+    Streaming integrated-loudness meter (BS.1770, mono).
+
+    Audio is K-weighted with persistent filter state and reduced to one
+    mean-square value per 100 ms, so memory grows by one float per 100 ms of
+    audio rather than with the audio itself.
+
+    Attributes:
+        sample_rate: Rate of the measured audio.
+        peak: Largest absolute sample seen.
+    """
+
+    def __init__(self, sample_rate: int):
+        from scipy.signal import sosfilt  # deferred: scipy is slow to import
+        self._sosfilt = sosfilt
+        self.sample_rate = sample_rate
+        self.peak = 0.0
+        self._sos = k_weighting_sos(sample_rate)
+        self._zi = np.zeros((len(self._sos), 2))
+        self._step = max(1, sample_rate // 10)
+        self._partial = np.zeros(0, dtype=np.float64)
+        self._energies: List[float] = []
+
+    def feed(self, samples: np.ndarray) -> None:
+        """Add a block of mono samples to the measurement."""
+        if not len(samples):
+            return
+        self.peak = max(self.peak, float(np.max(np.abs(samples))))
+        weighted, self._zi = self._sosfilt(self._sos, samples.astype(np.float64), zi=self._zi)
+        data = np.concatenate([self._partial, weighted ** 2])
+        whole = len(data) // self._step * self._step
+        if whole:
+            self._energies.extend(data[:whole].reshape(-1, self._step).mean(axis=1).tolist())
+        self._partial = data[whole:]
+
+    def integrated_lufs(self) -> Optional[float]:
+        """
+        Return the gated integrated loudness in LUFS.
+
+        Returns:
+            Optional[float]: Loudness, or None if the audio is shorter than
+            400 ms or entirely below the absolute gate.
+        """
+        energies = np.asarray(self._energies)
+        if len(energies) < 4:
+            return None
+        # 400 ms windows with 75% overlap, built from 100 ms sub-blocks
+        windows = np.convolve(energies, np.full(4, 0.25), mode='valid')
+        with np.errstate(divide='ignore'):
+            loudness = -0.691 + 10 * np.log10(windows)
+        gated = windows[loudness > _ABSOLUTE_GATE_LUFS]
+        if not len(gated):
+            return None
+        relative_gate = -0.691 + 10 * np.log10(gated.mean()) + _RELATIVE_GATE_LU
+        with np.errstate(divide='ignore'):
+            gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+        return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def loudness_gain(meter: LoudnessMeter, target_lufs: float, peak_dbfs: float) -> float:
+    """
+    Return the linear gain that brings metered audio to target_lufs.
+
+    The gain is reduced if needed so the peak stays below peak_dbfs.
+    """
+    loudness = meter.integrated_lufs()
+    if loudness is None or meter.peak <= 0:
+        return 1.0
+    gain = 10 ** ((target_lufs - loudness) / 20)
+    return min(gain, 10 ** (peak_dbfs / 20) / meter.peak)
+
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_lufs: float = -16.0,
+                       peak_dbfs: float = -1.0) -> np.ndarray:
+    """
+    Normalize an in-memory waveform to target_lufs with a peak ceiling.
+
+    Args:
+        samples (np.ndarray): Mono float samples.
+        sample_rate (int): Sample rate of samples.
+        target_lufs (float): Desired integrated loudness.
+        peak_dbfs (float): Sample peak ceiling.
+
+    Returns:
+        np.ndarray: Scaled float32 samples.
+    """
+    meter = LoudnessMeter(sample_rate)
+    for start in range(0, len(samples), BLOCK_FRAMES):
+        meter.feed(samples[start:start + BLOCK_FRAMES])
+    return (samples * loudness_gain(meter, target_lufs, peak_dbfs)).astype(np.float32)
+
+
+def crossfade(blocks: Iterable[np.ndarray], fade_samples: int) -> Iterator[np.ndarray]:
+    """
+    Join consecutive segments with an equal-power crossfade.
+
+    The last fade_samples of each segment are held back and mixed with the
+    start of the next (cos/sin gain curves keep perceived loudness constant).
+    Fades shrink to fit segments shorter than fade_samples.
+
+    Args:
+        blocks (Iterable[np.ndarray]): Segments in order.
+        fade_samples (int): Overlap length in samples.
+
+    Yields:
+        np.ndarray: The joined audio, as blocks.
+    """
+    tail = None
+    for block in blocks:
+        if tail is None:
+            split = max(0, len(block) - fade_samples)
+            head_out, tail = block[:split], block[split:]
+            if len(head_out):
+                yield head_out
+            continue
+        n = min(len(tail), len(block))
+        theta = np.linspace(0.0, np.pi / 2, n, dtype=np.float32)
+        mixed = tail[len(tail) - n:] * np.cos(theta) + block[:n] * np.sin(theta)
+        out = np.concatenate([tail[:len(tail) - n], mixed])
+        rest = block[n:]
+        keep = min(fade_samples, len(rest))
+        out = np.concatenate([out, rest[:len(rest) - keep]])
+        tail = rest[len(rest) - keep:]
+        if len(out):
+            yield out
+    if tail is not None and len(tail):
+        yield tail
+
+
+def trim_edges(blocks: Iterable[np.ndarray], threshold: float,
+               max_trailing_samples: int) -> Iterator[np.ndarray]:
+    """
+    Drop leading and trailing samples whose magnitude is below threshold.
+
+    Quiet audio is held back until louder audio follows (it is interior and
+    is emitted) or the stream ends (it is trailing and is dropped). At most
+    max_trailing_samples are held; older quiet audio is emitted.
+
+    Args:
+        blocks (Iterable[np.ndarray]): Audio blocks in order.
+        threshold (float): Linear amplitude below which audio is silent.
+        max_trailing_samples (int): Largest trailing silence that is trimmed.
+
+    Yields:
+        np.ndarray: The trimmed audio, as blocks.
+    """
+    started = False
+    held: List[np.ndarray] = []
+    held_samples = 0
+    for block in blocks:
+        loud = np.flatnonzero(np.abs(block) >= threshold)
+        if not started:
+            if not len(loud):
+                continue
+            started = True
+            block = block[loud[0]:]
+            loud = loud - loud[0]
+        if len(loud):
+            yield from held
+            held, held_samples = [], 0
+            yield block[:loud[-1] + 1]
+            block = block[loud[-1] + 1:]
+        if len(block):
+            held.append(block)
+            held_samples += len(block)
+        while held and held_samples - len(held[0]) >= max_trailing_samples:
+            held_samples -= len(held[0])
+            yield held.pop(0)
+
+
+def resample_stream(blocks: Iterable[np.ndarray], in_rate: int, out_rate: int) -> Iterator[np.ndarray]:
+    """
+    Resample a stream of blocks without edge artifacts between blocks.
+
+    Args:
+        blocks (Iterable[np.ndarray]): Mono float32 audio at in_rate.
+        in_rate (int): Input sample rate.
+        out_rate (int): Output sample rate.
+
+    Yields:
+        np.ndarray: Audio at out_rate.
+    """
+    import soxr  # installed with librosa; deferred like other audio backends
+    stream = soxr.ResampleStream(in_rate, out_rate, 1, dtype='float32')
+    for block in blocks:
+        out = stream.resample_chunk(np.ascontiguousarray(block, dtype=np.float32))
+        if len(out):
+            yield out
+    out = stream.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+    if len(out):
+        yield out
+
+
+class PostProcessor:
+    """
+    One post-processing run over a stream of audio chunks.
+
+    process() applies the streaming stages (crossfade, trim, resample) and
+    meters loudness on the way through. Loudness normalization needs the
+    integrated loudness of the whole stream, so the stream is written to a
+    float intermediate and finalize_file() applies the gain while encoding
+    it to the output.
+
+    Attributes:
+        settings: Options for this run.
+        meter: Loudness meter of the processed output, once process() starts.
+    """
+
+    def __init__(self, settings: Optional[PostProcessSettings] = None):
+        self.logger = logging.getLogger(__name__)
+        self.settings = settings or PostProcessSettings()
+        self.meter: Optional[LoudnessMeter] = None
+
+    def process(self, chunks: Iterable[AudioChunk]) -> Iterator[AudioChunk]:
+        """
+        Apply the streaming stages to chunks.
+
+        Args:
+            chunks (Iterable[AudioChunk]): Segments in order, all at one sample rate.
+
+        Yields:
+            AudioChunk: Processed audio at the output sample rate.
+        """
+        iterator = iter(chunks)
+        first = next(iterator, None)
+        if first is None:
+            return
+        in_rate = first.sample_rate
+        out_rate = self.settings.sample_rate or in_rate
+
+        def samples() -> Iterator[np.ndarray]:
+            yield first.samples
+            for chunk in iterator:
+                yield chunk.samples
+
+        blocks: Iterable[np.ndarray] = samples()
+        if self.settings.crossfade_seconds > 0:
+            blocks = crossfade(blocks, int(self.settings.crossfade_seconds * in_rate))
+        if self.settings.trim_dbfs is not None:
+            blocks = trim_edges(blocks, 10 ** (self.settings.trim_dbfs / 20),
+                                int(self.settings.max_trailing_seconds * in_rate))
+        if out_rate != in_rate:
+            blocks = resample_stream(blocks, in_rate, out_rate)
+
+        self.meter = LoudnessMeter(out_rate)
+        for index, block in enumerate(blocks):
+            self.meter.feed(block)
+            yield AudioChunk(samples=block, sample_rate=out_rate, index=index)
+
+    @property
+    def normalizes(self) -> bool:
+        """Whether finalize_file() normalizes loudness."""
+        return self.settings.target_lufs is not None
+
+    def finalize_file(self, path: str, output_path: Optional[str] = None,
+                      format: Optional[str] = None, subtype: Optional[str] = None) -> float:
+        """
+        Normalize the loudness of a file written from process() output.
+
+        Args:
+            path (str): The written file; a lossless (ideally float)
+                intermediate when output_path is given.
+            output_path (Optional[str]): Where to encode the normalized
+                audio, once; path is rewritten in place when None.
+            format (Optional[str]): Container format of output_path;
+                inferred from its extension when None.
+            subtype (Optional[str]): Subtype of output_path; the format
+                default when None.
+
+        Returns:
+            float: The gain applied (1.0 if normalization is disabled or
+            the audio is too short or quiet to measure).
+        """
+        gain = 1.0
+        if self.normalizes and self.meter is not None:
+            gain = loudness_gain(self.meter, self.settings.target_lufs, self.settings.peak_dbfs)
+            if abs(gain - 1.0) < 1e-3:
+                gain = 1.0
+        if output_path is not None and output_path != path:
+            apply_gain(path, gain, output_path=output_path, format=format, subtype=subtype)
+        elif gain != 1.0:
+            apply_gain(path, gain)
+        if gain != 1.0:
+            self.logger.info(f"Normalized {output_path or path} from {self.meter.integrated_lufs():.1f} LUFS "
+                             f"(gain {20 * math.log10(gain):+.1f} dB)")
+        return gain
+
+
+def apply_gain(path: str, gain: float, block_frames: int = BLOCK_FRAMES,
+               output_path: Optional[str] = None, format: Optional[str] = None,
+               subtype: Optional[str] = None) -> None:
+    """
+    Scale an audio file block by block, in place or into a new file.
+
+    Args:
+        path (str): File to read.
+        gain (float): Linear gain.
+        block_frames (int): Frames read and written at a time.
+        output_path (Optional[str]): File to write; path is rewritten in
+            place, keeping its format, when None.
+        format (Optional[str]): Container format of output_path; inferred
+            from its extension when None.
+        subtype (Optional[str]): Subtype of output_path; the format default
+            when None.
+    """
+    info = sf.info(path)
+    if output_path is None:
+        output_path, format, subtype = path, info.format, info.subtype
+    else:
+        format = format or format_for_path(output_path)
+        subtype = subtype or default_subtype(format, output_path)
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with sf.SoundFile(tmp_path, mode='w', samplerate=info.samplerate, channels=info.channels,
+                          format=format, subtype=subtype) as out:
+            for block in sf.blocks(path, blocksize=block_frames, dtype='float32'):
+                out.write(np.clip(block * gain, -1.0, 1.0))
+        # Replacing also breaks any hard link to an output cache entry
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,215 @@
+"""
+CPU inference profiles for AI Voice Assistant.
+
+An InferenceProfile tunes how the loaded model runs on the host:
+1. Intra-op and inter-op thread counts for torch
+2. Generation under torch.inference_mode
+3. Optional dynamic int8 quantization of the GPT and decoder linear layers
+4. Optional bfloat16 autocast where the CPU supports it
+
+apply_profile() reports the settings that actually took effect, since torch
+silently keeps its inter-op thread count once parallel work has started and
+bf16 is not available on every CPU.
+"""
+
+import contextlib
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Submodules of the Coqui Xtts model whose linear layers are quantized
+QUANTIZE_MODULES = ('gpt', 'hifigan_decoder')
+
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """
+    Performance settings applied when the model is initialized.
+
+    Attributes:
+        name: Profile name reported with the applied settings.
+        num_threads: Intra-op threads, or None to keep torch's default.
+        num_interop_threads: Inter-op threads, or None to keep torch's default.
+        inference_mode: Run generation under torch.inference_mode.
+        quantize_int8: Dynamically quantize linear layers to int8 (CPU only).
+        bf16: Run generation under bfloat16 autocast if the CPU supports it.
+    """
+    name: str = 'custom'
+    num_threads: Optional[int] = None
+    num_interop_threads: Optional[int] = None
+    inference_mode: bool = True
+    quantize_int8: bool = False
+    bf16: bool = False
+
+
+PROFILES: Dict[str, InferenceProfile] = {
+    'default': InferenceProfile(name='default', inference_mode=False),
+    'cpu': InferenceProfile(name='cpu', num_threads=os.cpu_count(), num_interop_threads=1),
+    'cpu_int8': InferenceProfile(name='cpu_int8', num_threads=os.cpu_count(),
+                                 num_interop_threads=1, quantize_int8=True),
+    'cpu_bf16': InferenceProfile(name='cpu_bf16', num_threads=os.cpu_count(),
+                                 num_interop_threads=1, bf16=True),
+}
+
+
+def get_profile(profile: Any) -> InferenceProfile:
+    """
+    Resolve a profile name or instance.
+
+    Args:
+        profile: A name from PROFILES or an InferenceProfile.
+
+    Returns:
+        InferenceProfile: The resolved profile.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if isinstance(profile, InferenceProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown inference profile '{profile}'; choose from {', '.join(PROFILES)}")
+    return PROFILES[profile]
+
+
+def bf16_supported(torch_module) -> bool:
+    """Return True if the CPU runs bfloat16 matmuls natively through oneDNN."""
+    try:
+        return bool(torch_module.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+
+def _conv1d_to_linear(module, torch_module) -> int:
+    """
+    Replace Hugging Face Conv1D layers with equivalent nn.Linear layers.
+
+    The XTTS GPT is a GPT-2 whose attention and MLP projections are Conv1D
+    (a linear layer with a transposed weight), which dynamic quantization
+    does not recognize.
+
+    Returns:
+        int: Number of layers replaced.
+    """
+    replaced = 0
+    for name, child in list(module.named_children()):
+        if type(child).__name__ == 'Conv1D' and getattr(child, 'weight', None) is not None:
+            in_features, out_features = child.weight.shape
+            linear = torch_module.nn.Linear(in_features, out_features, bias=child.bias is not None)
+            with torch_module.no_grad():
+                linear.weight.copy_(child.weight.t())
+                if child.bias is not None:
+                    linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+            replaced += 1
+        else:
+            replaced += _conv1d_to_linear(child, torch_module)
+    return replaced
+
+
+def quantize_int8(xtts, torch_module) -> int:
+    """
+    Dynamically quantize the linear layers of the XTTS GPT and decoder to int8.
+
+    Args:
+        xtts: The Coqui Xtts model (modified in place).
+        torch_module: The imported torch module.
+
+    Returns:
+        int: Number of linear layers quantized.
+    """
+    quantized = 0
+    for attr in QUANTIZE_MODULES:
+        module = getattr(xtts, attr, None)
+        if not isinstance(module, torch_module.nn.Module):
+            continue
+        _conv1d_to_linear(module, torch_module)
+        count = sum(1 for m in module.modules() if isinstance(m, torch_module.nn.Linear))
+        if not count:
+            continue
+        setattr(xtts, attr, torch_module.ao.quantization.quantize_dynamic(
+            module, {torch_module.nn.Linear}, dtype=torch_module.qint8
+        ))
+        quantized += count
+    return quantized
+
+
+def apply_profile(profile: InferenceProfile, xtts: Any, device: str,
+                  torch_module=None) -> Dict[str, Any]:
+    """
+    Apply a profile to the process and the loaded model.
+
+    Args:
+        profile (InferenceProfile): Settings to apply.
+        xtts: The underlying XTTS model, or None if the model exposes none.
+        device (str): Device the model runs on; quantization and bf16 are CPU only.
+        torch_module: The imported torch module, or None for non-torch models.
+
+    Returns:
+        Dict[str, Any]: The requested profile plus the effective thread counts,
+        'inference_mode', 'quantized_layers' and 'bf16' as actually applied,
+        and 'notes' explaining anything that was skipped.
+    """
+    report: Dict[str, Any] = {'profile': asdict(profile), 'notes': [],
+                              'inference_mode': False, 'quantized_layers': 0, 'bf16': False}
+    if torch_module is None:
+        report['notes'].append("Model does not use torch; profile not applied.")
+        return report
+
+    if profile.num_threads:
+        torch_module.set_num_threads(profile.num_threads)
+    if profile.num_interop_threads:
+        try:
+            torch_module.set_num_interop_threads(profile.num_interop_threads)
+        except RuntimeError as e:
+            # Only allowed before any inter-op parallel work has started
+            report['notes'].append(f"Inter-op threads unchanged: {str(e)}")
+    report['num_threads'] = torch_module.get_num_threads()
+    report['num_interop_threads'] = torch_module.get_num_interop_threads()
+    report['inference_mode'] = profile.inference_mode
+
+    if profile.quantize_int8 and profile.bf16:
+        report['notes'].append("bf16 ignored: int8 quantized layers do not run under bf16 autocast.")
+    if profile.quantize_int8:
+        if device != 'cpu':
+            report['notes'].append(f"int8 quantization skipped on device '{device}'.")
+        elif xtts is None:
+            report['notes'].append("int8 quantization skipped: no XTTS model.")
+        else:
+            report['quantized_layers'] = quantize_int8(xtts, torch_module)
+    elif profile.bf16:
+        if device != 'cpu':
+            report['notes'].append(f"bf16 autocast skipped on device '{device}'.")
+        elif not bf16_supported(torch_module):
+            report['notes'].append("bf16 autocast skipped: not supported by this CPU.")
+        else:
+            report['bf16'] = True
+
+    logger.info(f"Applied inference profile '{profile.name}': threads={report['num_threads']}, "
+                f"interop={report['num_interop_threads']}, quantized_layers={report['quantized_layers']}, "
+                f"bf16={report['bf16']}")
+    return report
+
+
+def inference_context(report: Optional[Dict[str, Any]], torch_module=None):
+    """
+    Return the context manager that generation runs under for an applied profile.
+
+    Args:
+        report (Optional[Dict[str, Any]]): Result of apply_profile(), or None.
+        torch_module: The imported torch module, or None.
+
+    Returns:
+        A context manager enabling inference mode and bf16 autocast as applied.
+    """
+    if not report or torch_module is None or not (report['inference_mode'] or report['bf16']):
+        return contextlib.nullcontext()
+    stack = contextlib.ExitStack()
+    if report['inference_mode']:
+        stack.enter_context(torch_module.inference_mode())
+    if report['bf16']:
+        stack.enter_context(torch_module.autocast('cpu', dtype=torch_module.bfloat16))
+    return stack
@@ -0,0 +1,210 @@
+"""
+Reference audio preprocessing for AI Voice Assistant.
+
+Uploaded reference recordings arrive at 44.1/48 kHz, often in stereo, with
+leading silence and inconsistent levels. XTTS would decode and resample them
+again on every conditioning call. This module prepares each reference once:
+1. Downmixes to mono and resamples to the model's reference rate
+2. Trims leading and trailing silence
+3. Normalizes loudness (gated RMS) with a peak ceiling
+4. Caps the length at what XTTS actually uses for conditioning
+5. Caches the result on disk keyed by the source content hash and settings
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import soundfile as sf
+
+from .hashing import file_digest
+
+REFERENCE_SAMPLE_RATE = 22050  # rate XTTS loads conditioning audio at
+MAX_REFERENCE_SECONDS = 30.0  # XTTS ignores conditioning audio beyond this
+_FRAME = 2048
+_HOP = 512
+
+
+@dataclass(frozen=True)
+class PreprocessSettings:
+    """
+    Parameters of reference preprocessing; part of every cache key.
+
+    Attributes:
+        sample_rate: Output sample rate in Hz.
+        trim_db: Frames quieter than this many dB below the peak are trimmed
+            from both ends.
+        target_dbfs: RMS level of the non-silent audio after normalization.
+        peak_dbfs: Ceiling on the sample peak after normalization.
+        max_seconds: Maximum output duration.
+    """
+    sample_rate: int = REFERENCE_SAMPLE_RATE
+    trim_db: float = 40.0
+    target_dbfs: float = -20.0
+    peak_dbfs: float = -1.0
+    max_seconds: float = MAX_REFERENCE_SECONDS
+
+
+def _frame_rms(audio: np.ndarray) -> np.ndarray:
+    """RMS of each analysis frame, computed without copying the signal."""
+    if len(audio) < _FRAME:
+        return np.array([np.sqrt(np.mean(audio ** 2))]) if len(audio) else np.zeros(0)
+    frames = np.lib.stride_tricks.sliding_window_view(audio, _FRAME)[::_HOP]
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+def trim_silence(audio: np.ndarray, trim_db: float) -> np.ndarray:
+    """
+    Remove leading and trailing frames more than trim_db below the loudest frame.
+
+    Args:
+        audio (np.ndarray): Mono float samples.
+        trim_db (float): Threshold below the loudest frame, in dB.
+
+    Returns:
+        np.ndarray: The trimmed view of audio (empty if it is all silence).
+    """
+    rms = _frame_rms(audio)
+    if not len(rms) or rms.max() <= 0:
+        return audio[:0]
+    loud = np.flatnonzero(rms >= rms.max() * 10 ** (-trim_db / 20))
+    start = loud[0] * _HOP
+    end = min(len(audio), loud[-1] * _HOP + _FRAME)
+    return audio[start:end]
+
+
+def normalize_loudness(audio: np.ndarray, target_dbfs: float, peak_dbfs: float) -> np.ndarray:
+    """
+    Scale audio so its gated RMS reaches target_dbfs without the peak exceeding peak_dbfs.
+
+    Frames more than 30 dB below the loudest frame are excluded from the RMS,
+    so pauses do not inflate the gain.
+
+    Args:
+        audio (np.ndarray): Mono float samples.
+        target_dbfs (float): Desired RMS level in dBFS.
+        peak_dbfs (float): Peak ceiling in dBFS.
+
+    Returns:
+        np.ndarray: The scaled audio (float32).
+    """
+    rms = _frame_rms(audio)
+    if not len(rms) or rms.max() <= 0:
+        return audio.astype(np.float32)
+    gated = rms[rms >= rms.max() * 10 ** (-30 / 20)]
+    loudness = float(np.sqrt(np.mean(gated ** 2)))
+    gain = 10 ** (target_dbfs / 20) / loudness
+    peak = float(np.max(np.abs(audio)))
+    gain = min(gain, 10 ** (peak_dbfs / 20) / peak)
+    return (audio * gain).astype(np.float32)
+
+
+def preprocess_audio(audio: np.ndarray, sample_rate: int,
+                     settings: PreprocessSettings = PreprocessSettings()) -> np.ndarray:
+    """
+    Apply the full preprocessing chain to decoded audio.
+
+    Args:
+        audio (np.ndarray): Samples shaped (frames,) or (frames, channels).
+        sample_rate (int): Sample rate of audio.
+        settings (PreprocessSettings): Processing parameters.
+
+    Returns:
+        np.ndarray: Mono float32 audio at settings.sample_rate.
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    # Cap before resampling so long uploads are not resampled in full; keep
+    # headroom for silence that trimming will remove
+    audio = audio[:int(sample_rate * settings.max_seconds * 2)]
+    if sample_rate != settings.sample_rate:
+        import librosa  # deferred: librosa takes about a second to import
+        audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=settings.sample_rate)
+    audio = trim_silence(audio, settings.trim_db)
+    audio = audio[:int(settings.sample_rate * settings.max_seconds)]
+    return normalize_loudness(audio, settings.target_dbfs, settings.peak_dbfs)
+
+
+class ReferencePreprocessor:
+    """
+    Disk cache of preprocessed reference audio.
+
+    Each source file is processed once per settings; later calls for the same
+    content (under any path) return the cached 16-bit mono WAV.
+
+    Attributes:
+        cache_dir: Directory holding the preprocessed files.
+        settings: Processing parameters.
+        hits: Number of requests served from the cache.
+        misses: Number of references processed.
+    """
+
+    def __init__(self, cache_dir: str, settings: Optional[PreprocessSettings] = None):
+        """
+        Args:
+            cache_dir (str): Directory for preprocessed references.
+            settings (Optional[PreprocessSettings]): Processing parameters;
+                defaults suit XTTS v2.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.settings = settings or PreprocessSettings()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._settings_key = json.dumps(asdict(self.settings), sort_keys=True)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, source_path: str) -> str:
+        """Return where the preprocessed version of source_path is cached."""
+        combined = f"{file_digest(source_path)}:{self._settings_key}"
+        return os.path.join(self.cache_dir, hashlib.sha256(combined.encode('utf-8')).hexdigest() + '.wav')
+
+    def prepare(self, source_path: str) -> str:
+        """
+        Return the path of the preprocessed reference, creating it on a miss.
+
+        Args:
+            source_path (str): Original reference recording.
+
+        Returns:
+            str: Path of the cached mono WAV at settings.sample_rate.
+
+        Raises:
+            ValueError: If nothing remains after trimming (the file is silent).
+            OSError: If the source cannot be read.
+        """
+        path = self.cache_path(source_path)
+        if os.path.exists(path):
+            with self._lock:
+                self.hits += 1
+            return path
+
+        audio, sample_rate = sf.read(source_path, dtype='float32', always_2d=True)
+        processed = preprocess_audio(audio, sample_rate, self.settings)
+        if not len(processed):
+            raise ValueError(f"Reference audio {source_path} is silent after trimming")
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            sf.write(tmp_path, processed, self.settings.sample_rate, subtype='PCM_16', format='WAV')
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self.misses += 1
+        self.logger.info(f"Preprocessed reference {source_path}: {len(audio) / sample_rate:.1f}s "
+                         f"-> {len(processed) / self.settings.sample_rate:.1f}s")
+        return path
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,445 @@
+"""
+Local synthesis server for AI Voice Assistant.
+
+Importing VoiceCloning in every consumer loads a multi-GB model per process.
+This module serves one warm model over HTTP instead (python -m tts.server):
+1. The model is loaded once, in the background, when the server starts
+2. POST /synthesize streams 16-bit audio back with chunked transfer encoding
+   as it is generated, for voices registered in the voice library
+3. POST /voices registers a voice from reference samples; GET /voices lists them
+4. GET /health (liveness), GET /ready (model loaded) and GET /metrics
+5. A bounded request queue rejects excess load with 503 instead of piling up
+
+The server binds to localhost by default and has no authentication; it is
+meant for processes on the same machine.
+"""
+
+import argparse
+import json
+import logging
+import struct
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .async_executor import QueueFullError
+from .audio import AudioChunk
+from .core import DEFAULT_MODEL_NAME, DEFAULT_STREAM_CHUNK_SIZE
+from .metrics import Metrics
+from .text import char_limit, chunk_text
+from .voice_cloning import VoiceCloning
+from .voice_library import VoiceLibrary
+
+DEFAULT_PORT = 8020
+MAX_BODY_BYTES = 1024 * 1024
+STREAM_FORMATS = ('wav', 'pcm')
+
+
+class RequestLimiter:
+    """
+    Admission control for inference requests.
+
+    Up to max_concurrency requests run at once and up to max_queue more wait
+    for a slot; anything beyond that is rejected immediately.
+
+    Attributes:
+        max_concurrency: Requests allowed to run inference at once.
+        max_queue: Requests allowed to wait for a slot.
+    """
+
+    def __init__(self, max_concurrency: int = 1, max_queue: int = 8):
+        """
+        Args:
+            max_concurrency (int): Concurrent inference requests.
+            max_queue (int): Requests allowed to wait beyond the running ones.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._slots = threading.Semaphore(max_concurrency)
+        self._outstanding = 0
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding(self) -> int:
+        """Number of requests running or waiting."""
+        with self._lock:
+            return self._outstanding
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold an inference slot for the duration of the block.
+
+        Raises:
+            QueueFullError: If the concurrency limit and queue are exhausted.
+        """
+        with self._lock:
+            if self._outstanding >= self.max_concurrency + self.max_queue:
+                raise QueueFullError(f"Request queue full ({self._outstanding} requests outstanding)")
+            self._outstanding += 1
+        try:
+            with self._slots:
+                yield
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+
+
+class RequestError(Exception):
+    """A client error, reported with an HTTP status and message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def wav_stream_header(sample_rate: int) -> bytes:
+    """
+    Return a 16-bit mono WAV header for a stream of unknown length.
+
+    The RIFF and data sizes are set to their maximum, which players treat as
+    "read until end of stream".
+    """
+    data_size = 0xFFFFFFFF - 36
+    return (b'RIFF' + struct.pack('<I', 0xFFFFFFFF) + b'WAVE'
+            + b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+            + b'data' + struct.pack('<I', data_size))
+
+
+def to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples in [-1.0, 1.0] to little-endian 16-bit PCM."""
+    clipped = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    return (clipped * 32767.0).astype('<i2').tobytes()
+
+
+class SynthesisServer:
+    """
+    HTTP server sharing one warm VoiceCloning engine between requests.
+
+    Attributes:
+        engine: Engine used for every request.
+        model_name: Model loaded at startup.
+        limiter: Admission control for inference requests.
+        httpd: Underlying ThreadingHTTPServer.
+        init_error: Set if model loading failed.
+    """
+
+    def __init__(self, engine: VoiceCloning, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 model_name: str = DEFAULT_MODEL_NAME, max_concurrency: int = 1, max_queue: int = 8):
+        """
+        Create the server and bind its socket (port 0 picks a free port).
+
+        Args:
+            engine (VoiceCloning): Engine, normally configured with a voice library.
+            host (str): Interface to bind.
+            port (int): Port to bind.
+            model_name (str): Model to load at startup.
+            max_concurrency (int): Requests allowed to run inference at once.
+            max_queue (int): Requests allowed to wait for inference.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.model_name = model_name
+        self.limiter = RequestLimiter(max_concurrency, max_queue)
+        self.init_error: Optional[str] = None
+        self._loaded = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """The (host, port) the server is bound to."""
+        return self.httpd.server_address[:2]
+
+    @property
+    def ready(self) -> bool:
+        """True once the model is loaded."""
+        return self._loaded.is_set() and self.init_error is None
+
+    def load_model(self) -> bool:
+        """Load the model; run by start() on a background thread."""
+        try:
+            if self.engine.model is None and not self.engine.initialize_model(self.model_name):
+                self.init_error = f"Failed to load model {self.model_name}"
+            return self.init_error is None
+        finally:
+            self._loaded.set()
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Wait for model loading to finish; returns True if the server is ready."""
+        self._loaded.wait(timeout)
+        return self.ready
+
+    def start(self) -> None:
+        """Load the model and serve requests on background threads."""
+        for target, name in ((self.load_model, 'tts-server-load'),
+                             (self.httpd.serve_forever, 'tts-server')):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        host, port = self.address
+        self.logger.info(f"Synthesis server listening on http://{host}:{port}")
+
+    def shutdown(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness details reported by GET /ready."""
+        return {
+            'ready': self.ready,
+            'model': self.model_name,
+            'error': self.init_error,
+            'outstanding': self.limiter.outstanding,
+            'load_seconds': self.engine.load_report,
+            'models': self.engine.model_registry.stats() if self.engine.model_registry else None,
+        }
+
+    def synthesize(self, request: Dict[str, Any]) -> Tuple[str, Iterator[AudioChunk]]:
+        """
+        Validate a synthesis request and start streaming it.
+
+        Returns:
+            Tuple of the stream format ('wav' or 'pcm') and the chunk iterator.
+
+        Raises:
+            RequestError: If the request is invalid or the voice is unknown.
+        """
+        text = request.get('text')
+        voice = request.get('voice')
+        language = request.get('language', 'en')
+        fmt = request.get('format', 'wav')
+        chunk_size = request.get('stream_chunk_size', DEFAULT_STREAM_CHUNK_SIZE)
+        if not isinstance(text, str) or not text.strip():
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'text' must be a non-empty string")
+        if not isinstance(voice, str):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'voice' must name a registered voice")
+        if fmt not in STREAM_FORMATS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"'format' must be one of {', '.join(STREAM_FORMATS)}")
+        if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size < 1):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'stream_chunk_size' must be a positive integer")
+        if self.engine.voice_library is None or voice not in self.engine.voice_library:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown voice '{voice}'")
+        segments = chunk_text(text, language) if len(text) > char_limit(language) else None
+        chunks = self.engine.stream_audio(text, voice, language, stream_chunk_size=chunk_size,
+                                          segments=segments)
+        return fmt, chunks
+
+    def create_voice(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a voice from reference samples on the server's disk.
+
+        Raises:
+            RequestError: If the request is invalid or the samples are rejected.
+        """
+        voice_id = request.get('voice_id')
+        samples = request.get('samples')
+        if not isinstance(voice_id, str) or not isinstance(samples, list) or not samples:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'voice_id' and a list of 'samples' are required")
+        if self.engine.voice_library is None:
+            raise RequestError(HTTPStatus.CONFLICT, "The server has no voice library")
+        try:
+            self.engine.voice_library.validate_voice_id(voice_id)
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+        if not self.engine.create_voice(voice_id, samples, name=request.get('name')):
+            raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Could not create voice '{voice_id}'")
+        return asdict(self.engine.voice_library.get(voice_id))
+
+
+def _make_handler(server: SynthesisServer):
+    """Build a request handler class bound to server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        server_version = 'tts-server'
+
+        def log_message(self, format: str, *args: Any) -> None:
+            server.logger.debug(f"{self.address_string()} {format % args}")
+
+        def do_GET(self) -> None:
+            if self.path == '/health':
+                self._send_json(HTTPStatus.OK, {'status': 'ok'})
+            elif self.path == '/ready':
+                status = server.status()
+                self._send_json(HTTPStatus.OK if status['ready'] else HTTPStatus.SERVICE_UNAVAILABLE, status)
+            elif self.path == '/voices':
+                voices = [asdict(v) for v in server.engine.list_voices()]
+                self._send_json(HTTPStatus.OK, {'voices': voices})
+            elif self.path == '/metrics':
+                self._send_metrics()
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, f"No route for GET {self.path}")
+
+        def do_POST(self) -> None:
+            if self.path not in ('/synthesize', '/voices'):
+                self._send_error(HTTPStatus.NOT_FOUND, f"No route for POST {self.path}")
+                return
+            try:
+                request = self._read_json()
+                if not server.ready:
+                    raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "Model is not loaded")
+                with server.limiter.slot():
+                    if self.path == '/voices':
+                        self._send_json(HTTPStatus.CREATED, server.create_voice(request))
+                    else:
+                        self._stream(*server.synthesize(request))
+            except RequestError as e:
+                self._send_error(e.status, str(e))
+            except QueueFullError as e:
+                self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e), retry_after=1)
+            except (BrokenPipeError, ConnectionResetError):
+                server.logger.info("Client disconnected; synthesis stopped")
+                self.close_connection = True
+            except Exception as e:
+                server.logger.error(f"Request to {self.path} failed: {str(e)}", exc_info=True)
+                self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+
+        def _stream(self, fmt: str, chunks: Iterator[AudioChunk]) -> None:
+            """Send chunks as they are generated; headers wait for the first one."""
+            started = False
+            try:
+                first = next(chunks, None)
+                sample_rate = first.sample_rate if first is not None else 24000
+                self.send_response(HTTPStatus.OK)
+                if fmt == 'wav':
+                    self.send_header('Content-Type', 'audio/wav')
+                else:
+                    self.send_header('Content-Type', f"audio/L16; rate={sample_rate}; channels=1")
+                self.send_header('X-Sample-Rate', str(sample_rate))
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                started = True
+                if fmt == 'wav':
+                    self._write_chunk(wav_stream_header(sample_rate))
+                if first is not None:
+                    self._write_chunk(to_pcm16(first.samples))
+                for chunk in chunks:
+                    self._write_chunk(to_pcm16(chunk.samples))
+                self.wfile.write(b'0\r\n\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception:
+                if started:
+                    # Too late for an error status; drop the connection so the
+                    # client sees a truncated response rather than a complete one
+                    self.close_connection = True
+                    server.logger.error("Synthesis failed mid-stream", exc_info=True)
+                    return
+                raise
+            finally:
+                chunks.close()
+
+        def _write_chunk(self, data: bytes) -> None:
+            if data:
+                self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b'\r\n')
+
+        def _read_json(self) -> Dict[str, Any]:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_BODY_BYTES:
+                raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+            try:
+                request = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Request body must be JSON")
+            if not isinstance(request, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+            return request
+
+        def _send_metrics(self) -> None:
+            if not server.engine.metrics.enabled:
+                self._send_error(HTTPStatus.NOT_FOUND, "Metrics are disabled")
+                return
+            body = server.engine.metrics.registry.to_prometheus().encode('utf-8')
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status: HTTPStatus, payload: Dict[str, Any],
+                       retry_after: Optional[int] = None) -> None:
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if retry_after is not None:
+                self.send_header('Retry-After', str(retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_error(self, status: HTTPStatus, message: str, retry_after: Optional[int] = None) -> None:
+            self._send_json(status, {'error': message}, retry_after=retry_after)
+
+    return Handler
+
+
+def build_engine(backend: str, voice_library_dir: Optional[str], metrics: bool,
+                 profile: Optional[str] = None, stub_rtf: float = 0.1,
+                 model_dir: Optional[str] = None, warmup: bool = False) -> VoiceCloning:
+    """Create the engine for the command-line server."""
+    options: Dict[str, Any] = {
+        'voice_library': VoiceLibrary(voice_library_dir) if voice_library_dir else None,
+        'metrics': Metrics() if metrics else None,
+        'profile': profile,
+        'model_dir': model_dir,
+        'warmup': warmup,
+    }
+    if backend == 'stub':
+        from .stub import StubModelFactory
+        options['model_factory'] = StubModelFactory(real_time_factor=stub_rtf)
+    return VoiceCloning(**options)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point. Returns a process exit code."""
+    parser = argparse.ArgumentParser(description="Serve text-to-speech over HTTP from one warm model.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--backend', choices=['xtts', 'stub'], default='xtts',
+                        help="Coqui XTTS (default) or the synthetic stub model for local testing")
+    parser.add_argument('--model-name', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--model-dir', help="Load XTTS offline from this local checkpoint directory")
+    parser.add_argument('--warmup', action='store_true',
+                        help="Run a warm-up synthesis before reporting ready")
+    parser.add_argument('--voice-library', default='voices', help="Voice library directory")
+    parser.add_argument('--profile', help="Inference profile, e.g. cpu or cpu_int8")
+    parser.add_argument('--max-concurrency', type=int, default=1)
+    parser.add_argument('--max-queue', type=int, default=8)
+    parser.add_argument('--no-metrics', action='store_true', help="Disable GET /metrics")
+    parser.add_argument('--stub-rtf', type=float, default=0.1,
+                        help="Simulated real-time factor of the stub model")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    engine = build_engine(args.backend, args.voice_library, not args.no_metrics,
+                          profile=args.profile, stub_rtf=args.stub_rtf,
+                          model_dir=args.model_dir, warmup=args.warmup)
+    server = SynthesisServer(engine, host=args.host, port=args.port, model_name=args.model_name,
+                             max_concurrency=args.max_concurrency, max_queue=args.max_queue)
+    server.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Single-flight request coalescing for AI Voice Assistant.
+
+Identical requests often arrive together (the same sponsor read rendered for
+several episodes at once, or a burst of retries). Rather than running the
+same inference several times, the first caller does the work and the others
+wait for and share its result:
+1. Only one call per key is in flight at a time
+2. Followers receive the leader's result, or its exception; a follower's
+   deliver callback runs before the leader returns, so followers never
+   depend on something the leader's caller may change afterwards
+3. A caller that cancels gets InferenceCancelled, but the shared work only
+   stops once every caller waiting on it has cancelled
+4. Nothing is cached once the call completes; later calls run again
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+from .async_executor import InferenceCancelled
+
+T = TypeVar('T')
+
+_CANCEL_POLL_SECONDS = 0.05
+
+
+class _Waiter:
+    """One caller of an in-flight call."""
+
+    def __init__(self, cancel_event: Optional[threading.Event], deliver: Optional[Callable[[Any], Any]]):
+        self.cancel_event = cancel_event
+        self.deliver = deliver
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+
+class _Call:
+    """State of one in-flight call."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters: List[_Waiter] = []
+        self.delivering = False
+
+
+class FlightCancellation:
+    """
+    Cancellation of a shared call, for work that polls is_set() like a threading.Event.
+
+    It reads as set only once every caller waiting on the call has set its
+    own cancel_event, so one caller cancelling does not stop the work for
+    the others.
+    """
+
+    def __init__(self, flight: 'SingleFlight', key: Hashable):
+        self._flight = flight
+        self._key = key
+
+    def is_set(self) -> bool:
+        return self._flight._all_cancelled(self._key)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    Share one instance between engines to coalesce across them.
+
+    Attributes:
+        calls: Number of calls that ran their function.
+        coalesced: Number of calls that shared another call's result.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T], cancel_event: Optional[threading.Event] = None,
+           deliver: Optional[Callable[[T], Any]] = None) -> Tuple[Any, bool]:
+        """
+        Run fn, unless a call with the same key is already running.
+
+        Args:
+            key (Hashable): Identifies equivalent calls.
+            fn (Callable): Produces the result; run by the first caller only.
+                Long-running work can poll cancellation(key).
+            cancel_event (Optional[threading.Event]): This caller's
+                cancellation; a follower stops waiting as soon as it is set.
+            deliver (Optional[Callable]): For a follower, called with the
+                leader's result in the leader's thread before the leader
+                returns; the follower returns what it returns.
+
+        Returns:
+            Tuple of the result and whether it was shared from another
+            caller's execution.
+
+        Raises:
+            InferenceCancelled: If this caller's cancel_event was set.
+            Exception: Whatever fn (or deliver) raised, in the leader and
+                every follower.
+        """
+        waiter = _Waiter(cancel_event, deliver)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+            call.waiters.append(waiter)
+
+        if not leader:
+            return self._follow(call, waiter), True
+
+        result, error = None, None
+        try:
+            result = fn()
+        except BaseException as e:
+            error = e
+        with self._lock:
+            del self._calls[key]
+            call.delivering = True
+            followers = [w for w in call.waiters if w is not waiter]
+        for follower in followers:
+            if error is not None:
+                follower.error = error
+            elif follower.deliver is not None:
+                try:
+                    follower.result = follower.deliver(result)
+                except Exception as e:
+                    follower.error = e
+            else:
+                follower.result = result
+        call.done.set()
+        if error is not None:
+            raise error
+        if waiter.cancelled:
+            raise InferenceCancelled()
+        return result, False
+
+    def cancellation(self, key: Hashable) -> FlightCancellation:
+        """Return the cancellation of the in-flight call for key, for its fn to poll."""
+        return FlightCancellation(self, key)
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the call counters."""
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+    def _follow(self, call: _Call, waiter: _Waiter) -> Any:
+        """Wait for the leader, leaving early if this caller cancels."""
+        timeout = _CANCEL_POLL_SECONDS if waiter.cancel_event is not None else None
+        while not call.done.wait(timeout):
+            if waiter.cancelled:
+                with self._lock:
+                    leaving = not call.delivering
+                    if leaving:
+                        call.waiters.remove(waiter)
+                if leaving:
+                    raise InferenceCancelled()
+                # Already being delivered; finish rather than leave a half-copied result
+                timeout = None
+        if waiter.error is not None:
+            raise waiter.error
+        return waiter.result
+
+    def _all_cancelled(self, key: Hashable) -> bool:
+        with self._lock:
+            call = self._calls.get(key)
+            return call is not None and all(w.cancelled for w in call.waiters)
@@ -0,0 +1,174 @@
+"""
+Pipelined audio file sinks for AI Voice Assistant.
+
+Encoding compressed formats (FLAC, Ogg Vorbis/Opus) costs real CPU time. An
+AudioFileSink moves it off the synthesis thread:
+1. Chunks are handed to a bounded queue and encoded by a writer thread, so
+   encoding overlaps with generation of the next chunk
+2. The container format follows the file extension (or is set explicitly;
+   paths with no or an unknown extension are written as WAV) and the bit
+   depth/codec is configurable, defaulting to 16-bit PCM for WAV/FLAC
+   rather than float
+3. Encoder errors surface in the producing thread on the next write or close
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+from .audio import AudioChunk
+
+WRITE_FRAMES = 16384  # frames per encoder call; large OGG writes are slow in libsndfile
+DEFAULT_SUBTYPES = {
+    'WAV': 'PCM_16',
+    'FLAC': 'PCM_16',
+    'OGG': 'VORBIS',
+}
+_EXTENSION_FORMATS = {'.oga': 'OGG', '.opus': 'OGG'}
+_DONE = object()
+
+
+def format_for_path(path: str) -> str:
+    """
+    Return the soundfile container format for a path's extension.
+
+    Paths without an extension, or with one that is not an audio format
+    soundfile can write (e.g. '.tmp'), are written as WAV, as they always
+    were before the format followed the extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    fmt = _EXTENSION_FORMATS.get(extension, extension.lstrip('.').upper())
+    if fmt not in sf.available_formats():
+        if extension:
+            logging.getLogger(__name__).warning(f"Unknown audio extension '{extension}' for {path}; writing WAV")
+        return 'WAV'
+    return fmt
+
+
+def default_subtype(fmt: str, path: str = '') -> Optional[str]:
+    """Return the default subtype for a container format (Opus for .opus files)."""
+    if fmt == 'OGG' and path.lower().endswith('.opus'):
+        return 'OPUS'
+    return DEFAULT_SUBTYPES.get(fmt)
+
+
+class AudioFileSink:
+    """
+    Writes audio chunks to a file from a background encoder thread.
+
+    The file is created when the first chunk arrives, at that chunk's sample
+    rate, so a sink that receives nothing leaves no file behind.
+
+    Attributes:
+        output_path: Destination file.
+        format: soundfile container format (e.g. 'WAV', 'FLAC', 'OGG').
+        subtype: soundfile subtype (e.g. 'PCM_16', 'PCM_24', 'VORBIS').
+        encode_time: Seconds the writer thread spent encoding and writing.
+        frames: Frames written so far.
+    """
+
+    def __init__(self, output_path: str, format: Optional[str] = None,
+                 subtype: Optional[str] = None, max_pending: int = 8):
+        """
+        Args:
+            output_path (str): Destination file.
+            format (Optional[str]): Container format; inferred from the
+                extension when None.
+            subtype (Optional[str]): Bit depth or codec; the format default
+                (16-bit PCM for WAV and FLAC) when None.
+            max_pending (int): Chunks queued before write() blocks, which
+                bounds memory if encoding falls behind generation.
+        """
+        self.output_path = output_path
+        self.format = format or format_for_path(output_path)
+        if self.format not in sf.available_formats():
+            raise ValueError(f"Unsupported audio format {self.format}")
+        self.subtype = subtype or default_subtype(self.format, output_path)
+        if self.subtype is not None and not sf.check_format(self.format, self.subtype):
+            raise ValueError(f"Subtype {self.subtype} is not supported by format {self.format}")
+        self.encode_time = 0.0
+        self.frames = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='audio-sink', daemon=True)
+        self._thread.start()
+
+    def write(self, chunk: AudioChunk) -> None:
+        """
+        Queue a chunk for encoding.
+
+        Raises:
+            RuntimeError: If the sink is closed.
+            Exception: Any error the encoder thread has raised.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot write to a closed audio sink")
+        self._raise_error()
+        self._queue.put(chunk)
+
+    def close(self) -> None:
+        """
+        Flush queued chunks, close the file and stop the encoder thread.
+
+        Raises:
+            Exception: Any error the encoder thread raised.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_DONE)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> 'AudioFileSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep the original exception; encoder errors are secondary
+            self._closed = True
+            self._queue.put(_DONE)
+            self._thread.join()
+        return False
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        sound_file = None
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is _DONE:
+                    break
+                start = time.perf_counter()
+                if sound_file is None:
+                    sound_file = sf.SoundFile(self.output_path, mode='w', samplerate=chunk.sample_rate,
+                                              channels=1, format=self.format, subtype=self.subtype)
+                samples = np.asarray(chunk.samples, dtype=np.float32)
+                for offset in range(0, len(samples), WRITE_FRAMES):
+                    sound_file.write(samples[offset:offset + WRITE_FRAMES])
+                self.frames += len(samples)
+                self.encode_time += time.perf_counter() - start
+        except BaseException as e:
+            self._error = e
+            # Keep consuming until close() so write() never deadlocks
+            while self._queue.get() is not _DONE:
+                pass
+        finally:
+            if sound_file is not None:
+                start = time.perf_counter()
+                try:
+                    sound_file.close()
+                except Exception as e:
+                    self._error = self._error or e
+                self.encode_time += time.perf_counter() - start
@@ -0,0 +1,174 @@
+"""
+Deterministic stub model backend for AI Voice Assistant.
+
+Benchmarks, the local server and tests need a model that runs on a CPU-only
+box with no network and no multi-GB checkpoint. StubTTS mimics the parts of
+the Coqui TTS API that TextToSpeech uses (the XTTS conditioning, speaker
+embedding, inference and streaming calls) and emits synthetic speech-like audio at a configurable
+speed. The same text and voice always produce the same samples.
+"""
+
+import hashlib
+import time
+from typing import Any, Dict, Iterator, List, Union
+
+import numpy as np
+import soundfile as sf
+
+STUB_MODEL_NAME = 'stub'
+STUB_SAMPLE_RATE = 24000
+SECONDS_PER_CHAR = 0.06  # roughly 165 words per minute
+STUB_TOKENS_PER_SECOND = 21.5  # XTTS GPT emits ~21.5 audio tokens per second
+
+
+def _seed(*parts: Any) -> int:
+    digest = hashlib.sha256('|'.join(str(p) for p in parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'little')
+
+
+class StubXtts:
+    """
+    Stand-in for the Coqui Xtts model.
+
+    Attributes:
+        real_time_factor: Seconds of compute simulated per second of audio.
+        conditioning_time: Seconds simulated per get_conditioning_latents() call.
+        first_chunk_time: Extra seconds simulated before the first audio is ready.
+        calls: Per-method call counters.
+    """
+
+    def __init__(self, real_time_factor: float = 0.1, conditioning_time: float = 0.05,
+                 first_chunk_time: float = 0.0, sample_rate: int = STUB_SAMPLE_RATE):
+        self.real_time_factor = real_time_factor
+        self.conditioning_time = conditioning_time
+        self.first_chunk_time = first_chunk_time
+        self.sample_rate = sample_rate
+        self.calls: Dict[str, int] = {'conditioning': 0, 'inference': 0, 'inference_stream': 0,
+                                      'speaker_embedding': 0}
+
+    def get_conditioning_latents(self, audio_path: Union[str, List[str]], **kwargs):
+        """Return deterministic latents derived from the reference file contents."""
+        self.calls['conditioning'] += 1
+        paths = [audio_path] if isinstance(audio_path, str) else list(audio_path)
+        digest = hashlib.sha256()
+        for path in paths:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        rng = np.random.default_rng(int.from_bytes(digest.digest()[:4], 'little'))
+        time.sleep(self.conditioning_time)
+        gpt_cond_latent = rng.standard_normal((1, 32, 1024)).astype(np.float32)
+        # As in XTTS, the conditioning speaker embedding is the speaker
+        # encoder's embedding of the references, averaged
+        embeddings = []
+        for path in paths:
+            samples, sample_rate = sf.read(path, dtype='float32', always_2d=True)
+            embeddings.append(self._embed(samples.mean(axis=1), sample_rate))
+        speaker_embedding = np.mean(embeddings, axis=0)
+        speaker_embedding /= np.linalg.norm(speaker_embedding) or 1.0
+        return gpt_cond_latent, speaker_embedding.astype(np.float32).reshape(1, 512, 1)
+
+    def get_speaker_embedding(self, audio: Any, sr: int) -> np.ndarray:
+        """Return a (1, 512, 1) L2-normalized spectral-envelope embedding, like the XTTS speaker encoder."""
+        self.calls['speaker_embedding'] += 1
+        return self._embed(audio, sr).reshape(1, 512, 1)
+
+    @staticmethod
+    def _embed(audio: Any, sr: int) -> np.ndarray:
+        samples = np.asarray(audio, dtype=np.float32).ravel()
+        # Resample to 16 kHz so embeddings are comparable across sample rates
+        num_samples = max(1024, int(len(samples) * 16000 / sr))
+        samples = np.interp(np.linspace(0, len(samples) - 1, num_samples), np.arange(len(samples)), samples)
+        frames = samples[:len(samples) // 1024 * 1024].reshape(-1, 1024)
+        power = (np.abs(np.fft.rfft(frames * np.hanning(1024), axis=1)) ** 2).mean(axis=0)[:512]
+        bands = np.log1p(power.reshape(64, 8).sum(axis=1) * 1e3)
+        bands -= bands.mean()
+        # 64 coarse bands, each repeated to fill XTTS's 512 dimensions
+        bands = np.repeat(bands, 8)
+        return (bands / (np.linalg.norm(bands) or 1.0)).astype(np.float32)
+
+    def render(self, text: str, speaker_embedding: Any = None) -> np.ndarray:
+        """Produce the waveform for text without simulating compute time."""
+        num_samples = max(1, int(len(text.strip()) * SECONDS_PER_CHAR * self.sample_rate))
+        voice = 0.0
+        if speaker_embedding is not None:
+            # Any change to the embedding gives a different voice
+            voice = _seed(np.asarray(speaker_embedding, dtype=np.float32).tobytes()) / 2.0 ** 32
+        rng = np.random.default_rng(_seed(text, round(voice, 6)))
+        t = np.arange(num_samples, dtype=np.float32) / self.sample_rate
+        pitch = 90.0 + 210.0 * voice
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3.0 * t)  # ~3 syllables per second
+        tone = np.sin(2 * np.pi * pitch * t) + 0.3 * np.sin(2 * np.pi * 2 * pitch * t)
+        noise = 0.05 * rng.standard_normal(num_samples)
+        return (0.3 * envelope * tone + noise).astype(np.float32)
+
+    def inference(self, text: str, language: str, gpt_cond_latent: Any, speaker_embedding: Any,
+                  **kwargs) -> Dict[str, np.ndarray]:
+        """Return {'wav': samples} after simulating real_time_factor of compute."""
+        self.calls['inference'] += 1
+        wav = self.render(text, speaker_embedding)
+        time.sleep(self.first_chunk_time + self.real_time_factor * len(wav) / self.sample_rate)
+        return {'wav': wav}
+
+    def inference_stream(self, text: str, language: str, gpt_cond_latent: Any, speaker_embedding: Any,
+                         stream_chunk_size: int = 20, **kwargs) -> Iterator[np.ndarray]:
+        """Yield the waveform in chunks of stream_chunk_size simulated GPT tokens."""
+        self.calls['inference_stream'] += 1
+        wav = self.render(text, speaker_embedding)
+        chunk_len = max(1, int(stream_chunk_size / STUB_TOKENS_PER_SECOND * self.sample_rate))
+        time.sleep(self.first_chunk_time)
+        for start in range(0, len(wav), chunk_len):
+            chunk = wav[start:start + chunk_len]
+            time.sleep(self.real_time_factor * len(chunk) / self.sample_rate)
+            yield chunk
+
+
+class _StubSynthesizer:
+    def __init__(self, tts_model: StubXtts):
+        self.tts_model = tts_model
+        self.output_sample_rate = tts_model.sample_rate
+
+
+class StubTTS:
+    """
+    Stand-in for TTS.api.TTS wrapping a StubXtts model.
+
+    Attributes:
+        synthesizer: Object exposing tts_model and output_sample_rate like Coqui's Synthesizer.
+        load_time: Seconds simulated when the stub is created.
+    """
+
+    def __init__(self, real_time_factor: float = 0.1, conditioning_time: float = 0.05,
+                 first_chunk_time: float = 0.0, load_time: float = 0.0):
+        time.sleep(load_time)
+        self.load_time = load_time
+        self.synthesizer = _StubSynthesizer(StubXtts(
+            real_time_factor=real_time_factor,
+            conditioning_time=conditioning_time,
+            first_chunk_time=first_chunk_time
+        ))
+
+    def to(self, device: str) -> 'StubTTS':
+        return self
+
+    def tts(self, text: str, speaker_wav: str = None, language: str = None, **kwargs) -> List[float]:
+        xtts = self.synthesizer.tts_model
+        _, speaker_embedding = xtts.get_conditioning_latents(speaker_wav)
+        return xtts.inference(text, language, None, speaker_embedding)['wav'].tolist()
+
+
+class StubModelFactory:
+    """
+    Picklable model_factory for TextToSpeech that loads StubTTS.
+
+    Instances can be passed to worker processes, unlike closures.
+    """
+
+    def __init__(self, **options: Any):
+        """
+        Args:
+            **options: Keyword arguments for StubTTS (e.g. real_time_factor).
+        """
+        self.options = options
+
+    def __call__(self, model_name: str) -> StubTTS:
+        return StubTTS(**self.options)
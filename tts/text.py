@@ -0,0 +1,208 @@
+"""
+Text segmentation for AI Voice Assistant.
+
+XTTS degrades (and warns) when one inference call exceeds its per-language
+character limit, while very short calls waste per-call overhead. This module
+prepares input text for synthesis:
+1. Normalizes whitespace, abbreviations and (for English) numbers, memoizing
+   repeated strings
+2. Splits text on sentence boundaries, then clause boundaries, then words
+3. Packs the pieces into segments as close to the language budget as possible
+"""
+
+import functools
+import re
+from typing import List, Optional
+
+# Per-language character limits of the XTTS v2 tokenizer
+CHAR_LIMITS = {
+    'en': 250, 'de': 253, 'fr': 273, 'es': 239, 'it': 213, 'pt': 203, 'pl': 224,
+    'zh': 82, 'ar': 166, 'cs': 186, 'ru': 182, 'nl': 251, 'tr': 226, 'ja': 71,
+    'hu': 224, 'ko': 95, 'hi': 150,
+}
+DEFAULT_CHAR_LIMIT = 250
+NORMALIZE_CACHE_SIZE = 4096
+_UNSPACED_LANGUAGES = ('zh', 'ja')  # scripts written without spaces between words
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])')
+_CLAUSE_BOUNDARY = re.compile(r'(?<=[,;:—–、，；：])\s*')
+_WHITESPACE = re.compile(r'\s+')
+
+# Titles are always followed by a name, so their period never ends a sentence
+_TITLES = {
+    'en': {'mr': 'mister', 'mrs': 'misses', 'dr': 'doctor', 'prof': 'professor', 'mt': 'mount'},
+}
+# These may end a sentence; their period is kept when a new sentence follows
+_ABBREVIATIONS = {
+    'en': {'jr': 'junior', 'sr': 'senior', 'ltd': 'limited', 'inc': 'incorporated',
+           'vs': 'versus', 'etc': 'et cetera', 'approx': 'approximately'},
+}
+# Ambiguous as plain words ("I said no."), so only expanded before a digit ("No. 5")
+_NUMBER_PREFIXES = {
+    'en': {'no': 'number'},
+}
+_ABBREVIATION_PATTERNS = {
+    language: re.compile(
+        r'\b(' + '|'.join(sorted({**_TITLES[language], **table, **_NUMBER_PREFIXES[language]},
+                                 key=len, reverse=True)) + r')\.(?=\s|$)',
+        re.IGNORECASE)
+    for language, table in _ABBREVIATIONS.items()
+}
+_SENTENCE_START = re.compile(r'\s*(?:$|["“(]?[A-Z])')
+_DIGIT_FOLLOWS = re.compile(r'\s+\d')
+
+_ONES = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+         'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+         'eighteen', 'nineteen']
+_TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+_SCALES = [(10 ** 12, 'trillion'), (10 ** 9, 'billion'), (10 ** 6, 'million'), (1000, 'thousand')]
+# Digits inside phone numbers, times and dates ("555-1234", "10:30", "5/1") are left alone
+_NUMBER = re.compile(r'(?<![\w.:/-])(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?(%?)(?![\w:/-])')
+
+
+def char_limit(language: str) -> int:
+    """
+    Return the XTTS character budget for a language.
+
+    Args:
+        language (str): Language code (e.g. 'en', 'zh-cn').
+
+    Returns:
+        int: Maximum characters per inference call.
+    """
+    return CHAR_LIMITS.get(language.split('-')[0].lower(), DEFAULT_CHAR_LIMIT)
+
+
+def _integer_to_words(number: int) -> str:
+    if number < 20:
+        return _ONES[number]
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        return _TENS[tens] + ('-' + _ONES[ones] if ones else '')
+    if number < 1000:
+        hundreds, rest = divmod(number, 100)
+        return _ONES[hundreds] + ' hundred' + (' ' + _integer_to_words(rest) if rest else '')
+    for scale, name in _SCALES:
+        if number >= scale:
+            major, rest = divmod(number, scale)
+            return _integer_to_words(major) + ' ' + name + (' ' + _integer_to_words(rest) if rest else '')
+    return str(number)
+
+
+def _expand_abbreviation(match: re.Match, language: str) -> str:
+    word = match.group(1).lower()
+    rest = match.string[match.end():]
+    if word in _NUMBER_PREFIXES[language]:
+        return _NUMBER_PREFIXES[language][word] if _DIGIT_FOLLOWS.match(rest) else match.group(0)
+    if word in _TITLES[language]:
+        return _TITLES[language][word]
+    # Keep the period when it also ends the sentence
+    return _ABBREVIATIONS[language][word] + ('.' if _SENTENCE_START.match(rest) else '')
+
+
+def _expand_number(match: re.Match) -> str:
+    integer, decimals, percent = match.groups()
+    words = _integer_to_words(int(integer.replace(',', '')))
+    if decimals:
+        words += ' point ' + ' '.join(_ONES[int(d)] for d in decimals)
+    if percent:
+        words += ' percent'
+    return words
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_for_speech(text: str, language: str = 'en') -> str:
+    """
+    Normalize text before segmentation and synthesis.
+
+    Collapses whitespace and expands known abbreviations (so "Dr. Smith" does
+    not end a sentence) and, for English, numbers and percentages, so that
+    segment lengths reflect what is actually spoken. Results are memoized, as
+    the same strings recur across retries, episodes and batch jobs.
+
+    Args:
+        text (str): Raw input text.
+        language (str): Language code.
+
+    Returns:
+        str: Normalized text.
+    """
+    base = language.split('-')[0].lower()
+    text = _WHITESPACE.sub(' ', text).strip()
+    pattern = _ABBREVIATION_PATTERNS.get(base)
+    if pattern is not None:
+        text = pattern.sub(lambda m: _expand_abbreviation(m, base), text)
+    if base == 'en':
+        text = _NUMBER.sub(_expand_number, text)
+    return text
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences on terminal punctuation.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        List[str]: Non-empty, stripped sentences in order.
+    """
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+
+def _pack(pieces: List[str], budget: int, joiner: str) -> List[str]:
+    """Greedily join consecutive pieces while they fit the budget."""
+    segments: List[str] = []
+    current = ''
+    for piece in pieces:
+        candidate = current + joiner + piece if current else piece
+        if current and len(candidate) > budget:
+            segments.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        segments.append(current)
+    return segments
+
+
+def _split_long(sentence: str, budget: int, joiner: str) -> List[str]:
+    """Break a sentence longer than budget on clauses, then words, then characters."""
+    if len(sentence) <= budget:
+        return [sentence]
+    pieces: List[str] = []
+    for clause in (c.strip() for c in _CLAUSE_BOUNDARY.split(sentence)):
+        if not clause:
+            continue
+        if len(clause) <= budget:
+            pieces.append(clause)
+            continue
+        words = clause.split(' ') if joiner else list(clause)
+        for word in words:
+            # A single word over budget (e.g. a URL) is cut as a last resort
+            pieces.extend(word[i:i + budget] for i in range(0, len(word), budget))
+    return _pack(pieces, budget, joiner)
+
+
+def chunk_text(text: str, language: str = 'en', max_chars: Optional[int] = None) -> List[str]:
+    """
+    Split text into segments that each fit one XTTS inference call.
+
+    Text is normalized, split into sentences (and overlong sentences into
+    clauses or words), and consecutive pieces are packed up to the budget
+    so short sentences do not each pay the per-call overhead.
+
+    Args:
+        text (str): Text to segment.
+        language (str): Language code, which selects the budget.
+        max_chars (Optional[int]): Budget override in characters.
+
+    Returns:
+        List[str]: Segments in order, each at most the budget long.
+    """
+    budget = max_chars or char_limit(language)
+    joiner = '' if language.split('-')[0].lower() in _UNSPACED_LANGUAGES else ' '
+    pieces: List[str] = []
+    for sentence in split_sentences(normalize_for_speech(text, language)):
+        pieces.extend(_split_long(sentence, budget, joiner))
+    return _pack(pieces, budget, joiner)
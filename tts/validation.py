@@ -0,0 +1,133 @@
+"""
+Voice sample validation for AI Voice Assistant.
+
+Reference samples must be long enough, recorded at a usable sample rate and
+not silent. Validation is designed for large uploaded libraries:
+1. Duration and sample rate come from the file header
+2. The silence check streams fixed-size blocks and stops at the first loud one
+3. Batches of files or whole directories are validated in parallel
+4. Every check returns a structured result with the reason for rejection
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+MIN_DURATION = 3.0  # XTTS typically requires at least 3 seconds
+MIN_SAMPLE_RATE = 16000  # XTTS generally works well with >= 16kHz
+SILENCE_THRESHOLD = 0.01  # peak absolute amplitude below which a sample is silent
+BLOCK_FRAMES = 65536  # frames per block for the streamed silence check
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg')
+
+
+@dataclass
+class ValidationResult:
+    """
+    Outcome of validating one voice sample.
+
+    Attributes:
+        path: Path of the validated file.
+        valid: True if the sample meets every requirement.
+        reason: Why the sample was rejected, or None if valid.
+        duration: Duration in seconds, if the header could be read.
+        sample_rate: Sample rate in Hz, if the header could be read.
+        peak: Peak absolute amplitude found before the check stopped.
+            For valid samples this is the first block peak above the
+            silence threshold, not necessarily the global peak.
+    """
+    path: str
+    valid: bool
+    reason: Optional[str] = None
+    duration: Optional[float] = None
+    sample_rate: Optional[int] = None
+    peak: Optional[float] = None
+
+
+def check_voice_sample(file_path: str, min_duration: float = MIN_DURATION,
+                       min_sample_rate: int = MIN_SAMPLE_RATE,
+                       silence_threshold: float = SILENCE_THRESHOLD) -> ValidationResult:
+    """
+    Validate a voice sample using bounded memory.
+
+    Args:
+        file_path (str): Path to the audio file.
+        min_duration (float): Minimum duration in seconds.
+        min_sample_rate (int): Minimum sample rate in Hz.
+        silence_threshold (float): Peak amplitude a non-silent sample must reach.
+
+    Returns:
+        ValidationResult: The outcome, with the rejection reason if invalid.
+    """
+    result = ValidationResult(path=file_path, valid=False)
+    if not os.path.exists(file_path):
+        result.reason = f"File {file_path} does not exist"
+        return result
+
+    try:
+        info = sf.info(file_path)
+    except Exception as e:
+        result.reason = f"Unreadable audio file: {str(e)}"
+        return result
+
+    result.sample_rate = info.samplerate
+    result.duration = info.frames / float(info.samplerate) if info.samplerate else 0.0
+    if result.duration < min_duration:
+        result.reason = (f"Sample too short ({result.duration:.1f}s), "
+                         f"minimum {min_duration} seconds required for XTTS.")
+        return result
+    if info.samplerate < min_sample_rate:
+        result.reason = (f"Sample rate {info.samplerate}Hz is too low, "
+                         f"minimum {min_sample_rate}Hz required.")
+        return result
+
+    try:
+        peak = 0.0
+        for block in sf.blocks(file_path, blocksize=BLOCK_FRAMES, dtype='float32'):
+            if block.size:
+                peak = max(peak, float(np.max(np.abs(block))))
+            if peak >= silence_threshold:
+                break
+    except Exception as e:
+        result.reason = f"Failed to read audio data: {str(e)}"
+        return result
+
+    result.peak = peak
+    if peak < silence_threshold:
+        result.reason = f"Audio appears to be silent (max absolute amplitude: {peak:.4f})."
+        return result
+
+    result.valid = True
+    return result
+
+
+def validate_voice_samples(sources: Union[str, Iterable[str]], workers: int = 4,
+                           **kwargs) -> List[ValidationResult]:
+    """
+    Validate many voice samples in parallel.
+
+    Args:
+        sources (Union[str, Iterable[str]]): A directory (searched recursively
+            for audio files) or an iterable of file paths.
+        workers (int): Number of files validated concurrently.
+        **kwargs: Thresholds passed to check_voice_sample().
+
+    Returns:
+        List[ValidationResult]: One result per file, in input (or sorted path) order.
+    """
+    if isinstance(sources, str):
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(sources)
+            for name in names
+            if name.lower().endswith(AUDIO_EXTENSIONS)
+        )
+    else:
+        paths = list(sources)
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as pool:
+        return list(pool.map(lambda path: check_voice_sample(path, **kwargs), paths))
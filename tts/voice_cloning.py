@@ -4,11 +4,17 @@ Voice Cloning implementation for AI Voice Assistant.
 This module extends the base TextToSpeech class to add voice cloning capabilities.
 """
 
-import os
+import asyncio
 import logging
-import numpy as np
-import soundfile as sf
-from .core import TextToSpeech
+import os
+import threading
+from typing import Iterable, Iterator, List, Optional, Union
+from .async_executor import InferenceCancelled
+from .audio import AudioChunk
+from .core import DEFAULT_STREAM_CHUNK_SIZE, TextToSpeech
+from .similarity import VoiceSimilarityScorer
+from .validation import ValidationResult, check_voice_sample, validate_voice_samples
+from .voice_library import VoiceProfile
 
 class VoiceCloning(TextToSpeech):
     """
@@ -16,10 +22,22 @@ class VoiceCloning(TextToSpeech):
     Inherits the core TTS functionality and model loading from TextToSpeech.
     """
     
-    def __init__(self):
-        """Initialize the VoiceCloning system."""
-        super().__init__()
+    def __init__(self, similarity_threshold: Optional[float] = None, **kwargs):
+        """
+        Initialize the VoiceCloning system.
+
+        Args:
+            similarity_threshold (Optional[float]): If set, clone_voice()
+                scores each output against its reference and rejects it
+                below this speaker similarity (e.g. 0.9).
+            **kwargs: Passed through to TextToSpeech (e.g. latent_cache, async_executor).
+        """
+        super().__init__(**kwargs)
         self.logger = logging.getLogger(__name__)
+        self.similarity_threshold = similarity_threshold
+        self.similarity_scorer = VoiceSimilarityScorer(self) if similarity_threshold is None else \
+            VoiceSimilarityScorer(self, threshold=similarity_threshold)
+        self.last_similarity: Optional[float] = None
         self.logger.info("VoiceCloning class initialized, using TextToSpeech base for TTS model.")
         
     def validate_voice_sample(self, file_path: str) -> bool:
@@ -27,48 +45,73 @@ class VoiceCloning(TextToSpeech):
         Validate a voice sample file meets requirements for XTTS cloning.
         (Checks for existence, duration >= 3s, sample rate >= 16kHz, non-silence)
 
+        Duration and sample rate are read from the header and the silence
+        check streams blocks, so long references are never fully loaded.
+
         Args:
             file_path: Path to audio file to validate
 
         Returns:
             True if valid, False otherwise
         """
-        try:
-            if not os.path.exists(file_path):
-                self.logger.error(f"Validation Error: File {file_path} does not exist")
-                return False
+        with self.metrics.stage('validation'):
+            result = check_voice_sample(file_path)
+        if not result.valid:
+            self.logger.error(f"Validation Error: {result.reason}")
+            return False
+        self.logger.info(f"Voice sample validation passed for: {file_path}")
+        return True
 
-            # Use soundfile to read audio properties
-            audio, sample_rate = sf.read(file_path)
-            duration = len(audio) / float(sample_rate)
-            min_duration = 3.0 # XTTS typically requires at least 3 seconds
-            if duration < min_duration:
-                self.logger.error(f"Validation Error: Sample too short ({duration:.1f}s), minimum {min_duration} seconds required for XTTS.")
-                return False
+    def preprocess_voice_sample(self, file_path: str) -> Optional[str]:
+        """
+        Downmix, resample, trim and loudness-normalize a voice sample once.
 
-            min_sample_rate = 16000 # XTTS generally works well with >= 16kHz
-            if sample_rate < min_sample_rate:
-                self.logger.error(f"Validation Error: Sample rate {sample_rate}Hz is too low, minimum {min_sample_rate}Hz required.")
-                return False
+        Requires a reference_preprocessor; the result is cached on disk keyed
+        by the sample's contents, so repeated calls are a cache lookup.
 
-            # Check audio is not silent (using numpy)
-            max_abs_amp = np.max(np.abs(audio))
-            silence_threshold = 0.01
-            if max_abs_amp < silence_threshold:
-                self.logger.error(f"Validation Error: Audio appears to be silent (max absolute amplitude: {max_abs_amp:.4f}).")
-                return False
-                
-            self.logger.info(f"Voice sample validation passed for: {file_path}")
-            return True
-            
+        Args:
+            file_path: Path to the original voice sample.
+
+        Returns:
+            Path of the preprocessed WAV, or None if preprocessing failed.
+        """
+        if self.reference_preprocessor is None:
+            self.logger.error("No reference preprocessor configured.")
+            return None
+        try:
+            return self.reference_preprocessor.prepare(file_path)
         except Exception as e:
-            self.logger.error(f"Voice sample validation failed for {file_path}: {str(e)}", exc_info=True)
-            return False
+            self.logger.error(f"Failed to preprocess voice sample {file_path}: {str(e)}")
+            return None
+
+    def _reference_is_valid(self, reference_audio: str) -> bool:
+        """Validate a reference sample; library voices were validated when created."""
+        return self._library_voice(reference_audio) is not None or self.validate_voice_sample(reference_audio)
+
+    def validate_voice_samples(self, sources: Union[str, Iterable[str]],
+                               workers: int = 4) -> List[ValidationResult]:
+        """
+        Validate a directory or list of voice samples in parallel.
+
+        Args:
+            sources: Directory to scan recursively, or an iterable of file paths.
+            workers: Number of files validated concurrently.
+
+        Returns:
+            One ValidationResult per file, including the reason for any rejection.
+        """
+        results = validate_voice_samples(sources, workers=workers)
+        rejected = sum(1 for r in results if not r.valid)
+        self.logger.info(f"Validated {len(results)} voice samples: {rejected} rejected")
+        return results
             
     def clone_voice(self, text: str, reference_audio: str, language: str, output_path: str) -> bool:
         """
         Generate speech with cloned voice characteristics using the loaded XTTS model.
 
+        With a similarity_threshold, the output is scored against the
+        reference (stored on last_similarity) and deleted if it falls short.
+
         Args:
             text (str): Text to convert to speech.
             reference_audio (str): Path to the reference audio file (.wav) for voice cloning.
@@ -78,21 +121,196 @@ class VoiceCloning(TextToSpeech):
         Returns:
             bool: True if successful, False otherwise.
         """
+        return self._clone(text, reference_audio, language, output_path)
+
+    def _clone(self, text: str, reference_audio: str, language: str, output_path: str,
+               cancel_event: Optional[threading.Event] = None) -> bool:
+        """Run clone_voice(), optionally cancellable; shared by the sync and async paths."""
         try:
             self.logger.info(f"Attempting voice cloning for text: '{text[:50]}...'")
             # Validate the reference audio file using this class's method
-            if not self.validate_voice_sample(reference_audio):
+            # (library voices were validated when they were created)
+            if not self._reference_is_valid(reference_audio):
                 self.logger.error("Voice cloning failed due to invalid reference audio.")
                 return False
-                
-            # Call the base class's text_to_speech method which handles model initialization and generation
-            return super().text_to_speech(
+            if cancel_event is not None and cancel_event.is_set():
+                raise InferenceCancelled()
+
+            # Call the base class's text_to_speech method which handles model initialization,
+            # the output cache, long-text segmentation, coalescing and generation
+            success = super().text_to_speech(
                 text=text,
                 speaker_wav=reference_audio,
                 language=language,
-                output_path=output_path
+                output_path=output_path,
+                cancel_event=cancel_event
             )
-            
+            if success and self.similarity_threshold is not None:
+                return self._similarity_gate(reference_audio, output_path)
+            return success
+
+        except InferenceCancelled:
+            self.logger.info(f"Voice cloning cancelled: {output_path}")
+            return False
         except Exception as e:
             self.logger.error(f"Voice cloning process failed: {str(e)}", exc_info=True)
-            return False
\ No newline at end of file
+            return False
+
+    def _similarity_gate(self, reference_audio: str, output_path: str) -> bool:
+        """Score a cloned output against its reference, deleting it if below the threshold."""
+        if not self.model and not self.initialize_model():
+            return False
+        with self.metrics.stage('similarity'):
+            score = float(self.similarity_scorer.score([output_path], reference_audio)[0])
+        self.last_similarity = score
+        if score < self.similarity_threshold:
+            self.logger.error(f"Voice similarity {score:.3f} is below the threshold "
+                              f"{self.similarity_threshold:.3f}; rejecting {output_path}")
+            os.remove(output_path)
+            return False
+        self.logger.info(f"Voice similarity {score:.3f} passed the threshold")
+        return True
+
+    def create_voice(self, voice_id: str, samples: List[str], name: Optional[str] = None) -> bool:
+        """
+        Build a persistent voice profile from several samples of one speaker.
+
+        Every sample is validated, the conditioning latents are computed once
+        from all of them together and saved to the voice library, after which
+        voice_id can be passed wherever a reference audio path is accepted.
+
+        Args:
+            voice_id: Identifier for the voice (letters, digits, '_', '.', '-').
+            samples: Paths to reference recordings of the speaker.
+            name: Human-readable name; defaults to voice_id.
+
+        Returns:
+            True if the profile was saved, False otherwise.
+        """
+        try:
+            if self.voice_library is None:
+                self.logger.error("No voice library configured; pass voice_library to create voices.")
+                return False
+            self.voice_library.validate_voice_id(voice_id)
+            if not samples:
+                self.logger.error("At least one voice sample is required.")
+                return False
+            rejected = [r for r in self.validate_voice_samples(samples) if not r.valid]
+            for result in rejected:
+                self.logger.error(f"Validation Error: {result.path}: {result.reason}")
+            if rejected:
+                return False
+            if not self.model and not self.initialize_model():
+                return False
+            xtts = self._get_xtts_model()
+            if xtts is None:
+                self.logger.error("Loaded model does not support speaker conditioning latents.")
+                return False
+
+            references = [self._prepare_reference(sample) for sample in samples]
+            with self.metrics.stage('conditioning'), self._inference_context():
+                latents = xtts.get_conditioning_latents(audio_path=references)
+            self.voice_library.add(voice_id, latents, list(samples), self.model_name, name=name)
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to create voice '{voice_id}': {str(e)}", exc_info=True)
+            return False
+
+    def list_voices(self) -> List[VoiceProfile]:
+        """
+        List the voices in the voice library without loading the model.
+
+        Returns:
+            The library's voice profiles, or an empty list if no library is configured.
+        """
+        return self.voice_library.list_voices() if self.voice_library is not None else []
+
+    def remove_voice(self, voice_id: str) -> bool:
+        """
+        Remove a voice from the voice library.
+
+        Args:
+            voice_id: Voice to remove.
+
+        Returns:
+            True if the voice existed and was removed, False otherwise.
+        """
+        if self.voice_library is None:
+            return False
+        return self.voice_library.remove(voice_id)
+
+    async def avalidate_voice_sample(self, file_path: str) -> bool:
+        """
+        Async counterpart of validate_voice_sample().
+
+        Validation is file I/O rather than inference, so it runs on the event
+        loop's default executor and does not occupy an inference slot.
+
+        Args:
+            file_path: Path to audio file to validate
+
+        Returns:
+            True if valid, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.validate_voice_sample, file_path)
+
+    async def aclone_voice(self, text: str, reference_audio: str, language: str, output_path: str,
+                           timeout: Optional[float] = None) -> bool:
+        """
+        Async counterpart of clone_voice() with bounded concurrency.
+
+        The whole of clone_voice() (validation, model initialization, the
+        output cache, generation and the similarity gate) runs as one job on
+        async_executor, so the queue limit and timeout cover the whole request.
+
+        Args:
+            text (str): Text to convert to speech.
+            reference_audio (str): Path to the reference audio file (.wav) for voice cloning.
+            language (str): Language code for the text (e.g., 'en').
+            output_path (str): Where to save the generated audio file (.wav).
+            timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+            bool: True if successful, False otherwise.
+
+        Raises:
+            QueueFullError: If too many requests are already outstanding.
+            asyncio.TimeoutError: If cloning does not finish within timeout.
+        """
+        self.logger.info(f"Queueing async voice cloning for text: '{text[:50]}...'")
+        return await self.async_executor.run(
+            lambda cancel_event: self._clone(text, reference_audio, language, output_path,
+                                             cancel_event=cancel_event),
+            timeout=timeout
+        )
+
+    def stream_clone_voice(self, text: str, reference_audio: str, language: str,
+                           stream_chunk_size: Optional[int] = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[AudioChunk]:
+        """
+        Stream speech in a cloned voice, yielding audio chunks as they are generated.
+
+        Validates the reference audio and initializes the model if needed,
+        then delegates to stream_audio(). Timing for the call is available on
+        last_stream_timing once the generator is exhausted.
+
+        Args:
+            text (str): Text to convert to speech.
+            reference_audio (str): Path to the reference audio file (.wav) for voice cloning.
+            language (str): Language code for the text (e.g., 'en').
+            stream_chunk_size (Optional[int]): GPT tokens per chunk, or None
+                for sentence-sized chunks.
+
+        Yields:
+            AudioChunk: Consecutive PCM chunks with their sample rate.
+
+        Raises:
+            ValueError: If the reference audio fails validation.
+            RuntimeError: If the model cannot be initialized.
+        """
+        self.logger.info(f"Streaming cloned voice for text: '{text[:50]}...'")
+        if not self._reference_is_valid(reference_audio):
+            raise ValueError(f"Invalid reference audio: {reference_audio}")
+        if not self.model and not self.initialize_model():
+            raise RuntimeError("Failed to initialize TTS model for streaming.")
+        yield from self.stream_audio(text, reference_audio, language, stream_chunk_size=stream_chunk_size)
@@ -0,0 +1,218 @@
+"""
+Persistent voice profiles for AI Voice Assistant.
+
+A voice profile holds the XTTS conditioning latents computed once from
+several reference samples of one speaker. Profiles live in a local library
+directory:
+1. One versioned .npz file per voice holding the latents
+2. An index.json describing every voice (name, model, source samples)
+3. Listing, adding and removing voices without loading the model
+
+Loading a profile reads a few hundred KB instead of decoding, resampling
+and encoding the reference recordings.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .hashing import file_digest
+from .latent_cache import SpeakerLatents, to_numpy
+
+FORMAT_VERSION = 1
+INDEX_FILE = 'index.json'
+_VOICE_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$')
+
+
+@dataclass
+class VoiceProfile:
+    """
+    Index entry for one voice in the library.
+
+    Attributes:
+        voice_id: Identifier used to synthesize with the voice.
+        name: Human-readable name.
+        model_name: Model that computed the latents; profiles are not
+            portable across models.
+        samples: Source samples as {'path', 'sha256'} records.
+        created: Creation time (seconds since the epoch).
+        digest: SHA-256 of the latents file, which changes whenever the
+            voice is re-created.
+        format_version: Version of the latents file layout.
+    """
+    voice_id: str
+    name: str
+    model_name: Optional[str]
+    samples: List[Dict[str, str]] = field(default_factory=list)
+    created: float = 0.0
+    digest: str = ''
+    format_version: int = FORMAT_VERSION
+
+
+class VoiceLibrary:
+    """
+    Directory of voice profiles with a JSON index.
+
+    All methods are thread-safe; the index and latents files are replaced
+    atomically so a crash never leaves a half-written profile.
+
+    Attributes:
+        library_dir: Directory holding index.json and the .npz profiles.
+    """
+
+    def __init__(self, library_dir: str):
+        """
+        Open (creating if needed) a voice library.
+
+        Args:
+            library_dir (str): Directory for the library.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.library_dir = library_dir
+        self._lock = threading.Lock()
+        os.makedirs(library_dir, exist_ok=True)
+        self._voices = self._read_index()
+
+    @staticmethod
+    def validate_voice_id(voice_id: str) -> None:
+        """
+        Check that a voice ID is safe to use as a file name.
+
+        Raises:
+            ValueError: If the ID is empty, too long or contains other than
+                letters, digits, '_', '.' and '-'.
+        """
+        if not isinstance(voice_id, str) or not _VOICE_ID.match(voice_id):
+            raise ValueError(f"Invalid voice ID {voice_id!r}: use up to 64 letters, digits, '_', '.' or '-'")
+
+    def list_voices(self) -> List[VoiceProfile]:
+        """Return every voice in the library, sorted by ID."""
+        with self._lock:
+            return [self._voices[v] for v in sorted(self._voices)]
+
+    def get(self, voice_id: str) -> Optional[VoiceProfile]:
+        """Return the profile for voice_id, or None if it is not in the library."""
+        with self._lock:
+            return self._voices.get(voice_id)
+
+    def __contains__(self, voice_id: str) -> bool:
+        with self._lock:
+            return voice_id in self._voices
+
+    def add(self, voice_id: str, latents: SpeakerLatents, samples: List[str],
+            model_name: Optional[str], name: Optional[str] = None) -> VoiceProfile:
+        """
+        Save a voice's latents and add it to the index, replacing any existing voice.
+
+        Args:
+            voice_id (str): Identifier for the voice.
+            latents (SpeakerLatents): (gpt_cond_latent, speaker_embedding).
+            samples (List[str]): Reference samples the latents were computed from.
+            model_name (Optional[str]): Model that computed the latents.
+            name (Optional[str]): Human-readable name; defaults to voice_id.
+
+        Returns:
+            VoiceProfile: The new index entry.
+        """
+        self.validate_voice_id(voice_id)
+        path = self._latents_path(voice_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, gpt_cond_latent=to_numpy(latents[0]),
+                         speaker_embedding=to_numpy(latents[1]),
+                         format_version=np.array(FORMAT_VERSION))
+            with open(tmp_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            profile = VoiceProfile(
+                voice_id=voice_id,
+                name=name or voice_id,
+                model_name=model_name,
+                samples=[{'path': os.path.abspath(s), 'sha256': file_digest(s)} for s in samples],
+                created=time.time(),
+                digest=digest,
+            )
+            with self._lock:
+                os.replace(tmp_path, path)
+                self._voices[voice_id] = profile
+                self._write_index()
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.logger.info(f"Saved voice profile '{voice_id}' from {len(samples)} samples")
+        return profile
+
+    def remove(self, voice_id: str) -> bool:
+        """
+        Delete a voice from the library.
+
+        Returns:
+            bool: True if the voice existed.
+        """
+        with self._lock:
+            if self._voices.pop(voice_id, None) is None:
+                return False
+            self._write_index()
+            path = self._latents_path(voice_id)
+            if os.path.exists(path):
+                os.remove(path)
+        self.logger.info(f"Removed voice profile '{voice_id}'")
+        return True
+
+    def load_latents(self, voice_id: str,
+                     restore: Optional[Callable[[np.ndarray], Any]] = None) -> SpeakerLatents:
+        """
+        Load a voice's conditioning latents.
+
+        Args:
+            voice_id (str): Voice to load.
+            restore (Optional[Callable]): Converts each array to the model's
+                tensor type (e.g. a torch tensor on the model device).
+
+        Returns:
+            SpeakerLatents: (gpt_cond_latent, speaker_embedding).
+
+        Raises:
+            KeyError: If the voice is not in the library.
+            ValueError: If the file was written by an unsupported format version.
+        """
+        if voice_id not in self:
+            raise KeyError(f"Voice '{voice_id}' is not in the library")
+        with np.load(self._latents_path(voice_id)) as data:
+            version = int(data['format_version'])
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Voice '{voice_id}' uses unsupported format version {version}")
+            latents = data['gpt_cond_latent'], data['speaker_embedding']
+        if restore is not None:
+            latents = (restore(latents[0]), restore(latents[1]))
+        return latents
+
+    def _latents_path(self, voice_id: str) -> str:
+        return os.path.join(self.library_dir, f"{voice_id}.npz")
+
+    def _read_index(self) -> Dict[str, VoiceProfile]:
+        path = os.path.join(self.library_dir, INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            data = json.load(f)
+        return {v['voice_id']: VoiceProfile(**v) for v in data.get('voices', [])}
+
+    def _write_index(self) -> None:
+        """Atomically rewrite the index; caller must hold the lock."""
+        path = os.path.join(self.library_dir, INDEX_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'format_version': FORMAT_VERSION,
+                'voices': [asdict(self._voices[v]) for v in sorted(self._voices)],
+            }, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,391 @@
+"""
+Multi-process synthesis worker pool for AI Voice Assistant.
+
+A single TextToSpeech instance is limited to the intra-op parallelism torch
+finds inside one process. This module spreads synthesis over several
+processes:
+1. Each worker loads the model once and is pinned to a share of the cores
+2. Requests are dispatched to idle workers through per-worker queues
+3. Audio is handed back through shared memory, with no temp files
+4. Crashed workers are detected, their in-flight request is failed and the
+   worker is respawned
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from .audio import SynthesisResult
+from .core import DEFAULT_MODEL_NAME
+
+_POLL_INTERVAL = 0.05  # seconds between supervisor passes
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised for a request whose worker process died while handling it."""
+
+
+def load_default_engine(model_name: str) -> Any:
+    """
+    Create and initialize a TextToSpeech engine inside a worker process.
+
+    Args:
+        model_name (str): Name of the model to load.
+
+    Returns:
+        TextToSpeech: An engine with its model loaded.
+
+    Raises:
+        RuntimeError: If the model fails to initialize.
+    """
+    from .core import TextToSpeech
+    engine = TextToSpeech()
+    if not engine.initialize_model(model_name):
+        raise RuntimeError(f"Failed to initialize model '{model_name}' in worker")
+    return engine
+
+
+def _worker_main(worker_id: int, inbox, outbox, engine_factory: Callable[[str], Any],
+                 model_name: str, num_threads: int, cpu_ids: Optional[List[int]]) -> None:
+    """Worker process entry point: load the model once, then serve requests."""
+    logger = logging.getLogger(__name__)
+    if cpu_ids and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpu_ids)
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError) as e:
+        logger.warning(f"Worker {worker_id}: could not apply torch thread settings: {str(e)}")
+
+    try:
+        engine = engine_factory(model_name)
+    except Exception as e:
+        outbox.put(('init_failed', worker_id, None, str(e)))
+        return
+    outbox.put(('ready', worker_id, None, None))
+
+    while True:
+        request = inbox.get()
+        if request is None:
+            break
+        job_id, text, speaker_wav, language = request
+        try:
+            result = engine.synthesize(text, speaker_wav, language)
+            audio = np.asarray(result.samples, dtype=np.float32)
+            shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+            np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+            outbox.put(('done', worker_id, job_id, (shm.name, len(audio), result.sample_rate)))
+            shm.close()
+        except Exception as e:
+            outbox.put(('error', worker_id, job_id, str(e)))
+
+
+@dataclass
+class _Job:
+    job_id: int
+    text: str
+    speaker_wav: str
+    language: str
+    future: Future
+    submitted_at: float
+
+
+class _WorkerHandle:
+    """Parent-side bookkeeping for one worker process."""
+
+    def __init__(self, worker_id: int, process, inbox):
+        self.worker_id = worker_id
+        self.process = process
+        self.inbox = inbox
+        self.ready = False
+        self.job: Optional[_Job] = None
+
+
+class SynthesisWorkerPool:
+    """
+    Pool of worker processes, each holding its own warm model.
+
+    A supervisor thread in the parent process dispatches queued requests to
+    idle workers, collects results and watches for crashed workers. Because
+    the parent always knows which request a worker holds, a crash fails
+    exactly that request with WorkerCrashedError before the worker is
+    respawned.
+
+    Attributes:
+        num_workers: Number of worker processes.
+        model_name: Model loaded by every worker.
+        threads_per_worker: Torch intra-op threads per worker.
+        restarts: Number of workers respawned after a crash.
+    """
+
+    def __init__(self, num_workers: int = 2, model_name: str = DEFAULT_MODEL_NAME,
+                 threads_per_worker: Optional[int] = None, pin_cores: bool = True,
+                 engine_factory: Callable[[str], Any] = load_default_engine,
+                 start_method: str = 'spawn'):
+        """
+        Configure the pool. Call start() (or use it as a context manager) to launch workers.
+
+        Args:
+            num_workers (int): Number of worker processes.
+            model_name (str): Model each worker loads.
+            threads_per_worker (Optional[int]): Torch threads per worker; defaults
+                to an even share of the available cores.
+            pin_cores (bool): Pin each worker to a disjoint set of cores where
+                the platform supports CPU affinity.
+            engine_factory (Callable): Picklable callable taking the model name
+                and returning an engine with a synthesize() method.
+            start_method (str): multiprocessing start method.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        self.logger = logging.getLogger(__name__)
+        self.num_workers = num_workers
+        self.model_name = model_name
+        cpu_count = os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // num_workers)
+        self.pin_cores = pin_cores
+        self.engine_factory = engine_factory
+        self.restarts = 0
+        self.completed = 0
+        self.failed = 0
+        self._ctx = multiprocessing.get_context(start_method)
+        self._outbox = None
+        self._workers: Dict[int, _WorkerHandle] = {}
+        self._submissions: "queue.Queue[_Job]" = queue.Queue()
+        self._backlog: Deque[_Job] = deque()
+        self._next_job_id = 0
+        self._id_lock = threading.Lock()
+        self._supervisor: Optional[threading.Thread] = None
+        self._closing = threading.Event()
+        self._init_error: Optional[str] = None
+
+    def start(self, timeout: Optional[float] = None) -> None:
+        """
+        Launch the workers and wait until each has loaded its model.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for all workers to be ready.
+
+        Raises:
+            RuntimeError: If a worker fails to load its model.
+            TimeoutError: If the workers are not ready in time.
+        """
+        if self._supervisor is not None:
+            return
+        self._outbox = self._ctx.Queue()
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+        self._supervisor = threading.Thread(target=self._supervise, name='tts-worker-pool', daemon=True)
+        self._supervisor.start()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._init_error is not None:
+                self.shutdown()
+                raise RuntimeError(f"Worker failed to initialize: {self._init_error}")
+            if all(w.ready for w in list(self._workers.values())):
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                self.shutdown()
+                raise TimeoutError("Timed out waiting for synthesis workers to start")
+            time.sleep(_POLL_INTERVAL)
+        self.logger.info(
+            f"Started {self.num_workers} synthesis workers with {self.threads_per_worker} threads each"
+        )
+
+    def submit(self, text: str, speaker_wav: str, language: str) -> Future:
+        """
+        Queue a synthesis request.
+
+        Args:
+            text (str): Text to convert to speech.
+            speaker_wav (str): Path to the reference audio file (.wav).
+            language (str): Language code (e.g., 'en').
+
+        Returns:
+            Future: Resolves to a SynthesisResult, or raises the worker's error.
+        """
+        if self._supervisor is None or self._closing.is_set():
+            raise RuntimeError("Worker pool is not running. Call start() first.")
+        with self._id_lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+        job = _Job(job_id, text, speaker_wav, language, Future(), time.perf_counter())
+        self._submissions.put(job)
+        return job.future
+
+    def synthesize(self, text: str, speaker_wav: str, language: str,
+                   timeout: Optional[float] = None) -> SynthesisResult:
+        """Synthesize text on the pool and block until the audio is ready."""
+        return self.submit(text, speaker_wav, language).result(timeout=timeout)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Stop all workers, failing any requests that have not completed.
+
+        Args:
+            timeout (float): Seconds to wait for each worker to exit.
+        """
+        if self._supervisor is None:
+            return
+        self._closing.set()
+        self._supervisor.join()
+        for worker in self._workers.values():
+            if worker.process.is_alive():
+                worker.inbox.put(None)
+        for worker in self._workers.values():
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            if worker.job is not None:
+                worker.job.future.set_exception(RuntimeError("Worker pool shut down"))
+        while True:
+            try:
+                self._backlog.append(self._submissions.get_nowait())
+            except queue.Empty:
+                break
+        for job in self._backlog:
+            job.future.set_exception(RuntimeError("Worker pool shut down"))
+        self._backlog.clear()
+        self._workers.clear()
+        self._supervisor = None
+        self._closing.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of worker and request counters."""
+        return {
+            'workers_alive': sum(1 for w in self._workers.values() if w.process.is_alive()),
+            'restarts': self.restarts,
+            'completed': self.completed,
+            'failed': self.failed,
+            'queued': self._submissions.qsize() + len(self._backlog),
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def _spawn(self, worker_id: int) -> None:
+        cpu_ids = None
+        if self.pin_cores and hasattr(os, 'sched_getaffinity'):
+            available = sorted(os.sched_getaffinity(0))
+            share = max(1, len(available) // self.num_workers)
+            start = (worker_id * share) % len(available)
+            cpu_ids = available[start:start + share] or available
+        inbox = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, inbox, self._outbox, self.engine_factory,
+                  self.model_name, self.threads_per_worker, cpu_ids),
+            name=f'tts-worker-{worker_id}',
+            daemon=True
+        )
+        process.start()
+        self._workers[worker_id] = _WorkerHandle(worker_id, process, inbox)
+
+    def _supervise(self) -> None:
+        """Supervisor loop: collect results, respawn crashed workers, dispatch jobs."""
+        while not self._closing.is_set():
+            self._collect_results()
+            self._check_workers()
+            self._dispatch()
+
+    def _collect_results(self) -> None:
+        try:
+            kind, worker_id, job_id, payload = self._outbox.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            return
+        worker = self._workers.get(worker_id)
+        if kind == 'ready':
+            if worker is not None:
+                worker.ready = True
+            return
+        if kind == 'init_failed':
+            self._init_error = payload
+            self.logger.error(f"Synthesis worker {worker_id} failed to initialize: {payload}")
+            return
+        if worker is None or worker.job is None or worker.job.job_id != job_id:
+            # Result for a request already failed (e.g. its worker was replaced)
+            if kind == 'done':
+                self._release_shared_memory(payload[0])
+            return
+        job, worker.job = worker.job, None
+        if kind == 'done':
+            shm_name, length, sample_rate = payload
+            samples = self._release_shared_memory(shm_name, length)
+            self.completed += 1
+            job.future.set_result(SynthesisResult(
+                samples=samples,
+                sample_rate=sample_rate,
+                metadata={'worker_id': worker_id,
+                          'latency': time.perf_counter() - job.submitted_at}
+            ))
+        else:
+            self.failed += 1
+            job.future.set_exception(RuntimeError(payload))
+
+    @staticmethod
+    def _release_shared_memory(shm_name: str, length: int = 0) -> np.ndarray:
+        """Copy a worker's audio out of shared memory and free the segment."""
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            return np.ndarray((length,), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _check_workers(self) -> None:
+        for worker_id, worker in list(self._workers.items()):
+            if worker.process.is_alive():
+                continue
+            exit_code = worker.process.exitcode
+            if not worker.ready:
+                # Died while loading the model; respawning would just loop
+                self.logger.error(f"Synthesis worker {worker_id} died during initialization (exit code {exit_code})")
+                self._init_error = self._init_error or f"worker {worker_id} exited with code {exit_code}"
+                del self._workers[worker_id]
+                continue
+            self.logger.error(f"Synthesis worker {worker_id} exited unexpectedly (exit code {exit_code}); respawning")
+            if worker.job is not None:
+                self.failed += 1
+                worker.job.future.set_exception(WorkerCrashedError(
+                    f"Worker {worker_id} crashed (exit code {exit_code}) while synthesizing request {worker.job.job_id}"
+                ))
+            self.restarts += 1
+            self._spawn(worker_id)
+
+    def _dispatch(self) -> None:
+        while True:
+            try:
+                self._backlog.append(self._submissions.get_nowait())
+            except queue.Empty:
+                break
+        if not self._workers:
+            while self._backlog:
+                self.failed += 1
+                self._backlog.popleft().future.set_exception(RuntimeError("No synthesis workers available"))
+            return
+        for worker in self._workers.values():
+            if not self._backlog:
+                return
+            if worker.ready and worker.job is None and worker.process.is_alive():
+                job = self._backlog.popleft()
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                worker.job = job
+                worker.inbox.put((job.job_id, job.text, job.speaker_wav, job.language))